@@ -3,27 +3,59 @@ EasyVents - Backend API Server
 Flask server for user authentication and management
 """
 
-from flask import Flask, request, jsonify, send_from_directory, render_template, session, redirect, url_for, flash
+from flask import (Flask, request, jsonify, send_from_directory, render_template, stream_template, session, redirect,
+                   url_for, flash, has_request_context, Response, g)
 from flask_cors import CORS
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import generate_password_hash
 import sqlite3
 import re
 import os
-from datetime import datetime, timedelta
+import json
+import time
 import uuid
+import hashlib
+import secrets
+from collections import Counter
 from flask_sqlalchemy import SQLAlchemy
 import glob
+from functools import wraps
+from werkzeug.middleware.proxy_fix import ProxyFix
 from image_manager import init_image_manager
+from cart_store import init_cart_store
+from password_hasher import init_password_hasher, HasherBusy
+from rate_limiter import init_rate_limiter, ConcurrencyLimiter
+from job_queue import init_job_queue
+from mailer import init_mailer
+from metrics import init_metrics, MetricsMiddleware, REQUEST_STATS_KEY
+from profiler import init_profiler
+from catalog_io import init_catalog_transfer, format_from_filename, FORMATS
+from spreadsheet_export import stream_csv, stream_xlsx, CONTENT_TYPES
+from fragment_cache import init_fragment_cache
+from template_cache import init_template_cache, compile_templates
+from vendor_search import init_vendor_search
+from suggest_index import init_suggestions, KINDS as SUGGEST_KINDS
+from geo_index import init_geo_index, haversine_km, GEO_TABLES
+from columnar_catalog import init_columnar_catalog
+from availability import init_availability, parse_day, parse_range, SLOTS, WHOLE_DAY, VENDOR_TYPES
+from markupsafe import Markup
+from query_tracer import TracedConnection, instrument_engine, add_query_listener, init_query_tracer
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
 app.secret_key = 'super_secret_key_for_easyevents_session'  # Required for Flask-Login
 CORS(app)  # Enable CORS for all routes
 
+# Behind a reverse proxy (e.g. Render), set TRUSTED_PROXIES to the number of
+# proxy hops so request.remote_addr is the real client IP for rate limiting
+if int(os.environ.get('TRUSTED_PROXIES', 0)):
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=int(os.environ['TRUSTED_PROXIES']))
+
 # Configure Database Path (Absolute Path)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(BASE_DIR)
-DB_PATH = os.path.join(PROJECT_ROOT, 'database', 'easyevents.db')
+# EASYEVENTS_DB_PATH points the app at a different database file, e.g. a
+# throwaway one for benchmarks
+DB_PATH = os.environ.get('EASYEVENTS_DB_PATH') or os.path.join(PROJECT_ROOT, 'database', 'easyevents.db')
 
 # Ensure database directory exists
 db_dir = os.path.dirname(DB_PATH)
@@ -36,9 +68,31 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 db = SQLAlchemy(app)
 
+# Per-endpoint request metrics, served at /metrics. Under gunicorn METRICS_DIR
+# is set so the numbers are aggregated across all worker processes.
+metrics = init_metrics(os.environ.get('METRICS_DIR'))
+app.wsgi_app = MetricsMiddleware(app.wsgi_app, metrics)
+
+# Sampling profiler, off until switched on at runtime via /admin/profiler.
+# PROFILE_DIR shares its settings and samples across worker processes.
+profiler = init_profiler(os.environ.get('PROFILE_DIR'))
+
+# Compiled templates are kept in JINJA_CACHE_DIR; warm_templates.py fills it at
+# build time so a fresh worker loads bytecode instead of compiling every page
+template_cache = init_template_cache(
+    app.jinja_env, os.environ.get('JINJA_CACHE_DIR') or os.path.join(BASE_DIR, '.jinja_cache'))
+
 # Initialize Image Manager
 image_manager = init_image_manager(os.path.join(BASE_DIR, 'static', 'images'))
 
+# Password hashing runs on a bounded pool; cost is tunable per deployment,
+# e.g. PASSWORD_HASH_METHOD=scrypt:65536:8:1 or pbkdf2:sha256:600000
+password_hasher = init_password_hasher(
+    method=os.environ.get('PASSWORD_HASH_METHOD', 'scrypt'),
+    workers=int(os.environ.get('PASSWORD_HASH_WORKERS', 2)),
+    queue_size=int(os.environ.get('PASSWORD_HASH_QUEUE', 16))
+)
+
 # --- LOCAL IMAGE MANAGEMENT ---
 def get_local_venue_image(venue_obj):
     """
@@ -115,6 +169,10 @@ class Venue(db.Model):
     capacity = db.Column(db.Integer)
     image_url = db.Column(db.String(500))
 
+    # Town centre from the gazetteer unless set explicitly (see geo_index.py)
+    lat = db.Column(db.Float)
+    lon = db.Column(db.Float)
+
     def __repr__(self):
         return f"<Venue {self.name} in {self.city}>"
 class Supplier(db.Model):
@@ -130,6 +188,8 @@ class Supplier(db.Model):
     city = db.Column(db.String(60))                       # Service area / city
     price = db.Column(db.Integer)                         # Starting price / average price
     image_url = db.Column(db.String(500))
+    lat = db.Column(db.Float)                             # Coordinates of the city, as for Venue
+    lon = db.Column(db.Float)
 
     def __repr__(self):
         return f"<Supplier {self.name} ({self.supplier_type})>"
@@ -143,13 +203,128 @@ login_manager.login_view = 'login_page'
 # Database configuration used by raw SQLite connections
 DATABASE = DB_PATH
 
-def get_db_connection():
+# SQL tracing for both sqlite3 and SQLAlchemy. Statements slower than
+# SLOW_QUERY_MS are printed with their query plan, and a statement repeated
+# QUERY_REPEAT_THRESHOLD times in one request is reported as a likely N+1.
+# QUERY_DEBUG_HEADERS=1 (e.g. on staging) adds per-request query totals to
+# every response as Server-Timing and X-Query-Count headers.
+query_tracer = init_query_tracer(
+    lambda: sqlite3.connect(DATABASE, timeout=1),
+    slow_threshold=float(os.environ.get('SLOW_QUERY_MS', 100)) / 1000,
+    repeat_threshold=int(os.environ.get('QUERY_REPEAT_THRESHOLD', 10))
+)
+QUERY_DEBUG_HEADERS = os.environ.get('QUERY_DEBUG_HEADERS') == '1'
+metrics.describe_counter('easyevents_db_slow_queries_total', 'SQL statements slower than SLOW_QUERY_MS')
+metrics.describe_counter('easyevents_db_repeated_statements_total',
+                         'Statements repeated QUERY_REPEAT_THRESHOLD+ times in one request (N+1)')
+
+def trace_query(statement, parameters, duration):
+    """Attribute a SQL statement to the current request and log it if slow"""
+    endpoint, statements = None, None
+    if has_request_context():
+        stats = request.environ.get(REQUEST_STATS_KEY)
+        if stats is not None:
+            stats.add_query(duration)
+            endpoint = stats.endpoint
+        statements = g.setdefault('sql_statements', Counter())
+    if query_tracer.statement_finished(statement, parameters, duration, statements, context=endpoint or ''):
+        metrics.inc('easyevents_db_slow_queries_total', {'endpoint': endpoint or 'background'})
+
+add_query_listener(trace_query)
+with app.app_context():
+    instrument_engine(db.engine)
+
+def get_db_connection(timeout=30):
     """Create a database connection with timeout to prevent locking"""
-    conn = sqlite3.connect(DATABASE, timeout=30)
+    conn = sqlite3.connect(DATABASE, timeout=timeout, factory=TracedConnection)
     conn.row_factory = sqlite3.Row
     conn.execute('PRAGMA journal_mode=WAL')  # Better concurrency
     return conn
 
+# Write transactions wait briefly for the lock, then back off and retry
+WRITE_LOCK_TIMEOUT = 5
+WRITE_RETRIES = 4
+WRITE_RETRY_BACKOFF = 0.05
+
+def is_busy_error(error):
+    """Check if a sqlite3 error means another connection holds the write lock"""
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return code in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+def run_write_transaction(work):
+    """
+    Run work(conn) inside a BEGIN IMMEDIATE transaction.
+
+    The write lock is taken up front so the transaction cannot fail half-way
+    on lock upgrade. If the database stays busy, the whole transaction is
+    retried with exponential backoff.
+    """
+    for attempt in range(WRITE_RETRIES + 1):
+        conn = get_db_connection(timeout=WRITE_LOCK_TIMEOUT)
+        conn.isolation_level = None  # Manage the transaction explicitly
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            result = work(conn)
+            conn.execute('COMMIT')
+            return result
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            if not is_busy_error(e) or attempt == WRITE_RETRIES:
+                raise
+            time.sleep(WRITE_RETRY_BACKOFF * (2 ** attempt))
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+def get_idempotency_key(data):
+    """Get the client-supplied idempotency key from headers or JSON body"""
+    key = request.headers.get('Idempotency-Key') or (data or {}).get('idempotency_key')
+    return str(key)[:128] if key else None
+
+def get_idempotent_response(conn, key):
+    """Return a previously stored (payload, status) for this user's key, if any"""
+    if not key:
+        return None
+    row = conn.execute('SELECT response, status_code FROM idempotency_keys WHERE user_id = ? AND key = ?',
+                       (current_user.id, key)).fetchone()
+    if not row:
+        return None
+    return json.loads(row['response']), row['status_code']
+
+def replay_idempotent_request(key):
+    """Stored response for a retried request, looked up before the request has any side effects"""
+    if not key:
+        return None
+    conn = get_db_connection()
+    try:
+        return get_idempotent_response(conn, key)
+    finally:
+        conn.close()
+
+def store_idempotent_response(conn, key, payload, status_code):
+    """Remember the response for this key so retries replay it instead of writing again"""
+    if not key:
+        return
+    conn.execute("DELETE FROM idempotency_keys WHERE created_at < datetime('now', '-1 day')")
+    conn.execute('INSERT INTO idempotency_keys (user_id, key, response, status_code) VALUES (?, ?, ?, ?)',
+                 (current_user.id, key, json.dumps(payload), status_code))
+
+def insert_event_vendors(conn, event_id, items):
+    """Batch-insert cart items as event vendors, skipping vendors already on the event"""
+    cursor = conn.executemany(
+        'INSERT OR IGNORE INTO event_vendors (event_id, vendor_type, vendor_id, vendor_name, vendor_price) '
+        'VALUES (?, ?, ?, ?, ?)',
+        [(event_id, item.get('type'), item.get('id'), item.get('name'), item.get('price')) for item in items]
+    )
+    return cursor.rowcount
+
 # User Class for Flask-Login
 class User(UserMixin):
     def __init__(self, id, first_name, last_name, email, phone):
@@ -216,6 +391,50 @@ def init_db():
             FOREIGN KEY (event_id) REFERENCES events(id)
         )
     ''')
+    # Drop duplicate vendor rows left by double-submits before enforcing uniqueness
+    # (once; after that the index keeps them out)
+    unique_index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_event_vendors_unique'"
+    ).fetchone()
+    if not unique_index:
+        conn.execute('''
+            DELETE FROM event_vendors WHERE id NOT IN (
+                SELECT MIN(id) FROM event_vendors GROUP BY event_id, vendor_type, vendor_id
+            )
+        ''')
+        conn.execute('''
+            CREATE UNIQUE INDEX idx_event_vendors_unique
+            ON event_vendors(event_id, vendor_type, vendor_id)
+        ''')
+    # Finding a user's latest event
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_events_user_created ON events(user_id, created_at)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            user_id INTEGER NOT NULL,
+            key TEXT NOT NULL,
+            response TEXT NOT NULL,
+            status_code INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, key)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created ON idempotency_keys(created_at)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS password_resets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            token_hash TEXT UNIQUE NOT NULL,
+            expires_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_password_resets_expires ON password_resets(expires_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_password_resets_user ON password_resets(user_id)')
+    # Reset tokens used to be stored in plaintext on users; invalidate any left over
+    user_columns = [row['name'] for row in conn.execute('PRAGMA table_info(users)')]
+    if 'reset_token' in user_columns:
+        conn.execute('UPDATE users SET reset_token = NULL, reset_token_expiry = NULL WHERE reset_token IS NOT NULL')
     conn.execute('''
         CREATE TABLE IF NOT EXISTS checklist_items (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -234,11 +453,19 @@ def init_db():
             phone TEXT,
             email TEXT,
             status TEXT DEFAULT 'pending',
+            invites_count INTEGER DEFAULT 1,
             notes TEXT,
+            invited_at TIMESTAMP,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (event_id) REFERENCES events(id)
         )
     ''')
+    # Set when the guest's invitation email is queued, so it's only sent once
+    guest_columns = [row['name'] for row in conn.execute('PRAGMA table_info(guests)')]
+    if 'invited_at' not in guest_columns:
+        conn.execute('ALTER TABLE guests ADD COLUMN invited_at TIMESTAMP')
+    # Guest counters and bulk RSVP updates filter by event and status
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_guests_event_status ON guests(event_id, status)')
     conn.commit()
     conn.close()
     print("✅ Database initialized successfully!")
@@ -246,17 +473,199 @@ def init_db():
 # Initialize database on startup
 init_db()
 
+# Dates vendors are taken, from confirmed events and manual blocks
+availability = init_availability(get_db_connection)
+availability.setup()
+
+# Carts live on the server; the session cookie only carries the cart id.
+# Set CART_STORE=memory to keep them in-process (single worker only).
+cart_store = init_cart_store(None if os.environ.get('CART_STORE') == 'memory' else get_db_connection)
+
+# Authentication throttling: rule -> (requests, per_seconds).
+# Buckets are per process unless RATELIMIT_STORE=sqlite shares them between workers.
+RATE_LIMIT_RULES = {
+    'login:ip': (20, 60),
+    'login:email': (5, 60),
+    'register:ip': (10, 600),
+    'check_user:ip': (30, 60),
+    'forgot_password:ip': (5, 300),
+    'forgot_password:email': (3, 3600),
+    'reset_password:ip': (10, 300),
+}
+rate_limiter = init_rate_limiter(
+    RATE_LIMIT_RULES,
+    get_db_connection if os.environ.get('RATELIMIT_STORE') == 'sqlite' else None
+)
+rate_limiter.enabled = os.environ.get('RATELIMIT_ENABLED', '1') != '0'
+
+# At most this many requests per process may be hashing passwords at once
+auth_admission = ConcurrencyLimiter(int(os.environ.get('AUTH_MAX_CONCURRENCY', 8)))
+
+# Slow side effects (email) run on background workers. Workers start with the
+# first request in each process, so no threads exist before gunicorn forks.
+mailer = init_mailer(
+    os.environ.get('SMTP_HOST'),
+    int(os.environ.get('SMTP_PORT', 25)),
+    username=os.environ.get('SMTP_USERNAME'),
+    password=os.environ.get('SMTP_PASSWORD'),
+    use_tls=os.environ.get('SMTP_USE_TLS') == '1',
+    sender=os.environ.get('MAIL_FROM', 'EasyVents <no-reply@easyevents.local>')
+)
+job_queue = init_job_queue(get_db_connection, workers=int(os.environ.get('JOB_WORKERS', 2)))
+
+# Links in emails point here; never built from the request's Host header,
+# which the client controls (Render sets RENDER_EXTERNAL_URL for its services)
+PUBLIC_BASE_URL = os.environ.get('PUBLIC_BASE_URL') or os.environ.get('RENDER_EXTERNAL_URL') or 'http://localhost:5000'
+
+@app.before_request
+def start_background_workers():
+    job_queue.start()
+
+# Done and failed jobs are kept this long for inspection, then purged daily
+JOB_RETENTION_DAYS = float(os.environ.get('JOB_RETENTION_DAYS', 7))
+JOB_PURGE_INTERVAL = 24 * 3600  # seconds
+
+@job_queue.handler('purge_finished_jobs')
+def purge_finished_jobs(payload):
+    job_queue.purge(JOB_RETENTION_DAYS * 24 * 3600)
+
+job_queue.schedule('purge_finished_jobs', JOB_PURGE_INTERVAL)
+
+# Carts nothing was added to for this long are abandoned and swept daily
+CART_RETENTION_DAYS = float(os.environ.get('CART_RETENTION_DAYS', 30))
+CART_SWEEP_INTERVAL = 24 * 3600  # seconds
+
+@job_queue.handler('sweep_abandoned_carts')
+def sweep_abandoned_carts(payload):
+    cart_store.sweep(CART_RETENTION_DAYS * 24 * 3600)
+
+job_queue.schedule('sweep_abandoned_carts', CART_SWEEP_INTERVAL)
+
+# Buckets keyed by client IP or email would otherwise pile up in the shared store
+RATELIMIT_SWEEP_INTERVAL = 3600  # seconds
+
+@job_queue.handler('sweep_rate_limit_buckets')
+def sweep_rate_limit_buckets(payload):
+    rate_limiter.sweep()
+
+job_queue.schedule('sweep_rate_limit_buckets', RATELIMIT_SWEEP_INTERVAL)
+
+@app.before_request
+def label_request_metrics():
+    stats = request.environ.get(REQUEST_STATS_KEY)
+    if stats is not None:
+        stats.endpoint = request.endpoint
+
+@app.before_request
+def start_request_profiling():
+    if request.endpoint and profiler.should_sample():
+        profiler.begin(request.endpoint)
+
+@app.teardown_request
+def stop_request_profiling(error=None):
+    profiler.end()
+
+def report_repeated_statements(endpoint, statements):
+    for shape, count in query_tracer.repeated_statements(statements):
+        print(f"[N+1 SQL] {endpoint}: {count}x {shape}")
+        metrics.inc('easyevents_db_repeated_statements_total', {'endpoint': endpoint or 'unmatched'})
+
+@app.after_request
+def report_request_queries(response):
+    # A streamed body runs its statements after this hook, so the N+1 check
+    # waits until the response is closed
+    statements = g.setdefault('sql_statements', Counter())
+    endpoint = request.endpoint
+    response.call_on_close(lambda: report_repeated_statements(endpoint, statements))
+    stats = request.environ.get(REQUEST_STATS_KEY)
+    if QUERY_DEBUG_HEADERS and stats is not None:
+        response.headers['Server-Timing'] = f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries"'
+        response.headers['X-Query-Count'] = str(stats.queries)
+    return response
+
+def too_many_requests(retry_after):
+    """429 response telling the client when to retry"""
+    response = jsonify({
+        'success': False,
+        'message': 'יותר מדי ניסיונות, נסה שוב מאוחר יותר'
+    })
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
+
+def rate_limited(rule, by_email=False):
+    """Throttle a view per client IP, and per submitted email if requested"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            keys = [(f'{rule}:ip', request.remote_addr)]
+            if by_email:
+                email = str((request.get_json(silent=True) or {}).get('email') or '').strip().lower()
+                if email:
+                    keys.append((f'{rule}:email', email))
+
+            for rule_name, key in keys:
+                allowed, retry_after = rate_limiter.hit(rule_name, key)
+                if not allowed:
+                    return too_many_requests(retry_after)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Operator access: logged-in users listed in ADMIN_EMAILS (comma-separated),
+# or scripts sending "Authorization: Bearer <ADMIN_TOKEN>"
+ADMIN_EMAILS = {email.strip().lower() for email in os.environ.get('ADMIN_EMAILS', '').split(',') if email.strip()}
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+def is_admin():
+    if ADMIN_TOKEN and secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {ADMIN_TOKEN}'):
+        return True
+    return current_user.is_authenticated and current_user.email.lower() in ADMIN_EMAILS
+
+def admin_required(view):
+    """Restrict a view to operators"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin():
+            return jsonify({'success': False, 'message': 'אין הרשאה'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+def admission_controlled(view):
+    """Reject a request with 429 when too many password-hashing requests are running"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not auth_admission.try_acquire():
+            return too_many_requests(auth_admission.retry_after)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            auth_admission.release()
+    return wrapper
+
+# Offline town gazetteer for vendor coordinates and ?near= searches
+geo_index = init_geo_index(
+    get_db_connection,
+    os.environ.get('GAZETTEER_PATH') or os.path.join(BASE_DIR, 'data', 'il_cities.csv')
+)
+
+# Most rows a single /api/nearby answer (or ?nearest= on the results page) lists
+NEARBY_MAX_RESULTS = 500
+
 # Create SQLAlchemy tables and add sample data
 with app.app_context():
     db.create_all()
     print("✅ SQLAlchemy tables created!")
+    # Adds lat/lon to tables created before them, so it must run before the models are queried
+    placed = geo_index.setup()
+    if placed:
+        print(f"✅ Placed {placed} venues/suppliers on the map")
     
     # Add sample user if users table is empty
     conn = get_db_connection()
     existing_users = conn.execute('SELECT COUNT(*) as count FROM users').fetchone()
     if existing_users['count'] == 0:
-        from werkzeug.security import generate_password_hash
-        password_hash = generate_password_hash('123456')
+        # Hashed inline: the worker pool must not start threads before gunicorn forks
+        password_hash = generate_password_hash('123456', method=password_hasher.method)
         conn.execute('''
             INSERT INTO users (first_name, last_name, email, phone, password_hash, newsletter)
             VALUES (?, ?, ?, ?, ?, ?)
@@ -365,6 +774,144 @@ with app.app_context():
         db.session.commit()
         print("✅ Sample suppliers added!")
 
+# Bulk venue/supplier feeds (see /admin/catalog and manage_catalog.py)
+catalog_transfer = init_catalog_transfer(get_db_connection, batch_size=int(os.environ.get('CATALOG_BATCH_SIZE', 2000)))
+
+# Change log entries kept for running processes that are behind
+CATALOG_CHANGES_KEEP = int(os.environ.get('CATALOG_CHANGES_KEEP', 100000))
+
+def init_catalog_meta():
+    """
+    Single-row catalog version, bumped by triggers on every change to venues or
+    suppliers (app code, bulk imports and manual SQL alike). Caches derived from
+    the catalog key on it.
+    """
+    conn = get_db_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_meta (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute('INSERT OR IGNORE INTO catalog_meta (id, version) VALUES (1, 0)')
+    # Ids of changed rows, so in-memory indexes can re-read just those
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL
+        )
+    ''')
+    changed_ids = {'INSERT': ['NEW.id'], 'UPDATE': ['OLD.id', 'NEW.id'], 'DELETE': ['OLD.id']}
+    for table in ('venues', 'suppliers'):
+        for operation in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_catalog_version
+                AFTER {operation} ON {table}
+                BEGIN
+                    UPDATE catalog_meta SET version = version + 1 WHERE id = 1;
+                END
+            ''')
+            logged = ' UNION '.join(f"SELECT '{table}', {row_id}" for row_id in changed_ids[operation])
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_catalog_changes
+                AFTER {operation} ON {table}
+                BEGIN
+                    INSERT INTO catalog_changes (table_name, row_id) {logged};
+                END
+            ''')
+    prune_catalog_changes(conn)
+    conn.commit()
+    conn.close()
+
+def prune_catalog_changes(conn):
+    """
+    Keep only the newest CATALOG_CHANGES_KEEP log entries. A process that
+    needed pruned entries notices the gap and reloads in full.
+    """
+    conn.execute('DELETE FROM catalog_changes WHERE id <= (SELECT MAX(id) FROM catalog_changes) - ?',
+                 (CATALOG_CHANGES_KEEP,))
+
+init_catalog_meta()
+
+# Long-running servers trim the change log on the job queue schedule too
+CATALOG_CHANGES_PRUNE_INTERVAL = 3600  # seconds
+
+@job_queue.handler('prune_catalog_changes')
+def prune_catalog_changes_job(payload):
+    conn = get_db_connection()
+    prune_catalog_changes(conn)
+    conn.commit()
+    conn.close()
+
+job_queue.schedule('prune_catalog_changes', CATALOG_CHANGES_PRUNE_INTERVAL)
+
+# Last version this process read, and when
+_catalog_version_seen = {'version': None, 'at': 0.0}
+
+def get_catalog_version(max_age=0):
+    """
+    Current catalog version, read once per request
+
+    Args:
+        max_age: Seconds for which this process's last reading is good enough,
+                 for endpoints that must not query the database on every call
+    """
+    if has_request_context() and 'catalog_version' in g:
+        return g.catalog_version
+    seen = _catalog_version_seen
+    if max_age and seen['version'] is not None and time.monotonic() - seen['at'] < max_age:
+        return seen['version']
+    conn = get_db_connection()
+    version = conn.execute('SELECT version FROM catalog_meta WHERE id = 1').fetchone()[0]
+    conn.close()
+    _catalog_version_seen.update(version=version, at=time.monotonic())
+    if has_request_context():
+        g.catalog_version = version
+    return version
+
+# Rendered result cards, reused until the catalog changes
+fragment_cache = init_fragment_cache(int(os.environ.get('FRAGMENT_CACHE_SIZE', 5000)))
+
+# The site is Hebrew-only for now; cached fragments are keyed by locale for when it isn't
+DEFAULT_LOCALE = 'he'
+
+@app.template_global()
+def vendor_card(item, category):
+    """A result card from the fragment cache, rendered from _vendor_card.html on a miss"""
+    key = (item['type'], item['id'], category, DEFAULT_LOCALE)
+    html = fragment_cache.get_or_render(
+        key, get_catalog_version(),
+        lambda: app.jinja_env.get_template('_vendor_card.html').render(item=item, category=category)
+    )
+    return Markup(html)
+
+def load_search_rows():
+    """(vendor type, id, name, category) of every vendor, for the search index"""
+    conn = get_db_connection()
+    try:
+        yield from conn.execute("SELECT 'Venue', id, name, style FROM venues")
+        yield from conn.execute("SELECT 'Supplier', id, name, supplier_type FROM suppliers")
+    finally:
+        conn.close()
+
+# Typo-tolerant vendor search, rebuilt in memory when the catalog version changes
+vendor_search = init_vendor_search(load_search_rows)
+
+# Venues and suppliers as NumPy columns for the results filters, reloaded when
+# the catalog version changes. Used when NumPy is installed, unless COLUMNAR_FILTERS=0.
+columnar_catalog = init_columnar_catalog(get_db_connection)
+COLUMNAR_FILTERS = os.environ.get('COLUMNAR_FILTERS', '1') != '0'
+
+# Typeahead over cities, vendor names and categories for /api/suggest, kept in
+# step with the catalog through the catalog_changes log
+suggestions = init_suggestions(get_db_connection)
+
+# /api/suggest rechecks the catalog version at most this often (seconds), and
+# browsers / proxies may reuse an answer for SUGGEST_CACHE_SECONDS
+SUGGEST_VERSION_MAX_AGE = float(os.environ.get('SUGGEST_VERSION_MAX_AGE', 5))
+SUGGEST_CACHE_SECONDS = int(os.environ.get('SUGGEST_CACHE_SECONDS', 300))
+
 # --- IMAGE MANAGER API ---
 @app.route('/api/images/manifest', methods=['GET'])
 def get_image_manifest():
@@ -434,6 +981,15 @@ def get_government_events():
         }), 500
 
 
+def hasher_busy_response(error):
+    """Response for requests rejected because the password hashing queue is full"""
+    response = jsonify({
+        'success': False,
+        'message': 'השרת עמוס כרגע, נסה שוב בעוד מספר שניות'
+    })
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 503
+
 def validate_email(email):
     """Validate email format"""
     pattern = r'^[^\s@]+@[^\s@]+\.[^\s@]+$'
@@ -463,6 +1019,8 @@ def validate_phone(phone):
 # API Routes
 
 @app.route('/api/register', methods=['POST'])
+@rate_limited('register')
+@admission_controlled
 def register():
     """Register a new user"""
     data = request.get_json()
@@ -507,19 +1065,23 @@ def register():
     # Check if user already exists
     conn = get_db_connection()
     existing_user = conn.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
+    conn.close()
     
     if existing_user:
-        conn.close()
         return jsonify({
             'success': False,
             'message': 'משתמש עם אימייל זה כבר קיים במערכת',
             'redirect': 'login.html'
         }), 409
     
-    # Hash password
-    password_hash = generate_password_hash(password)
+    # Hash password (no connection is held while it runs)
+    try:
+        password_hash = password_hasher.hash(password)
+    except HasherBusy as e:
+        return hasher_busy_response(e)
     
     # Insert new user
+    conn = get_db_connection()
     try:
         conn.execute('''
             INSERT INTO users (first_name, last_name, email, phone, password_hash, newsletter)
@@ -546,6 +1108,8 @@ def register():
         }), 500
 
 @app.route('/api/login', methods=['POST'])
+@rate_limited('login', by_email=True)
+@admission_controlled
 def login():
     """Login user"""
     data = request.get_json()
@@ -581,11 +1145,29 @@ def login():
         }), 404
     
     # Verify password
-    if not check_password_hash(user_data['password_hash'], password):
+    try:
+        password_ok = password_hasher.verify(user_data['password_hash'], password)
+    except HasherBusy as e:
+        return hasher_busy_response(e)
+
+    if not password_ok:
         return jsonify({
             'success': False,
             'message': 'הסיסמה שגויה. נסה שוב.'
         }), 401
+
+    # Upgrade hashes made with older method/cost parameters while we have the plaintext
+    if password_hasher.needs_rehash(user_data['password_hash']):
+        try:
+            new_hash = password_hasher.hash(password)
+            conn = get_db_connection()
+            try:
+                conn.execute('UPDATE users SET password_hash = ? WHERE id = ?', (new_hash, user_data['id']))
+                conn.commit()
+            finally:
+                conn.close()
+        except (HasherBusy, sqlite3.Error):
+            pass  # Not urgent, the next login will try again
     
     # Login successful
     user_obj = User(user_data['id'], user_data['first_name'], user_data['last_name'], user_data['email'], user_data['phone'])
@@ -624,6 +1206,7 @@ def get_current_user_api():
     return jsonify({'authenticated': False})
 
 @app.route('/api/check_user', methods=['POST'])
+@rate_limited('check_user')
 def check_user():
     """Check if user exists by email"""
     data = request.get_json()
@@ -881,7 +1464,22 @@ def register_page():
 def forgot_password_page():
     return render_template('forgot_password.html')
 
+PASSWORD_RESET_TTL_HOURS = 1
+PASSWORD_RESET_SWEEP_INTERVAL = 3600  # seconds
+
+def hash_reset_token(token):
+    """Reset tokens are random, so a fast unsalted digest is enough to keep them out of the DB"""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def find_password_reset(conn, token):
+    """Get the unexpired reset row for a raw token (an index probe on token_hash)"""
+    return conn.execute(
+        "SELECT id, user_id FROM password_resets WHERE token_hash = ? AND expires_at > datetime('now')",
+        (hash_reset_token(token),)
+    ).fetchone()
+
 @app.route('/api/forgot-password', methods=['POST'])
+@rate_limited('forgot_password', by_email=True)
 def forgot_password_api():
     try:
         data = request.json
@@ -889,38 +1487,74 @@ def forgot_password_api():
         
         conn = get_db_connection()
         user = conn.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
+        conn.close()
         
         if not user:
-            conn.close()
             return jsonify({'message': 'אם האימייל קיים במערכת, נשלח אליו קישור לאיפוס'}), 200
-            
-        token = str(uuid.uuid4())
-        expiry = (datetime.now() + timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S.%f')
-        
-        conn.execute('UPDATE users SET reset_token = ?, reset_token_expiry = ? WHERE id = ?', 
-                    (token, expiry, user['id']))
-        conn.commit()
-        conn.close()
-        
-        print(f"PASSWORD RESET LINK: http://localhost:5000/reset-password/{token}")
+
+        # The job issues the token, so the raw token is never written to the jobs table
+        job_queue.enqueue('send_password_reset', {'user_id': user['id']})
         
         return jsonify({'message': 'אם האימייל קיים במערכת, נשלח אליו קישור לאיפוס'}), 200
     except Exception as e:
         print(f"Error in forgot_password_api: {e}")
         return jsonify({'message': 'שגיאה פנימית'}), 500
 
+@job_queue.handler('send_password_reset')
+def send_password_reset_email(payload):
+    conn = get_db_connection()
+    user = conn.execute('SELECT email, first_name FROM users WHERE id = ?', (payload['user_id'],)).fetchone()
+    if not user:
+        conn.close()
+        return  # Account was removed after the job was queued
+
+    token = secrets.token_urlsafe(32)
+
+    # Only the newest link stays valid (a retried job replaces its own token too)
+    conn.execute('DELETE FROM password_resets WHERE user_id = ?', (payload['user_id'],))
+    conn.execute(
+        "INSERT INTO password_resets (user_id, token_hash, expires_at) VALUES (?, ?, datetime('now', ?))",
+        (payload['user_id'], hash_reset_token(token), f'+{PASSWORD_RESET_TTL_HOURS} hours')
+    )
+    conn.commit()
+    conn.close()
+
+    with app.test_request_context(base_url=PUBLIC_BASE_URL):
+        reset_url = url_for('reset_password_page', token=token, _external=True)
+
+    mailer.send(
+        user['email'],
+        'איפוס סיסמה - EasyVents',
+        f"שלום {user['first_name']},\n\n"
+        f"לאיפוס הסיסמה שלך יש להיכנס לקישור הבא (בתוקף לשעה):\n{reset_url}\n\n"
+        "אם לא ביקשת לאפס את הסיסמה, ניתן להתעלם מהודעה זו."
+    )
+
+@job_queue.handler('sweep_password_resets')
+def sweep_password_resets(payload):
+    """Purge expired reset tokens and the finished jobs that sent them"""
+    conn = get_db_connection()
+    conn.execute("DELETE FROM password_resets WHERE expires_at <= datetime('now')")
+    conn.execute("DELETE FROM jobs WHERE kind = 'send_password_reset' AND status IN ('done', 'failed')")
+    conn.commit()
+    conn.close()
+
+job_queue.schedule('sweep_password_resets', PASSWORD_RESET_SWEEP_INTERVAL)
+
 @app.route('/reset-password/<token>')
 def reset_password_page(token):
     conn = get_db_connection()
-    user = conn.execute('SELECT * FROM users WHERE reset_token = ?', (token,)).fetchone()
+    reset = find_password_reset(conn, token)
     conn.close()
     
-    if not user:
+    if not reset:
         return render_template('login.html'), 400
         
     return render_template('reset_password.html', token=token)
 
 @app.route('/api/reset-password/<token>', methods=['POST'])
+@rate_limited('reset_password')
+@admission_controlled
 def reset_password_api(token):
     try:
         data = request.json
@@ -930,25 +1564,26 @@ def reset_password_api(token):
             return jsonify({'message': 'חסרה סיסמה'}), 400
 
         conn = get_db_connection()
-        user = conn.execute('SELECT * FROM users WHERE reset_token = ?', (token,)).fetchone()
+        reset = find_password_reset(conn, token)
         
-        if not user:
+        if not reset:
             conn.close()
             return jsonify({'message': 'קישור לא תקין או פג תוקף'}), 400
-            
-        reset_expiry_str = user['reset_token_expiry']
-        if reset_expiry_str:
-            try:
-                expiry = datetime.strptime(reset_expiry_str, '%Y-%m-%d %H:%M:%S.%f')
-                if datetime.now() > expiry:
-                    conn.close()
-                    return jsonify({'message': 'הקישור פג תוקף'}), 400
-            except ValueError:
-                 pass
         
-        hashed = generate_password_hash(password)
-        conn.execute('UPDATE users SET password_hash = ?, reset_token = NULL, reset_token_expiry = NULL WHERE id = ?',
-                    (hashed, user['id']))
+        try:
+            hashed = password_hasher.hash(password)
+        except HasherBusy as e:
+            conn.close()
+            return hasher_busy_response(e)
+
+        # Consuming the token and changing the password happen together;
+        # a concurrent request with the same token finds nothing to delete
+        cursor = conn.execute('DELETE FROM password_resets WHERE id = ?', (reset['id'],))
+        if cursor.rowcount != 1:
+            conn.rollback()
+            conn.close()
+            return jsonify({'message': 'קישור לא תקין או פג תוקף'}), 400
+        conn.execute('UPDATE users SET password_hash = ? WHERE id = ?', (hashed, reset['user_id']))
         conn.commit()
         conn.close()
         
@@ -965,151 +1600,260 @@ def plan_page():
 
 
 # Add Cart Routes
+CART_MODELS = {'Venue': Venue, 'Supplier': Supplier}
+
+def get_cart_id(create=False):
+    """Get the server-side cart id for this session, creating one if requested"""
+    cart_id = session.get('cart_id')
+    if not cart_id and create:
+        cart_id = uuid.uuid4().hex
+        session['cart_id'] = cart_id
+    return cart_id
+
+def get_cart_items():
+    """Get the current session's cart items"""
+    cart_id = get_cart_id()
+    return cart_store.items(cart_id) if cart_id else []
+
+def get_catalog_item(item_type, item_id):
+    """Look up the canonical cart entry for a venue or supplier"""
+    model = CART_MODELS.get(item_type)
+    if model is None:
+        return None
+    try:
+        obj = db.session.get(model, int(item_id))
+    except (TypeError, ValueError):
+        return None
+    if obj is None:
+        return None
+    return {'type': item_type, 'id': obj.id, 'name': obj.name, 'price': obj.price}
+
 @app.route('/api/cart/add', methods=['POST'])
 def add_to_cart():
-    """Add item to session cart"""
+    """Add item to the server-side cart"""
     data = request.get_json()
-    item_id = data.get('id')
-    item_type = data.get('type') # 'Venue' or 'Supplier'
-    
-    if 'cart' not in session:
-        session['cart'] = []
-    
-    # Check if already in cart
-    for item in session['cart']:
-        if item['id'] == item_id and item['type'] == item_type:
-            return jsonify({'success': False, 'message': 'הפריט כבר קיים בסל'})
-            
-    session['cart'].append(data)
-    session.modified = True
-    
-    return jsonify({'success': True, 'message': 'הפריט נוסף לסל בהצלחה', 'count': len(session['cart'])})
+    item = get_catalog_item(data.get('type'), data.get('id'))  # 'Venue' or 'Supplier'
+
+    if not item:
+        return jsonify({'success': False, 'message': 'הפריט לא נמצא'}), 404
+
+    cart_id = get_cart_id(create=True)
+    if not cart_store.add(cart_id, item):
+        return jsonify({'success': False, 'message': 'הפריט כבר קיים בסל'})
+
+    return jsonify({
+        'success': True,
+        'message': 'הפריט נוסף לסל בהצלחה',
+        'count': cart_store.count(cart_id)
+    })
 
 @app.route('/api/cart', methods=['GET'])
 def get_cart():
     """Get cart contents"""
-    cart = session.get('cart', [])
+    cart = get_cart_items()
     return jsonify({'cart': cart, 'count': len(cart)})
 
 @app.route('/api/cart/clear', methods=['POST'])
 def clear_cart():
-    session['cart'] = []
+    cart_id = get_cart_id()
+    if cart_id:
+        cart_store.clear(cart_id)
     return jsonify({'success': True})
 
 @app.route('/api/save_event', methods=['POST'])
 @login_required
 def save_event():
     """Save event with selected vendors to database"""
-    data = request.get_json()
-    
-    # Get cart items from session
-    cart = session.get('cart', [])
-    
+    data = request.get_json() or {}
+    idempotency_key = get_idempotency_key(data)
+
+    # A retry gets the first answer, even though the first request emptied the cart
+    replay = replay_idempotent_request(idempotency_key)
+    if replay:
+        return jsonify(replay[0]), replay[1]
+
+    # Get cart items from the server-side cart
+    cart = get_cart_items()
+
     if not cart:
         return jsonify({'success': False, 'message': 'הסל ריק. אנא בחר לפחות ספק אחד'}), 400
-    
-    try:
-        conn = get_db_connection()
-        
+
+    def write(conn):
+        replay = get_idempotent_response(conn, idempotency_key)
+        if replay:
+            return (*replay, True)  # A concurrent duplicate got here first
+
         # Create event record
         event_type = data.get('event_type', 'other')
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        cursor = conn.execute(
             'INSERT INTO events (user_id, event_type, status) VALUES (?, ?, ?)',
             (current_user.id, event_type, 'תכנון')
         )
-        
         event_id = cursor.lastrowid
-        
+
         # Add vendors to event
-        for item in cart:
-            cursor.execute(
-                'INSERT INTO event_vendors (event_id, vendor_type, vendor_id, vendor_name, vendor_price) VALUES (?, ?, ?, ?, ?)',
-                (event_id, item.get('type'), item.get('id'), item.get('name'), item.get('price'))
-            )
-        
-        conn.commit()
-        conn.close()
-        
-        # Clear cart after saving
-        session['cart'] = []
-        session.modified = True
-        
-        return jsonify({
+        insert_event_vendors(conn, event_id, cart)
+
+        payload = {
             'success': True,
             'message': 'האירוע נשמר בהצלחה!',
             'event_id': event_id,
             'redirect': f'/event/{event_id}/manage'
-        }), 201
-        
+        }
+        store_idempotent_response(conn, idempotency_key, payload, 201)
+        return payload, 201, False
+
+    try:
+        payload, status_code, replayed = run_write_transaction(write)
     except Exception as e:
-        conn.close()
         return jsonify({
             'success': False,
             'message': f'שגיאה בשמירת האירוע: {str(e)}'
         }), 500
 
+    # Clear cart after saving
+    if not replayed:
+        cart_store.clear(get_cart_id())
+
+    return jsonify(payload), status_code
+
 @app.route('/api/save_cart_to_event', methods=['POST'])
 @login_required
 def save_cart_to_event():
     """Save cart items to most recent event or create new one"""
-    data = request.get_json()
-    cart_items = data.get('cart_items', [])
-    
+    data = request.get_json() or {}
+    idempotency_key = get_idempotency_key(data)
+
+    replay = replay_idempotent_request(idempotency_key)
+    if replay:
+        return jsonify(replay[0]), replay[1]
+
+    # The server-side cart is authoritative; posted items are re-resolved against the catalog
+    cart_items = get_cart_items()
+    if not cart_items:
+        posted_items = (get_catalog_item(i.get('type'), i.get('id')) for i in data.get('cart_items', []))
+        cart_items = [item for item in posted_items if item]
+
     if not cart_items:
         return jsonify({'success': False, 'message': 'הסל ריק. אנא בחר לפחות ספק אחד'}), 400
-    
-    try:
-        conn = get_db_connection()
-        
+
+    def write(conn):
+        replay = get_idempotent_response(conn, idempotency_key)
+        if replay:
+            return replay
+
         # Get user's most recent event
         event = conn.execute(
-            'SELECT * FROM events WHERE user_id = ? ORDER BY created_at DESC LIMIT 1',
+            'SELECT id FROM events WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT 1',
             (current_user.id,)
         ).fetchone()
-        
+
         if not event:
             # Create new event if none exists
-            cursor = conn.cursor()
-            cursor.execute(
+            cursor = conn.execute(
                 'INSERT INTO events (user_id, event_type, status) VALUES (?, ?, ?)',
                 (current_user.id, 'other', 'תכנון')
             )
             event_id = cursor.lastrowid
         else:
             event_id = event['id']
-        
+
         # Add vendors to event
-        cursor = conn.cursor()
-        for item in cart_items:
-            cursor.execute(
-                'INSERT INTO event_vendors (event_id, vendor_type, vendor_id, vendor_name, vendor_price) VALUES (?, ?, ?, ?, ?)',
-                (event_id, item.get('type'), item.get('id'), item.get('name'), item.get('price'))
-            )
-        
-        conn.commit()
-        conn.close()
-        
-        return jsonify({
+        added = insert_event_vendors(conn, event_id, cart_items)
+
+        payload = {
             'success': True,
-            'message': f'הספקים נוספו בהצלחה! ({len(cart_items)} ספקים)',
+            'message': f'הספקים נוספו בהצלחה! ({added} ספקים)',
             'event_id': event_id,
             'redirect': f'/event/{event_id}/manage'
-        }), 201
-        
+        }
+        store_idempotent_response(conn, idempotency_key, payload, 201)
+        return payload, 201
+
+    try:
+        payload, status_code = run_write_transaction(write)
     except Exception as e:
-        if conn:
-            conn.close()
         return jsonify({
             'success': False,
             'message': f'שגיאה בשמירת הספקים: {str(e)}'
         }), 500
 
+    return jsonify(payload), status_code
+
+# Streamed pages are flushed to the client in chunks of about this many characters
+STREAM_CHUNK_SIZE = 8192
+# Rows per fetch when a query result is streamed into a response
+STREAM_FETCH_SIZE = 500
+STREAM_ERROR_NOTICE = ('<div role="alert" class="p-6 m-6 bg-red-50 text-red-700 text-center">'
+                       'אירעה שגיאה בטעינת הדף. נסו לרענן.</div>')
+
+def stream_page(template_name, **context):
+    """
+    Render a page as a streamed response, so the head and top of the page go
+    out while the rest (result groups, guest lists) is still being produced.
+
+    Everything up to the first chunk renders before returning, so a page that
+    fails early still gets the normal 500 response. Once bytes have been sent
+    the status can't change: a later failure is logged and the page ends with
+    an error notice instead.
+
+    With QUERY_DEBUG_HEADERS the whole page renders before returning, so the
+    query headers count its statements.
+    """
+    chunks = stream_template(template_name, **context)
+    # The generator may run after the request context is gone, so the log
+    # line can't read it from request
+    where = f'{request.path} [{request.method}]'
+
+    def buffered():
+        buffer, size, started = [], 0, False
+        try:
+            for chunk in chunks:
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= STREAM_CHUNK_SIZE:
+                    started = True
+                    yield ''.join(buffer)
+                    buffer, size = [], 0
+            started = True
+            yield ''.join(buffer)
+        except Exception:
+            if not started or app.testing:
+                raise
+            app.logger.exception('Exception while streaming %s', where)
+            yield ''.join(buffer) + STREAM_ERROR_NOTICE
+
+    body = buffered()
+    if QUERY_DEBUG_HEADERS:
+        return Response(''.join(body), mimetype='text/html')
+    first = next(body)
+
+    def replay():
+        yield first
+        yield from body
+
+    return Response(replay(), mimetype='text/html')
+
+def iter_query(sql, params=()):
+    """
+    Yield rows from a query on its own connection, STREAM_FETCH_SIZE at a time.
+    Runs while the response streams, after the view has returned.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(STREAM_FETCH_SIZE)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
 @app.route('/event/<int:event_id>/manage')
 @login_required
 def manage_event(event_id):
-    """Event management page with checklist"""
+    """Event management page with checklist; the guest list streams from the database"""
     conn = get_db_connection()
     
     # Get event and verify ownership
@@ -1139,11 +1883,11 @@ def manage_event(event_id):
         (event_id,)
     ).fetchall()
     
-    # Get guests
-    guests = conn.execute(
-        'SELECT * FROM guests WHERE event_id = ? ORDER BY created_at DESC',
+    # Guest totals up front; the rows themselves are read while the page streams
+    guest_totals = conn.execute(
+        'SELECT COUNT(*) AS guests, COALESCE(SUM(invites_count), 0) AS invites FROM guests WHERE event_id = ?',
         (event_id,)
-    ).fetchall()
+    ).fetchone()
     
     # Calculate progress
     total_count = len(checklist_items)
@@ -1151,13 +1895,16 @@ def manage_event(event_id):
     
     conn.close()
     
-    return render_template('manage_event.html',
-                         event=event,
-                         vendors=vendors,
-                         checklist_items=checklist_items,
-                         guests=guests,
-                         total_count=total_count,
-                         completed_count=checklist_completed)
+    return stream_page('manage_event.html',
+                       event=event,
+                       vendors=vendors,
+                       checklist_items=checklist_items,
+                       guests=iter_query('SELECT * FROM guests WHERE event_id = ? ORDER BY created_at DESC',
+                                         (event_id,)),
+                       guest_count=guest_totals['guests'],
+                       guest_invites=guest_totals['invites'],
+                       total_count=total_count,
+                       completed_count=checklist_completed)
 
 # ==================== GUEST MANAGEMENT API ====================
 
@@ -1182,6 +1929,7 @@ def manage_guests(event_id):
         data = request.get_json()
         name = data.get('name')
         phone = data.get('phone', '')
+        email = data.get('email', '')
         invites = data.get('invites_count', 1)
         
         if not name:
@@ -1190,8 +1938,8 @@ def manage_guests(event_id):
             
         try:
             conn.execute(
-                'INSERT INTO guests (event_id, name, phone, invites_count) VALUES (?, ?, ?, ?)',
-                (event_id, name, phone, invites)
+                'INSERT INTO guests (event_id, name, phone, email, invites_count) VALUES (?, ?, ?, ?, ?)',
+                (event_id, name, phone, email, invites)
             )
             conn.commit()
             guest_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
@@ -1201,6 +1949,40 @@ def manage_guests(event_id):
             conn.close()
             return jsonify({'success': False, 'message': str(e)}), 500
 
+def parse_guest_line(line, default_invites=1):
+    """
+    Parse one line of a pasted guest list
+
+    Formats supported:
+        "Name"
+        "Name - 5" (5 invites)
+        "Name - 0501234567"
+        "Name - 0501234567 - 5"
+
+    Returns:
+        (name, phone, invites); name is empty for a blank line
+    """
+    parts = [p.strip() for p in line.strip().split('-')]
+    name = parts[0]
+    phone = ''
+    invites = default_invites
+
+    if len(parts) > 1:
+        # Check if second part is number (invites) or phone
+        second = parts[1]
+        if second.isdigit() and len(second) < 5: # Likely invite count
+            invites = int(second)
+        else:
+            phone = second
+
+    if len(parts) > 2:
+        # Check third part
+        third = parts[2]
+        if third.isdigit():
+            invites = int(third)
+
+    return name, phone, invites
+
 @app.route('/api/event/<int:event_id>/guests/batch', methods=['POST'])
 @login_required
 def batch_add_guests(event_id):
@@ -1224,36 +2006,7 @@ def batch_add_guests(event_id):
         lines = raw_text.strip().split('\n')
         
         for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Basic parsing: Try to extract name, phone, count
-            # Formats supported:
-            # "Name"
-            # "Name - 5" (5 invites)
-            # "Name - 0501234567"
-            # "Name - 0501234567 - 5"
-            
-            parts = [p.strip() for p in line.split('-')]
-            name = parts[0]
-            phone = ''
-            invites = default_invites
-            
-            if len(parts) > 1:
-                # Check if second part is number (invites) or phone
-                second = parts[1]
-                if second.isdigit() and len(second) < 5: # Likely invite count
-                    invites = int(second)
-                else:
-                    phone = second
-                    
-            if len(parts) > 2:
-                 # Check third part
-                 third = parts[2]
-                 if third.isdigit():
-                     invites = int(third)
-            
+            name, phone, invites = parse_guest_line(line, default_invites)
             if name:
                 conn.execute(
                     'INSERT INTO guests (event_id, name, phone, invites_count) VALUES (?, ?, ?, ?)',
@@ -1299,6 +2052,165 @@ def manage_single_guest(event_id, guest_id):
         conn.close()
         return jsonify({'success': True, 'message': 'Guest updated'})
 
+GUEST_STATUSES = ('pending', 'confirmed', 'declined', 'maybe')
+
+# SQLite's default limit on bound parameters is 999
+GUEST_ID_CHUNK_SIZE = 500
+
+def get_guest_counters(conn, event_id):
+    """Count guests and invites per RSVP status for an event"""
+    rows = conn.execute('''
+        SELECT status, COUNT(*) AS guests, COALESCE(SUM(invites_count), 0) AS invites
+        FROM guests
+        WHERE event_id = ?
+        GROUP BY status
+    ''', (event_id,)).fetchall()
+
+    counters = {status: {'guests': 0, 'invites': 0} for status in GUEST_STATUSES}
+    for row in rows:
+        counters[row['status'] or 'pending'] = {'guests': row['guests'], 'invites': row['invites']}
+
+    return {
+        'by_status': counters,
+        'total_guests': sum(c['guests'] for c in counters.values()),
+        'total_invites': sum(c['invites'] for c in counters.values())
+    }
+
+@app.route('/api/event/<int:event_id>/guests/bulk', methods=['PUT'])
+@login_required
+def bulk_update_guests(event_id):
+    """
+    Set the RSVP status of many guests in a single transaction.
+
+    Body: {"status": "confirmed", "guest_ids": [1, 2, 3]}
+      or: {"status": "confirmed", "filter": {"status": "pending"}}
+    An empty filter ({}) targets every guest of the event.
+    """
+    data = request.get_json() or {}
+    status = data.get('status')
+    guest_ids = data.get('guest_ids')
+    guest_filter = data.get('filter')
+
+    if status not in GUEST_STATUSES:
+        return jsonify({'success': False, 'message': f'Status must be one of {list(GUEST_STATUSES)}'}), 400
+
+    if guest_ids is None and guest_filter is None:
+        return jsonify({'success': False, 'message': 'Either guest_ids or filter is required'}), 400
+
+    if guest_ids is not None:
+        if not isinstance(guest_ids, list) or not all(isinstance(g, int) for g in guest_ids):
+            return jsonify({'success': False, 'message': 'guest_ids must be a list of integers'}), 400
+    elif not isinstance(guest_filter, dict):
+        return jsonify({'success': False, 'message': 'filter must be an object'}), 400
+
+    conn = get_db_connection()
+
+    # Verify ownership once for the whole batch
+    event = conn.execute('SELECT id FROM events WHERE id = ? AND user_id = ?',
+                        (event_id, current_user.id)).fetchone()
+    if not event:
+        conn.close()
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+    try:
+        updated = 0
+        if guest_ids is not None:
+            unique_ids = list(dict.fromkeys(guest_ids))
+            for start in range(0, len(unique_ids), GUEST_ID_CHUNK_SIZE):
+                chunk = unique_ids[start:start + GUEST_ID_CHUNK_SIZE]
+                placeholders = ', '.join('?' * len(chunk))
+                cursor = conn.execute(
+                    f'UPDATE guests SET status = ? WHERE event_id = ? AND id IN ({placeholders})',
+                    [status, event_id, *chunk]
+                )
+                updated += cursor.rowcount
+        else:
+            query = 'UPDATE guests SET status = ? WHERE event_id = ?'
+            values = [status, event_id]
+            if 'status' in guest_filter:
+                query += ' AND status = ?'
+                values.append(guest_filter['status'])
+            cursor = conn.execute(query, values)
+            updated = cursor.rowcount
+
+        conn.commit()
+        counters = get_guest_counters(conn, event_id)
+        conn.close()
+        return jsonify({'success': True, 'updated': updated, 'counters': counters})
+    except Exception as e:
+        conn.rollback()
+        conn.close()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/event/<int:event_id>/guests/invite', methods=['POST'])
+@login_required
+def invite_guests(event_id):
+    """
+    Queue invitation emails for guests (all with an email, or the given guest_ids)
+
+    Guests already invited are skipped, so calling this again only reaches
+    guests added since.
+    """
+    data = request.get_json(silent=True) or {}
+    guest_ids = data.get('guest_ids')
+
+    if guest_ids is not None:
+        if not isinstance(guest_ids, list) or not all(isinstance(g, int) for g in guest_ids):
+            return jsonify({'success': False, 'message': 'guest_ids must be a list of integers'}), 400
+
+    conn = get_db_connection()
+
+    # Verify ownership
+    event = conn.execute('SELECT id FROM events WHERE id = ? AND user_id = ?',
+                        (event_id, current_user.id)).fetchone()
+    if not event:
+        conn.close()
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+    # Marking and picking guests in one statement keeps concurrent calls from
+    # queueing a second email for the same guest
+    claim = ("UPDATE guests SET invited_at = CURRENT_TIMESTAMP "
+             "WHERE event_id = ? AND email IS NOT NULL AND email != '' AND invited_at IS NULL")
+    if guest_ids is None:
+        ids = [row['id'] for row in conn.execute(f'{claim} RETURNING id', (event_id,))]
+    else:
+        ids = []
+        unique_ids = list(dict.fromkeys(guest_ids))
+        for start in range(0, len(unique_ids), GUEST_ID_CHUNK_SIZE):
+            chunk = unique_ids[start:start + GUEST_ID_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            ids += [row['id'] for row in conn.execute(f'{claim} AND id IN ({placeholders}) RETURNING id',
+                                                      (event_id, *chunk))]
+    conn.commit()
+    conn.close()
+
+    ids.sort()
+    job_queue.enqueue_many('send_guest_invitation', [{'guest_id': guest_id} for guest_id in ids])
+    return jsonify({'success': True, 'queued': len(ids)}), 202
+
+@job_queue.handler('send_guest_invitation')
+def send_guest_invitation(payload):
+    conn = get_db_connection()
+    guest = conn.execute('''
+        SELECT g.name, g.email, e.event_type, e.date, u.first_name, u.last_name
+        FROM guests g
+        JOIN events e ON g.event_id = e.id
+        JOIN users u ON e.user_id = u.id
+        WHERE g.id = ?
+    ''', (payload['guest_id'],)).fetchone()
+    conn.close()
+
+    if not guest or not guest['email']:
+        return  # Guest was removed or lost their email after the job was queued
+
+    mailer.send(
+        guest['email'],
+        f"הזמנה לאירוע של {guest['first_name']} {guest['last_name']}",
+        f"שלום {guest['name']},\n\n"
+        f"{guest['first_name']} {guest['last_name']} מזמינים אותך לאירוע"
+        f"{' בתאריך ' + guest['date'] if guest['date'] else ''}.\n\nנשמח לראותך!"
+    )
+
 # ==================== VENDOR MANAGEMENT API ====================
 
 @app.route('/api/event/<int:event_id>/vendor/<int:item_id>', methods=['DELETE'])
@@ -1451,22 +2363,124 @@ def checklist_item_api(item_id):
     conn.close()
     return jsonify({'success': True})
 
+# ==================== EXPORTS ====================
+
+GUEST_STATUS_LABELS = {'pending': 'ממתין לתשובה', 'confirmed': 'מגיע', 'declined': 'לא מגיע', 'maybe': 'אולי'}
+EVENT_COLUMNS = ['מס\' אירוע', 'סוג אירוע', 'תאריך אירוע']
+GUEST_COLUMNS = ['שם', 'טלפון', 'אימייל', 'סטטוס', 'מוזמנים', 'הערות', 'נוסף בתאריך']
+VENDOR_COLUMNS = ['ספק', 'סוג', 'מחיר', 'נוסף בתאריך']
+EVENT_SUMMARY_COLUMNS = EVENT_COLUMNS + ['סטטוס', 'אורחים מתוכננים', 'רשומות אורחים', 'מוזמנים שאישרו',
+                                         'ספקים', 'עלות ספקים']
+def guest_export_rows(event_id=None, user_id=None):
+    """Guests of one event, or of all of a user's events (then prefixed with the event columns)"""
+    columns = 'g.name, g.phone, g.email, g.status, g.invites_count, g.notes, g.created_at'
+    if event_id is not None:
+        rows = iter_query(f'SELECT {columns} FROM guests g WHERE g.event_id = ? ORDER BY g.name', (event_id,))
+        prefix = 0
+    else:
+        rows = iter_query(f'''
+            SELECT e.id, e.event_type, e.date, {columns}
+            FROM events e JOIN guests g ON g.event_id = e.id
+            WHERE e.user_id = ?
+            ORDER BY e.date, e.id, g.name
+        ''', (user_id,))
+        prefix = len(EVENT_COLUMNS)
+    for row in rows:
+        row = list(row)
+        row[prefix + 3] = GUEST_STATUS_LABELS.get(row[prefix + 3] or 'pending', row[prefix + 3])
+        yield row
+
+def vendor_export_rows(event_id=None, user_id=None):
+    columns = 'ev.vendor_name, ev.vendor_type, ev.vendor_price, ev.created_at'
+    if event_id is not None:
+        return iter_query(f'SELECT {columns} FROM event_vendors ev WHERE ev.event_id = ? ORDER BY ev.created_at',
+                          (event_id,))
+    return iter_query(f'''
+        SELECT e.id, e.event_type, e.date, {columns}
+        FROM events e JOIN event_vendors ev ON ev.event_id = e.id
+        WHERE e.user_id = ?
+        ORDER BY e.date, e.id, ev.created_at
+    ''', (user_id,))
+
+def event_summary_rows(user_id):
+    return iter_query('''
+        SELECT e.id, e.event_type, e.date, e.status, e.guests,
+               (SELECT COUNT(*) FROM guests g WHERE g.event_id = e.id),
+               (SELECT COALESCE(SUM(g.invites_count), 0) FROM guests g
+                WHERE g.event_id = e.id AND g.status = 'confirmed'),
+               (SELECT COUNT(*) FROM event_vendors ev WHERE ev.event_id = e.id),
+               (SELECT COALESCE(SUM(ev.vendor_price), 0) FROM event_vendors ev WHERE ev.event_id = e.id)
+        FROM events e
+        WHERE e.user_id = ?
+        ORDER BY e.date, e.id
+    ''', (user_id,))
+
+def export_response(filename, fmt, sheets):
+    """Stream sheets [(name, header, rows)] as an XLSX workbook, or the first one as CSV"""
+    if fmt == 'csv':
+        _, header, rows = sheets[0]
+        body = stream_csv(header, rows)
+    else:
+        body = stream_xlsx(sheets)
+    return Response(body, mimetype=CONTENT_TYPES[fmt], headers={
+        'Content-Disposition': f'attachment; filename={filename}.{fmt}',
+        'X-Accel-Buffering': 'no',  # Let a fronting nginx pass chunks straight through
+    })
+
+@app.route('/api/event/<int:event_id>/export/<any(guests, vendors):kind>.<any(csv, xlsx):fmt>')
+@login_required
+def export_event(event_id, kind, fmt):
+    """Download an event's guest list or vendors"""
+    conn = get_db_connection()
+    event = conn.execute('SELECT id FROM events WHERE id = ? AND user_id = ?',
+                        (event_id, current_user.id)).fetchone()
+    conn.close()
+    if not event:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+    if kind == 'guests':
+        sheet = ('מוזמנים', GUEST_COLUMNS, guest_export_rows(event_id=event_id))
+    else:
+        sheet = ('ספקים', VENDOR_COLUMNS, vendor_export_rows(event_id=event_id))
+    return export_response(f'event-{event_id}-{kind}', fmt, [sheet])
+
+@app.route('/api/events/export.xlsx')
+@app.route('/api/events/export/<any(events, guests, vendors):kind>.<any(csv, xlsx):fmt>')
+@login_required
+def export_account(kind=None, fmt='xlsx'):
+    """All of the user's events: a summary, guest and vendor sheet in one workbook, or one of them"""
+    user_id = current_user.id
+    sheets = {
+        'events': ('אירועים', EVENT_SUMMARY_COLUMNS, event_summary_rows(user_id)),
+        'guests': ('מוזמנים', EVENT_COLUMNS + GUEST_COLUMNS, guest_export_rows(user_id=user_id)),
+        'vendors': ('ספקים', EVENT_COLUMNS + VENDOR_COLUMNS, vendor_export_rows(user_id=user_id)),
+    }
+    if kind:
+        return export_response(f'my-events-{kind}', fmt, [sheets[kind]])
+    return export_response('my-events', fmt, list(sheets.values()))
+
 def get_grouped_results():
     """Helper to fetch and group filtered results"""
-    from sqlalchemy import or_
+    from sqlalchemy import or_, text
+
+    # Read the version before the catalog, so cards cached under it are never older than it
+    get_catalog_version()
 
     # Get filter params from request.args
     args = request.args
     
-    # Base Queries
+    # Base Queries, and the same filters for the columnar catalog
     venues_query = Venue.query
     suppliers_query = Supplier.query
+    venue_filters, supplier_filters = [], []
 
     # --- Filtering Logic ---
     
-    # 1. Region Filtering
-    # Handle comma-separated list or multiple args
+    # 1. Region / City Filtering
+    # Handle comma-separated list or multiple args; ?city= adds cities (e.g.
+    # picked with /api/suggest) beyond the fixed regions
     region_arg = args.get('region')
+    allowed_cities = [city.strip() for city in args.get('city', '').split(',') if city.strip()]
     if region_arg:
         selected_regions = region_arg.split(',')
         region_city_map = {
@@ -1476,13 +2490,15 @@ def get_grouped_results():
             'jerusalem': ['ירושלים', 'בית שמש', 'מבשרת ציון', 'מעלה אדומים'],
             'south': ['באר שבע', 'אשדוד', 'אשקלון', 'אילת', 'דימונה']
         }
-        allowed_cities = []
         for r in selected_regions:
             allowed_cities.extend(region_city_map.get(r, []))
-        
-        if allowed_cities:
-            venues_query = venues_query.filter(Venue.city.in_(allowed_cities))
-            suppliers_query = suppliers_query.filter(Supplier.city.in_(allowed_cities))
+            allowed_cities.extend(geo_index.gazetteer.in_region(r))
+
+    if allowed_cities:
+        venues_query = venues_query.filter(Venue.city.in_(allowed_cities))
+        suppliers_query = suppliers_query.filter(Supplier.city.in_(allowed_cities))
+        venue_filters.append(('in', 'city', allowed_cities))
+        supplier_filters.append(('in', 'city', allowed_cities))
 
     # 2. Venue Type Filtering (Venues only)
     venue_type = args.get('venue_type')
@@ -1497,6 +2513,7 @@ def get_grouped_results():
         keywords = type_keywords.get(venue_type)
         if keywords:
             venues_query = venues_query.filter(or_(*[Venue.name.like(f'%{k}%') for k in keywords]))
+            venue_filters.append(('like', 'name', keywords))
 
     # 3. Style Filtering (Venues mostly)
     style = args.get('style')
@@ -1512,11 +2529,13 @@ def get_grouped_results():
         hebrew_style = style_map.get(style)
         if hebrew_style:
              venues_query = venues_query.filter(Venue.style.like(f'%{hebrew_style}%'))
+             venue_filters.append(('like', 'style', [hebrew_style]))
 
     # 4. Guest Capacity (Venues)
     guests = args.get('guests', type=int)
     if guests:
          venues_query = venues_query.filter(Venue.capacity >= guests)
+         venue_filters.append(('>=', 'capacity', guests))
 
     # 5. Budget Filtering (Venues) - Rough estimation
     budget = args.get('budget')
@@ -1533,10 +2552,90 @@ def get_grouped_results():
         max_price = budget_map.get(budget)
         if max_price:
              venues_query = venues_query.filter(Venue.price <= max_price)
+             venue_filters.append(('<=', 'price', max_price))
+
+    # 5b. Open air (Venues): ?open_air=1 or 0
+    open_air = args.get('open_air')
+    if open_air in ('0', '1'):
+        venues_query = venues_query.filter(Venue.is_open_air.is_(open_air == '1'))
+        venue_filters.append(('==', 'is_open_air', int(open_air)))
+
+    # 6. Free-text search (typo tolerant), best matches first
+    query = args.get('q', '').strip()
+    matches = vendor_search.index(get_catalog_version()).match_vendors(query) if query else None
+
+    # 7. Proximity: ?near=<town or lat,lon>, within ?radius= km and/or the ?nearest= N vendors
+    origin = geo_index.locate(args.get('near', ''))
+    radius = args.get('radius', type=float)
+    nearest = args.get('nearest', type=int)
+    # Values /api/nearby rejects are ignored here, as the page has nowhere to show an error
+    radius = radius if radius is not None and radius > 0 else None
+    nearest = min(nearest, NEARBY_MAX_RESULTS) if nearest is not None and nearest > 0 else None
+    if origin and nearest:
+        # The R*Tree finds the nearest vendors (within the radius, if any); only those are loaded
+        hits = geo_index.nearest(*origin, nearest, max_radius_km=radius)
+        venue_ids = [vendor_id for _, vendor_type, vendor_id in hits if vendor_type == 'Venue']
+        supplier_ids = [vendor_id for _, vendor_type, vendor_id in hits if vendor_type == 'Supplier']
+        venues_query = venues_query.filter(Venue.id.in_(venue_ids))
+        suppliers_query = suppliers_query.filter(Supplier.id.in_(supplier_ids))
+        venue_filters.append(('in', 'id', venue_ids))
+        supplier_filters.append(('in', 'id', supplier_ids))
+    elif origin and radius:
+        # The R*Tree narrows the rows to the circle's bounding box in SQL
+        sql, box = geo_index.box_sql('venues', *origin, radius)
+        venues_query = venues_query.filter(text(sql).bindparams(**box))
+        sql, box = geo_index.box_sql('suppliers', *origin, radius)
+        suppliers_query = suppliers_query.filter(text(sql).bindparams(**box))
+        venue_filters.append(('within', None, (*origin, radius)))
+        supplier_filters.append(('within', None, (*origin, radius)))
+
+    # The columnar catalog answers the filters above in memory when NumPy is installed
+    columns = columnar_catalog.columns(get_catalog_version()) if columnar_catalog.enabled and COLUMNAR_FILTERS else None
+    if columns is not None and columns.version != get_catalog_version():
+        columns = None  # The new version is still loading: its cards must not come from the old one
+
+    # 8. Availability: ?date= (and ?time_of_day=) hides vendors already booked then
+    day = parse_day(args.get('date'))
+    if day and columns is not None:
+        venue_filters.append(('not_in', 'id', availability.taken_ids('Venue', day, args.get('time_of_day'))))
+        supplier_filters.append(('not_in', 'id', availability.taken_ids('Supplier', day, args.get('time_of_day'))))
+    elif day:
+        time_of_day = args.get('time_of_day')
+        sql, params = availability.free_sql('venues', 'Venue', day, time_of_day)
+        venues_query = venues_query.filter(text(sql).bindparams(**params))
+        sql, params = availability.free_sql('suppliers', 'Supplier', day, time_of_day)
+        suppliers_query = suppliers_query.filter(text(sql).bindparams(**params))
 
     # Fetch Results
-    venues = venues_query.all()
-    suppliers = suppliers_query.all()
+    if columns is not None:
+        venues = columns['venues'].select(venue_filters)
+        suppliers = columns['suppliers'].select(supplier_filters)
+    else:
+        venues = venues_query.all()
+        suppliers = suppliers_query.all()
+    if matches is not None:
+        venues = [v for v in venues if ('Venue', v.id) in matches]
+        suppliers = [s for s in suppliers if ('Supplier', s.id) in matches]
+
+    distances = None
+    if origin:
+        distances = {}
+        by_point = {}  # Most vendors share their town's centre
+        for vendor_type, rows in (('Venue', venues), ('Supplier', suppliers)):
+            for row in rows:
+                if row.lat is None or row.lon is None:
+                    continue
+                point = (row.lat, row.lon)
+                if point not in by_point:
+                    by_point[point] = haversine_km(*origin, *point)
+                distances[(vendor_type, row.id)] = by_point[point]
+        if radius:
+            distances = {key: km for key, km in distances.items() if km <= radius}
+        if nearest:
+            distances = dict(sorted(distances.items(), key=lambda item: item[1])[:nearest])
+        if radius or nearest:
+            venues = [v for v in venues if ('Venue', v.id) in distances]
+            suppliers = [s for s in suppliers if ('Supplier', s.id) in distances]
     
     grouped = {
         'אולמות וגנים': [],
@@ -1584,14 +2683,253 @@ def get_grouped_results():
             grouped['להקות ותזמורות'].append(item)
         elif 'עיצוב' in supplier_type or 'designer' in supplier_type or 'פרחים' in supplier_type or 'דקור' in supplier_type or 'איפור' in supplier_type or 'makeup' in supplier_type or 'אטרקציות' in supplier_type:
             grouped['עיצוב אירועים'].append(item)
-            
+
+    if distances is not None:
+        for items in grouped.values():
+            items.sort(key=lambda item: distances.get((item['type'], item['id']), float('inf')))
+    elif matches is not None:
+        for items in grouped.values():
+            items.sort(key=lambda item: matches[(item['type'], item['id'])], reverse=True)
     return grouped
 
 @app.route('/results')
 def results_page():
-    """Serve the results page"""
-    results = get_grouped_results()
-    return render_template('results.html', results=results)
+    """Serve the results page; the catalog is queried once the page head has been sent"""
+    return stream_page('results.html', load_results=get_grouped_results)
+
+@app.route('/api/search/autocomplete', methods=['GET'])
+def search_autocomplete():
+    """Vendor names matching ?q= despite typos or spelling variants, from the in-memory index"""
+    query = request.args.get('q', '').strip()
+    limit = max(1, min(request.args.get('limit', 8, type=int), 50))
+    if not query:
+        return jsonify({'success': True, 'results': []})
+    index = vendor_search.index(get_catalog_version())
+    results = [{
+        'name': entry.name,
+        'type': entry.vendor_type,
+        'category': entry.category,
+        'id': entry.vendors[0][1],
+        'count': len(entry.vendors),
+        'score': score,
+    } for score, entry in index.search(query, limit)]
+    return jsonify({'success': True, 'results': results})
+
+@app.route('/api/nearby', methods=['GET'])
+def nearby_vendors():
+    """
+    Venues and suppliers near ?near= (a town or "lat,lon"), nearest first:
+    those within ?radius= km, and/or the ?nearest= N (default 20).
+    ?type=venues or suppliers limits the search to one of them.
+    """
+    origin = geo_index.locate(request.args.get('near', ''))
+    if origin is None:
+        return jsonify({'success': False, 'message': 'מיקום לא מוכר'}), 400
+    radius = request.args.get('radius', type=float)
+    nearest = request.args.get('nearest', type=int)
+    table = request.args.get('type')
+    if (radius is not None and radius <= 0) or (nearest is not None and nearest <= 0) \
+            or (table is not None and table not in GEO_TABLES):
+        return jsonify({'success': False, 'message': 'פרמטרים לא תקינים'}), 400
+    tables = [table] if table else list(GEO_TABLES)
+
+    if radius and not nearest:
+        hits = geo_index.within(*origin, radius, tables)
+    else:
+        hits = geo_index.nearest(*origin, min(nearest or 20, NEARBY_MAX_RESULTS), tables, max_radius_km=radius)
+
+    shown = hits[:NEARBY_MAX_RESULTS]
+    details = {}
+    conn = get_db_connection()
+    for table_name, vendor_type in GEO_TABLES.items():
+        ids = [vendor_id for _, hit_type, vendor_id in shown if hit_type == vendor_type]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for row in conn.execute(f'SELECT id, name, city FROM {table_name} WHERE id IN ({placeholders})', chunk):
+                details[(vendor_type, row['id'])] = (row['name'], row['city'])
+    conn.close()
+
+    results = [{
+        'type': vendor_type,
+        'id': vendor_id,
+        'name': details[(vendor_type, vendor_id)][0],
+        'city': details[(vendor_type, vendor_id)][1],
+        'distance_km': round(distance, 2),
+    } for distance, vendor_type, vendor_id in shown if (vendor_type, vendor_id) in details]
+    return jsonify({
+        'success': True,
+        'origin': {'lat': origin[0], 'lon': origin[1]},
+        'total': len(hits),
+        'results': results,
+    })
+
+# Most vendors a single /api/availability lookup covers
+AVAILABILITY_MAX_VENDORS = 500
+
+@app.route('/api/availability', methods=['GET'])
+def vendor_availability():
+    """
+    Booked slots for calendars: ?type=Venue|Supplier&ids=1,2,3&from=<day>&to=<day>.
+    Vendors and days missing from the answer are free.
+    """
+    vendor_type = request.args.get('type')
+    days = parse_range(request.args.get('from'), request.args.get('to'))
+    try:
+        ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        ids = None
+    if vendor_type not in VENDOR_TYPES or not days or not ids or len(ids) > AVAILABILITY_MAX_VENDORS:
+        return jsonify({'success': False, 'message': 'פרמטרים לא תקינים'}), 400
+    booked = availability.booked(vendor_type, ids, *days)
+    return jsonify({
+        'success': True,
+        'type': vendor_type,
+        'from': days[0],
+        'to': days[1],
+        'booked': {str(vendor_id): slots for vendor_id, slots in booked.items()},
+    })
+
+@app.route('/admin/availability/<any(Venue, Supplier):vendor_type>/<int:vendor_id>', methods=['POST', 'DELETE'])
+@admin_required
+def block_vendor_dates(vendor_type, vendor_id):
+    """
+    Block (POST) or release (DELETE) days on a vendor's calendar, e.g. dates
+    booked outside EasyVents. JSON: {"from": day, "to": day, "slot": "evening"};
+    without a slot POST blocks whole days and DELETE releases every slot.
+    """
+    data = request.get_json(silent=True) or {}
+    days = parse_range(data.get('from'), data.get('to'))
+    slot = data.get('slot')
+    if not days or (slot is not None and slot not in SLOTS + (WHOLE_DAY,)):
+        return jsonify({'success': False, 'message': 'פרמטרים לא תקינים'}), 400
+    if request.method == 'POST':
+        blocked = availability.block(vendor_type, vendor_id, *days, slot or WHOLE_DAY)
+        return jsonify({'success': True, 'blocked': blocked})
+    return jsonify({'success': True, 'released': availability.unblock(vendor_type, vendor_id, *days, slot)})
+
+@app.route('/api/suggest', methods=['GET'])
+def suggest():
+    """
+    Typeahead for ?q= (a prefix of any word), optionally one ?kind= of
+    city / venue / supplier / category. Answered from memory; the ETag is the
+    catalog version, so a repeated keystroke is a 304 until the catalog changes.
+    """
+    kind = request.args.get('kind') or None
+    if kind is not None and kind not in SUGGEST_KINDS:
+        return jsonify({'success': False, 'message': 'סוג לא נתמך'}), 400
+    version = get_catalog_version(max_age=SUGGEST_VERSION_MAX_AGE)
+    etag = f'catalog-{version}'
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        limit = max(1, min(request.args.get('limit', 8, type=int), 20))
+        response = jsonify({
+            'success': True,
+            'suggestions': suggestions.suggest(request.args.get('q', ''), version, kind, limit),
+        })
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = SUGGEST_CACHE_SECONDS
+    return response
+
+# ==================== CATALOG IMPORT/EXPORT ====================
+
+@app.route('/admin/catalog/<any(venues, suppliers):table>', methods=['GET'])
+@admin_required
+def export_catalog(table):
+    """Stream a catalog table, ?format=csv (default) or jsonl"""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in FORMATS:
+        return jsonify({'success': False, 'message': 'פורמט לא נתמך'}), 400
+    return Response(
+        catalog_transfer.export(table, fmt),
+        mimetype='text/csv' if fmt == 'csv' else 'application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename={table}.{fmt}'}
+    )
+
+@app.route('/admin/catalog/<any(venues, suppliers):table>', methods=['POST'])
+@admin_required
+def import_catalog(table):
+    """
+    Upsert a CSV / JSONL feed, uploaded as a 'file' form field or as the raw
+    request body. ?format= overrides the file extension; ?dry_run=1 only validates.
+    """
+    upload = request.files.get('file')
+    fmt = request.args.get('format') or format_from_filename(upload.filename if upload else None)
+    if fmt not in FORMATS:
+        return jsonify({'success': False, 'message': 'פורמט לא נתמך'}), 400
+    result = catalog_transfer.import_stream(
+        table, upload.stream if upload else request.stream, fmt,
+        dry_run=request.args.get('dry_run') == '1'
+    )
+    return jsonify({'success': result.error_count == 0, **result.to_dict()})
+
+# ==================== MONITORING ====================
+
+# If set, scrapers must send "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint"""
+    if METRICS_TOKEN and not secrets.compare_digest(
+            request.headers.get('Authorization', ''), f'Bearer {METRICS_TOKEN}'):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/profiler', methods=['GET'])
+@admin_required
+def profiler_status():
+    """Profiler settings and samples collected per route"""
+    return jsonify({'success': True, 'profiler': profiler.summary()})
+
+@app.route('/admin/profiler', methods=['PUT'])
+@admin_required
+def configure_profiler():
+    """Switch sampling on/off or change sample_rate (0-1) / interval_ms, in all workers"""
+    data = request.get_json(silent=True) or {}
+    changes = {}
+    try:
+        if 'enabled' in data:
+            changes['enabled'] = bool(data['enabled'])
+        if 'sample_rate' in data:
+            changes['sample_rate'] = float(data['sample_rate'])
+        if 'interval_ms' in data:
+            changes['interval'] = float(data['interval_ms']) / 1000
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'ערך לא תקין'}), 400
+    return jsonify({'success': True, 'profiler': profiler.configure(**changes)})
+
+@app.route('/admin/profiler/stacks', methods=['GET'])
+@admin_required
+def profiler_stacks():
+    """Collapsed stacks (flamegraph.pl / speedscope input), optionally for one ?route="""
+    return Response(profiler.collapsed(request.args.get('route')), mimetype='text/plain')
+
+@app.route('/admin/profiler/stacks', methods=['DELETE'])
+@admin_required
+def reset_profiler():
+    profiler.reset()
+    return jsonify({'success': True})
+
+# ==================== WORKER LIFECYCLE (see gunicorn.conf.py) ====================
+
+def warm_caches():
+    """
+    Build the search indexes and catalog columns and load all templates (from
+    the bytecode cache), so a worker's first requests are not cold
+    """
+    vendor_search.index(get_catalog_version())
+    suggestions.refresh(get_catalog_version())
+    if columnar_catalog.enabled:
+        columnar_catalog.columns(get_catalog_version())
+    compile_templates(app.jinja_env)
+
+def reset_after_fork():
+    """Drop pooled database connections inherited from the preloading parent process"""
+    with app.app_context():
+        db.engine.dispose(close=False)
 
 if __name__ == '__main__':
     print("🚀 Starting EasyVents API Server...")
@@ -0,0 +1,142 @@
+"""
+EasyVents - ASGI entry point
+Serves the Flask app from an ASGI server (uvicorn), offloading each request to a thread pool
+
+Usage (from backend/):
+    uvicorn asgi:asgi_app --port 5000
+    WORKER_CLASS=asgi gunicorn          (see gunicorn.conf.py)
+
+The event loop owns the sockets, so idle keep-alive connections and slow
+clients cost nothing; only requests that are actually being processed
+(e.g. running their SQLite queries) occupy one of ASGI_THREADS threads.
+"""
+
+import asyncio
+import contextvars
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app
+
+
+class ThreadPoolWSGIAdapter:
+    """
+    Minimal WSGI-to-ASGI bridge running the WSGI app on a bounded thread pool
+
+    asgiref's WsgiToAsgi runs every request on one shared thread, which
+    serialises the whole app; here requests run concurrently on up to
+    `max_threads` threads. Response bodies are pulled chunk by chunk, so
+    streamed responses stay streamed.
+
+    Each chunk may be pulled on a different pool thread, so the app call and
+    every pull run in one context copied per request: streamed templates
+    keep Flask's request context however the pool schedules them.
+    """
+
+    def __init__(self, wsgi_app, max_threads: int = 32):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix='asgi-request')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        body = await self._read_body(receive)
+        if body is None:
+            return  # Client disconnected before sending the full request
+
+        loop = asyncio.get_running_loop()
+        response_start = {}
+
+        def start_response(status, headers, exc_info=None):
+            response_start['status'] = int(status.split(' ', 1)[0])
+            response_start['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers
+            ]
+
+        context = contextvars.copy_context()
+        result = await loop.run_in_executor(
+            self.executor, context.run, self.wsgi_app, self._build_environ(scope, body), start_response
+        )
+        chunks = iter(result)
+        done = object()
+        try:
+            # start_response may be deferred until the first chunk is produced
+            chunk = await loop.run_in_executor(self.executor, context.run, next, chunks, done)
+            await send({
+                'type': 'http.response.start',
+                'status': response_start['status'],
+                'headers': response_start['headers'],
+            })
+            while chunk is not done:
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                chunk = await loop.run_in_executor(self.executor, context.run, next, chunks, done)
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            if hasattr(result, 'close'):
+                await loop.run_in_executor(self.executor, context.run, result.close)
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _read_body(receive):
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            body.extend(message.get('body', b''))
+            if not message.get('more_body', False):
+                return bytes(body)
+
+    @staticmethod
+    def _build_environ(scope, body):
+        server_name, server_port = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server_name,
+            'SERVER_PORT': str(server_port),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+            'CONTENT_LENGTH': str(len(body)),
+        }
+        for raw_name, raw_value in scope.get('headers', []):
+            name = raw_name.decode('latin-1').upper().replace('-', '_')
+            value = raw_value.decode('latin-1')
+            if name == 'CONTENT_TYPE':
+                environ['CONTENT_TYPE'] = value
+                continue
+            if name == 'CONTENT_LENGTH':
+                continue  # Recomputed from the body we actually received
+            key = f'HTTP_{name}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+        return environ
+
+
+asgi_app = ThreadPoolWSGIAdapter(app, max_threads=int(os.environ.get('ASGI_THREADS', 32)))
@@ -0,0 +1,240 @@
+"""
+Availability for EasyVents
+Booked dates and time slots per venue and supplier, kept in step with confirmed events
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Time slots an event can take (events.time_of_day); 'day' blocks all of them
+SLOTS = ('morning', 'noon', 'evening', 'night')
+WHOLE_DAY = 'day'
+
+# Event statuses whose vendors hold the date; planning drafts and cancelled events don't
+BOOKED_STATUSES = ('בתהליך', 'הושלם')
+
+VENDOR_TYPES = ('Venue', 'Supplier')
+
+# Longest range a single lookup or block may cover
+MAX_RANGE_DAYS = 366
+
+LOOKUP_CHUNK = 500  # Stay well below SQLite's bound-parameter limit
+
+DAY_MONTH_YEAR = re.compile(r'^\s*(\d{1,2})[./](\d{1,2})[./](\d{4})\s*$')
+
+
+def parse_day(text: Optional[str]) -> Optional[str]:
+    """'2026-06-10', '10/06/2026' or '10.6.2026' -> '2026-06-10'; None if not a date"""
+    text = (text or '').strip()
+    try:
+        match = DAY_MONTH_YEAR.match(text)
+        if match:
+            day, month, year = map(int, match.groups())
+            return date(year, month, day).isoformat()
+        return date.fromisoformat(text).isoformat()
+    except ValueError:
+        return None
+
+
+def parse_range(start: Optional[str], end: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Both ends as days, or None if either is invalid, they're reversed or the range is too long"""
+    start, end = parse_day(start), parse_day(end or start)
+    if not start or not end or start > end:
+        return None
+    if (date.fromisoformat(end) - date.fromisoformat(start)).days >= MAX_RANGE_DAYS:
+        return None
+    return start, end
+
+
+def day_range(start: str, end: str) -> List[str]:
+    """Every day from start to end, inclusive"""
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+
+class AvailabilityCalendar:
+    """
+    One bookings row per vendor, day and slot
+
+    Rows with an event_id come from events: triggers add them when a vendor
+    joins a confirmed event with a date, and drop or move them when the event
+    is rescheduled, cancelled or deleted, or the vendor is removed from it.
+    Rows without one are dates blocked by the vendor or an operator.
+
+    Lookups are index range scans: by vendor and date for calendars, and by
+    date for the results filter, which reads only that day's bookings however
+    large the catalog is.
+    """
+
+    def __init__(self, connect: Callable):
+        """
+        Args:
+            connect: Returns a new sqlite3 connection to the app database
+        """
+        self.connect = connect
+
+    def setup(self) -> None:
+        """Create the bookings table, its indexes and triggers where missing"""
+        slot = f"CASE WHEN {{event}}.time_of_day IN ({', '.join(repr(s) for s in SLOTS)}) " \
+               f"THEN {{event}}.time_of_day ELSE '{WHOLE_DAY}' END"
+        booked = ', '.join(repr(status) for status in BOOKED_STATUSES)
+        conn = self.connect()
+        try:
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'bookings'").fetchone()
+            conn.executescript(f'''
+                CREATE TABLE IF NOT EXISTS bookings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    vendor_type TEXT NOT NULL,
+                    vendor_id INTEGER NOT NULL,
+                    date TEXT NOT NULL,
+                    slot TEXT NOT NULL,
+                    event_id INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                -- A vendor's calendar over a date range
+                CREATE INDEX IF NOT EXISTS idx_bookings_vendor_date ON bookings(vendor_type, vendor_id, date, slot);
+                -- Vendors taken on a given day (results filter); covers the lookup
+                CREATE INDEX IF NOT EXISTS idx_bookings_date ON bookings(date, vendor_type, slot, vendor_id);
+                CREATE INDEX IF NOT EXISTS idx_bookings_event ON bookings(event_id);
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_bookings_blocks
+                    ON bookings(vendor_type, vendor_id, date, slot) WHERE event_id IS NULL;
+
+                CREATE TRIGGER IF NOT EXISTS event_vendors_insert_bookings AFTER INSERT ON event_vendors
+                BEGIN
+                    INSERT INTO bookings (vendor_type, vendor_id, date, slot, event_id)
+                    SELECT NEW.vendor_type, NEW.vendor_id, date(events.date), {slot.format(event='events')}, events.id
+                    FROM events
+                    WHERE events.id = NEW.event_id AND events.status IN ({booked}) AND date(events.date) IS NOT NULL;
+                END;
+                CREATE TRIGGER IF NOT EXISTS event_vendors_delete_bookings AFTER DELETE ON event_vendors
+                BEGIN
+                    DELETE FROM bookings WHERE event_id = OLD.event_id
+                        AND vendor_type = OLD.vendor_type AND vendor_id = OLD.vendor_id;
+                END;
+                CREATE TRIGGER IF NOT EXISTS events_update_bookings AFTER UPDATE OF date, time_of_day, status ON events
+                BEGIN
+                    DELETE FROM bookings WHERE event_id = OLD.id;
+                    INSERT INTO bookings (vendor_type, vendor_id, date, slot, event_id)
+                    SELECT vendor_type, vendor_id, date(NEW.date), {slot.format(event='NEW')}, NEW.id
+                    FROM event_vendors
+                    WHERE event_id = NEW.id AND NEW.status IN ({booked}) AND date(NEW.date) IS NOT NULL;
+                END;
+                CREATE TRIGGER IF NOT EXISTS events_delete_bookings AFTER DELETE ON events
+                BEGIN
+                    DELETE FROM bookings WHERE event_id = OLD.id;
+                END;
+            ''')
+            if not exists:
+                # Events confirmed before bookings existed
+                conn.execute(f'''
+                    INSERT INTO bookings (vendor_type, vendor_id, date, slot, event_id)
+                    SELECT event_vendors.vendor_type, event_vendors.vendor_id, date(events.date),
+                           {slot.format(event='events')}, events.id
+                    FROM events JOIN event_vendors ON event_vendors.event_id = events.id
+                    WHERE events.status IN ({booked}) AND date(events.date) IS NOT NULL
+                ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def taken_sql(vendor_type: str, day: str, slot: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+        """
+        Query for the ids of vendors taken on the day, with its parameters
+
+        With a slot, a vendor booked for another slot that day is free;
+        without one, any booking that day takes it.
+        """
+        sql = 'SELECT vendor_id FROM bookings WHERE date = :booking_day AND vendor_type = :booking_vendor_type'
+        params = {'booking_day': day, 'booking_vendor_type': vendor_type}
+        if slot in SLOTS:
+            sql += f" AND slot IN (:booking_slot, '{WHOLE_DAY}')"
+            params['booking_slot'] = slot
+        return sql, params
+
+    def free_sql(self, table: str, vendor_type: str, day: str,
+                 slot: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+        """SQL condition on {table}.id keeping vendors free on the day, with its parameters"""
+        sql, params = self.taken_sql(vendor_type, day, slot)
+        return f'{table}.id NOT IN ({sql})', params
+
+    def taken_ids(self, vendor_type: str, day: str, slot: Optional[str] = None) -> List[int]:
+        """Ids of vendors taken on the day, read from the date index alone"""
+        sql, params = self.taken_sql(vendor_type, day, slot)
+        conn = self.connect()
+        try:
+            return [row[0] for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def booked(self, vendor_type: str, vendor_ids: Iterable[int], start: str,
+               end: str) -> Dict[int, Dict[str, List[str]]]:
+        """
+        Booked slots per vendor and day between start and end (inclusive)
+
+        Returns:
+            {vendor id: {'2026-06-10': ['evening'], ...}}, only for vendors with bookings
+        """
+        vendor_ids = list(vendor_ids)
+        calendar: Dict[int, Dict[str, List[str]]] = {}
+        conn = self.connect()
+        try:
+            for first in range(0, len(vendor_ids), LOOKUP_CHUNK):
+                chunk = vendor_ids[first:first + LOOKUP_CHUNK]
+                rows = conn.execute(
+                    'SELECT DISTINCT vendor_id, date, slot FROM bookings '
+                    f'WHERE vendor_type = ? AND vendor_id IN ({",".join("?" * len(chunk))}) AND date BETWEEN ? AND ? '
+                    'ORDER BY vendor_id, date, slot',
+                    [vendor_type, *chunk, start, end]
+                )
+                for vendor_id, day, slot in rows:
+                    calendar.setdefault(vendor_id, {}).setdefault(day, []).append(slot)
+        finally:
+            conn.close()
+        return calendar
+
+    def block(self, vendor_type: str, vendor_id: int, start: str, end: str, slot: str = WHOLE_DAY) -> int:
+        """Mark days as unavailable without an event; returns the number of new blocks"""
+        conn = self.connect()
+        try:
+            added = conn.executemany(
+                'INSERT OR IGNORE INTO bookings (vendor_type, vendor_id, date, slot) VALUES (?, ?, ?, ?)',
+                [(vendor_type, vendor_id, day, slot) for day in day_range(start, end)]
+            ).rowcount
+            conn.commit()
+            return added
+        finally:
+            conn.close()
+
+    def unblock(self, vendor_type: str, vendor_id: int, start: str, end: str, slot: Optional[str] = None) -> int:
+        """Lift blocks (all slots unless one is given); bookings from events stay"""
+        sql = ('DELETE FROM bookings WHERE vendor_type = ? AND vendor_id = ? AND date BETWEEN ? AND ? '
+               'AND event_id IS NULL')
+        params = [vendor_type, vendor_id, start, end]
+        if slot:
+            sql += ' AND slot = ?'
+            params.append(slot)
+        conn = self.connect()
+        try:
+            removed = conn.execute(sql, params).rowcount
+            conn.commit()
+            return removed
+        finally:
+            conn.close()
+
+
+# Global instance (initialized in app.py)
+availability: Optional[AvailabilityCalendar] = None
+
+
+def init_availability(connect: Callable) -> AvailabilityCalendar:
+    """
+    Initialize global availability calendar
+
+    Args:
+        connect: Returns a new sqlite3 connection to the app database
+    """
+    global availability
+    availability = AvailabilityCalendar(connect)
+    return availability
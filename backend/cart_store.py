@@ -0,0 +1,184 @@
+"""
+Cart Store for EasyVents
+Keeps shopping carts on the server, keyed by a session cart id
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+
+class CartStore(ABC):
+    """Base interface for cart storage backends"""
+
+    @abstractmethod
+    def add(self, cart_id: str, item: Dict) -> bool:
+        """
+        Add an item to a cart
+
+        Args:
+            cart_id: Cart identifier stored in the user's session
+            item: Canonical item dict with 'type', 'id', 'name' and 'price'
+
+        Returns:
+            True if added, False if the (type, id) pair was already in the cart
+        """
+
+    @abstractmethod
+    def items(self, cart_id: str) -> List[Dict]:
+        """Get cart items in the order they were added"""
+
+    @abstractmethod
+    def count(self, cart_id: str) -> int:
+        """Get number of items in a cart"""
+
+    @abstractmethod
+    def clear(self, cart_id: str) -> None:
+        """Remove all items from a cart"""
+
+    @abstractmethod
+    def sweep(self, older_than: float) -> int:
+        """
+        Drop abandoned carts: those nothing was added to for `older_than` seconds
+
+        Returns:
+            Number of items removed
+        """
+
+
+class MemoryCartStore(CartStore):
+    """Process-local cart store (single worker / development only)"""
+
+    def __init__(self):
+        self._carts: Dict[str, OrderedDict] = {}
+        self._added: Dict[str, float] = {}  # cart id -> time of the last add
+        self._lock = threading.Lock()
+
+    def add(self, cart_id: str, item: Dict) -> bool:
+        key = (item['type'], item['id'])
+        with self._lock:
+            cart = self._carts.setdefault(cart_id, OrderedDict())
+            if key in cart:
+                return False
+            cart[key] = dict(item)
+            self._added[cart_id] = time.time()
+            return True
+
+    def items(self, cart_id: str) -> List[Dict]:
+        with self._lock:
+            return [dict(item) for item in self._carts.get(cart_id, {}).values()]
+
+    def count(self, cart_id: str) -> int:
+        with self._lock:
+            return len(self._carts.get(cart_id, {}))
+
+    def clear(self, cart_id: str) -> None:
+        with self._lock:
+            self._carts.pop(cart_id, None)
+            self._added.pop(cart_id, None)
+
+    def sweep(self, older_than: float) -> int:
+        cutoff = time.time() - older_than
+        with self._lock:
+            stale = [cart_id for cart_id, added in self._added.items() if added < cutoff]
+            removed = 0
+            for cart_id in stale:
+                removed += len(self._carts.pop(cart_id, {}))
+                del self._added[cart_id]
+            return removed
+
+
+class SQLiteCartStore(CartStore):
+    """
+    Cart store backed by a SQLite table
+
+    The (cart_id, item_type, item_id) primary key enforces uniqueness,
+    so adding an item is a single indexed INSERT OR IGNORE.
+    """
+
+    def __init__(self, connect: Callable):
+        """
+        Args:
+            connect: Factory returning a sqlite3 connection with Row factory
+        """
+        self._connect = connect
+        self._create_table()
+
+    def _create_table(self) -> None:
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cart_items (
+                cart_id TEXT NOT NULL,
+                item_type TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                name TEXT,
+                price INTEGER,
+                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (cart_id, item_type, item_id)
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def add(self, cart_id: str, item: Dict) -> bool:
+        conn = self._connect()
+        cursor = conn.execute(
+            'INSERT OR IGNORE INTO cart_items (cart_id, item_type, item_id, name, price) VALUES (?, ?, ?, ?, ?)',
+            (cart_id, item['type'], item['id'], item.get('name'), item.get('price'))
+        )
+        conn.commit()
+        conn.close()
+        return cursor.rowcount == 1
+
+    def items(self, cart_id: str) -> List[Dict]:
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT item_type, item_id, name, price FROM cart_items WHERE cart_id = ? ORDER BY rowid',
+            (cart_id,)
+        ).fetchall()
+        conn.close()
+        return [
+            {'type': row['item_type'], 'id': row['item_id'], 'name': row['name'], 'price': row['price']}
+            for row in rows
+        ]
+
+    def count(self, cart_id: str) -> int:
+        conn = self._connect()
+        count = conn.execute('SELECT COUNT(*) FROM cart_items WHERE cart_id = ?', (cart_id,)).fetchone()[0]
+        conn.close()
+        return count
+
+    def clear(self, cart_id: str) -> None:
+        conn = self._connect()
+        conn.execute('DELETE FROM cart_items WHERE cart_id = ?', (cart_id,))
+        conn.commit()
+        conn.close()
+
+    def sweep(self, older_than: float) -> int:
+        conn = self._connect()
+        removed = conn.execute('''
+            DELETE FROM cart_items WHERE cart_id IN (
+                SELECT cart_id FROM cart_items GROUP BY cart_id HAVING MAX(added_at) < datetime('now', ?)
+            )
+        ''', (f'-{int(older_than)} seconds',)).rowcount
+        conn.commit()
+        conn.close()
+        return removed
+
+
+# Global instance (initialized in app.py)
+cart_store: Optional[CartStore] = None
+
+
+def init_cart_store(connect: Optional[Callable] = None) -> CartStore:
+    """
+    Initialize global cart store
+
+    Args:
+        connect: sqlite3 connection factory. If None, carts are kept in memory
+    """
+    global cart_store
+    cart_store = SQLiteCartStore(connect) if connect is not None else MemoryCartStore()
+    return cart_store
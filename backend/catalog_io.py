@@ -0,0 +1,428 @@
+"""
+Catalog Import/Export for EasyVents
+Streams venues and suppliers in and out as CSV or JSON Lines
+"""
+
+import codecs
+import csv
+import io
+import json
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+FORMATS = ('csv', 'jsonl')
+
+Field = namedtuple('Field', 'name kind required max_length', defaults=(False, None))
+
+# Column types and limits follow the Venue / Supplier models in app.py.
+# 'key' is the natural key used to match rows that come without an id.
+CATALOG_TABLES = {
+    'venues': {
+        'key': ('name', 'city'),
+        'fields': [
+            Field('id', 'int'),
+            Field('name', 'str', True, 120),
+            Field('city', 'str', True, 60),
+            Field('address', 'str', False, 200),
+            Field('style', 'str', False, 50),
+            Field('is_open_air', 'bool'),
+            Field('price', 'int'),
+            Field('phone', 'str', False, 20),
+            Field('capacity', 'int'),
+            Field('image_url', 'str', False, 500),
+            Field('lat', 'float'),
+            Field('lon', 'float'),
+        ],
+    },
+    'suppliers': {
+        'key': ('name', 'supplier_type', 'city'),
+        'fields': [
+            Field('id', 'int'),
+            Field('name', 'str', True, 120),
+            Field('supplier_type', 'str', True, 50),
+            Field('phone', 'str', False, 20),
+            Field('city', 'str', False, 60),
+            Field('price', 'int'),
+            Field('image_url', 'str', False, 500),
+            Field('lat', 'float'),
+            Field('lon', 'float'),
+        ],
+    },
+}
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'כן'}
+FALSE_VALUES = {'0', 'false', 'no', 'n', 'לא'}
+
+# Rows without coordinates take their town's centre (see geo_index.py)
+COORDINATE_LIMITS = {'lat': 90, 'lon': 180}
+
+MAX_REPORTED_ERRORS = 100
+LOOKUP_CHUNK = 500  # Stay well below SQLite's bound-parameter limit
+
+
+def format_from_filename(filename: Optional[str], default: Optional[str] = None) -> Optional[str]:
+    """'feed.csv' -> 'csv', 'feed.jsonl' / 'feed.ndjson' -> 'jsonl'"""
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return default
+
+
+def read_rows(stream, fmt: str) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    Parse a binary stream lazily
+
+    Yields:
+        (line number, row dict, None) or (line number, None, parse error)
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(text)
+            for row in reader:
+                # Short rows fill missing cells with None: treat those as absent
+                yield reader.line_num, {k: v for k, v in row.items() if k is not None and v is not None}, None
+            return
+
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f'JSON לא תקין: {e}'
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, 'כל שורה חייבת להיות אובייקט JSON'
+                continue
+            yield line_number, row, None
+    finally:
+        text.detach()  # The caller owns the underlying stream
+
+
+def _to_int(field: Field, raw) -> int:
+    if isinstance(raw, float) and raw.is_integer():
+        raw = int(raw)
+    try:
+        value = None if isinstance(raw, bool) else int(str(raw).replace(',', ''))
+    except ValueError:
+        value = None
+    if value is None or value < 0:
+        raise ValueError(f'{field.name}: מספר לא תקין ({raw!r})')
+    return value
+
+
+def _to_float(field: Field, raw) -> float:
+    try:
+        value = None if isinstance(raw, bool) else float(raw)
+    except ValueError:
+        value = None
+    limit = COORDINATE_LIMITS.get(field.name)
+    if value is None or value != value or (limit and abs(value) > limit):
+        raise ValueError(f'{field.name}: קואורדינטה לא תקינה ({raw!r})')
+    return value
+
+
+def _to_bool(field: Field, raw) -> bool:
+    if isinstance(raw, bool):
+        return raw
+    token = str(raw).strip().lower()
+    if token in TRUE_VALUES:
+        return True
+    if token in FALSE_VALUES:
+        return False
+    raise ValueError(f'{field.name}: ערך בוליאני לא תקין ({raw!r})')
+
+
+def _to_str(field: Field, raw) -> str:
+    value = str(raw)
+    if field.max_length and len(value) > field.max_length:
+        raise ValueError(f'{field.name}: ארוך מ-{field.max_length} תווים')
+    return value
+
+
+# Field kind -> converter(field, raw value), raising ValueError for bad values
+CONVERTERS = {'int': _to_int, 'float': _to_float, 'bool': _to_bool, 'str': _to_str}
+
+
+def validate_row(table: str, row: Dict) -> Dict:
+    """
+    Convert one raw row to column values
+
+    Only columns present in the row are returned, so a feed with fewer columns
+    updates just those. Empty values become NULL.
+
+    Raises:
+        ValueError: with a message naming the offending column
+    """
+    values = {}
+    for field in CATALOG_TABLES[table]['fields']:
+        if field.name not in row:
+            continue
+        raw = row[field.name]
+        if isinstance(raw, str):
+            raw = raw.strip()
+        values[field.name] = None if raw is None or raw == '' else CONVERTERS[field.kind](field, raw)
+
+    if values.get('id') is None:
+        values.pop('id', None)
+        missing = [field.name for field in CATALOG_TABLES[table]['fields']
+                   if field.required and values.get(field.name) is None]
+        if missing:
+            raise ValueError(f"חסרים שדות חובה: {', '.join(missing)}")
+    return values
+
+
+class ImportResult:
+    """Counts and the first errors of one import"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors: List[Dict] = []
+
+    def error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def to_dict(self) -> Dict:
+        return {
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+class CatalogTransfer:
+    """
+    Bulk import/export of the venues and suppliers tables
+
+    Imports validate each row and upsert in batches, one transaction per
+    batch, so memory stays flat however large the feed is. Rows with an id
+    update that row; rows without one are matched on the table's natural
+    key (e.g. venue name + city). Exports are generators reading the table
+    with fetchmany, suitable for streaming responses.
+    """
+
+    def __init__(self, connect: Callable, batch_size: int = 2000):
+        """
+        Args:
+            connect: Factory returning a sqlite3 connection
+            batch_size: Rows per import transaction / export chunk
+        """
+        self.connect = connect
+        self.batch_size = batch_size
+
+    def ensure_indexes(self) -> None:
+        """Index the natural keys so matching a batch is a handful of lookups"""
+        conn = self.connect()
+        try:
+            for table, spec in CATALOG_TABLES.items():
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(spec['key'])} "
+                    f"ON {table}({', '.join(spec['key'])})"
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ---- import ----
+
+    def import_stream(self, table: str, stream, fmt: str, dry_run: bool = False) -> ImportResult:
+        """
+        Import a CSV / JSONL byte stream into a catalog table
+
+        Args:
+            table: 'venues' or 'suppliers'
+            stream: Binary file-like object, read incrementally
+            fmt: 'csv' or 'jsonl'
+            dry_run: Validate and match rows without writing anything
+        """
+        result = ImportResult()
+        conn = self.connect()
+        try:
+            batch = []
+            for line, row, parse_error in read_rows(stream, fmt):
+                if parse_error:
+                    result.error(line, parse_error)
+                    continue
+                try:
+                    batch.append((line, validate_row(table, row)))
+                except ValueError as e:
+                    result.error(line, str(e))
+                    continue
+                if len(batch) >= self.batch_size:
+                    self._upsert_batch(conn, table, batch, result, dry_run)
+                    batch = []
+            if batch:
+                self._upsert_batch(conn, table, batch, result, dry_run)
+        except (UnicodeDecodeError, csv.Error) as e:
+            result.error(0, f'הקובץ לא נקרא: {e}')
+        finally:
+            conn.close()
+        return result
+
+    def _upsert_batch(self, conn, table: str, batch: List[Tuple[int, Dict]], result: ImportResult,
+                      dry_run: bool) -> None:
+        updates, inserts = self._resolve(conn, table, batch, result)
+        if not dry_run:
+            self._write(conn, table, inserts, updates)
+        result.inserted += len(inserts)
+        result.updated += len(updates)
+
+    def _resolve(self, conn, table: str, batch: List[Tuple[int, Dict]],
+                 result: ImportResult) -> Tuple[List[Dict], List[Dict]]:
+        """Split a batch into updates of existing rows and inserts, reporting ids that can't be inserted"""
+        key = CATALOG_TABLES[table]['key']
+        required = [field.name for field in CATALOG_TABLES[table]['fields'] if field.required]
+        by_id, by_key = group_batch(batch, key)
+        existing_ids = self._existing_ids(conn, table, list(by_id))
+        key_ids = self._match_keys(conn, table, key, list(by_key))
+
+        updates, inserts = [], []
+        for row_id, rows in by_id.items():
+            values = merge_rows(rows)
+            if row_id in existing_ids:
+                updates.append(values)
+            elif all(values.get(column) is not None for column in required):
+                inserts.append(values)
+            else:
+                result.error(rows[-1][0], f'id {row_id} לא קיים וחסרים שדות חובה')
+        for natural_key, rows in by_key.items():
+            values = merge_rows(rows)
+            if natural_key in key_ids:
+                values['id'] = key_ids[natural_key]
+                updates.append(values)
+            else:
+                inserts.append(values)
+        return updates, inserts
+
+    @staticmethod
+    def _write(conn, table: str, inserts: List[Dict], updates: List[Dict]) -> None:
+        """Apply one batch in a single transaction"""
+        with conn:
+            for columns, rows in group_by_columns(inserts):
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    rows
+                )
+            for columns, rows in group_by_columns(updates, exclude='id'):
+                if columns:
+                    conn.executemany(
+                        f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+                        [row + (values_id,) for row, values_id in rows]
+                    )
+
+    def _existing_ids(self, conn, table: str, ids: List[int]) -> set:
+        found = set()
+        for start in range(0, len(ids), LOOKUP_CHUNK):
+            chunk = ids[start:start + LOOKUP_CHUNK]
+            found.update(row[0] for row in conn.execute(
+                f"SELECT id FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+        return found
+
+    def _match_keys(self, conn, table: str, key: Tuple[str, ...], natural_keys: List[Tuple]) -> Dict[Tuple, int]:
+        """Natural key -> lowest matching id, looked up by the leading key column"""
+        wanted = set(natural_keys)
+        names = sorted({natural_key[0] for natural_key in natural_keys})
+        matches = {}
+        for start in range(0, len(names), LOOKUP_CHUNK):
+            chunk = names[start:start + LOOKUP_CHUNK]
+            rows = conn.execute(
+                f"SELECT id, {', '.join(key)} FROM {table} WHERE {key[0]} IN ({', '.join('?' * len(chunk))}) "
+                f"ORDER BY id",
+                chunk
+            )
+            for row in rows:
+                natural_key = tuple(row[1:])
+                if natural_key in wanted:
+                    matches.setdefault(natural_key, row[0])
+        return matches
+
+    # ---- export ----
+
+    def export(self, table: str, fmt: str) -> Iterator[bytes]:
+        """
+        Stream a catalog table as UTF-8 encoded CSV (with BOM, so Excel
+        shows Hebrew correctly) or JSON Lines, batch_size rows per chunk
+        """
+        columns = [field.name for field in CATALOG_TABLES[table]['fields']]
+        bools = {field.name for field in CATALOG_TABLES[table]['fields'] if field.kind == 'bool'}
+        conn = self.connect()
+        try:
+            cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id")
+            buffer = io.StringIO()
+            if fmt == 'csv':
+                writer = csv.writer(buffer)
+                writer.writerow(columns)
+                yield codecs.BOM_UTF8 + buffer.getvalue().encode('utf-8')
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                buffer.seek(0)
+                buffer.truncate()
+                if fmt == 'csv':
+                    writer.writerows(rows)
+                else:
+                    for row in rows:
+                        record = dict(zip(columns, row))
+                        for column in bools:
+                            if record[column] is not None:
+                                record[column] = bool(record[column])
+                        buffer.write(json.dumps(record, ensure_ascii=False) + '\n')
+                yield buffer.getvalue().encode('utf-8')
+        finally:
+            conn.close()
+
+
+def group_batch(batch: List[Tuple[int, Dict]], key: Tuple[str, ...]) -> Tuple[Dict, Dict]:
+    """Rows of a batch by id, and those without one by natural key (in feed order, so later rows win)"""
+    by_id, by_key = {}, {}
+    for line, values in batch:
+        if 'id' in values:
+            by_id.setdefault(values['id'], []).append((line, values))
+        else:
+            # An optional key column left out of the feed matches rows where it is NULL
+            by_key.setdefault(tuple(values.get(column) for column in key), []).append((line, values))
+    return by_id, by_key
+
+
+def merge_rows(rows: List[Tuple[int, Dict]]) -> Dict:
+    merged = {}
+    for _, values in rows:
+        merged.update(values)
+    return merged
+
+
+def group_by_columns(rows: Iterable[Dict], exclude: Optional[str] = None):
+    """Group row dicts by their column set, so each group is one executemany"""
+    groups = {}
+    for values in rows:
+        columns = tuple(column for column in values if column != exclude)
+        params = tuple(values[column] for column in columns)
+        groups.setdefault(columns, []).append((params, values.get(exclude)) if exclude else params)
+    return groups.items()
+
+
+# Global instance (initialized in app.py)
+catalog_transfer = None
+
+
+def init_catalog_transfer(connect: Callable, batch_size: int = 2000) -> CatalogTransfer:
+    """
+    Initialize global catalog import/export helper
+
+    Args:
+        connect: sqlite3 connection factory
+        batch_size: Rows per import transaction / export chunk
+    """
+    global catalog_transfer
+    catalog_transfer = CatalogTransfer(connect, batch_size)
+    catalog_transfer.ensure_indexes()
+    return catalog_transfer
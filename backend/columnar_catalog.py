@@ -0,0 +1,275 @@
+"""
+Columnar Catalog for EasyVents
+Venues and suppliers held as NumPy column arrays, so result filters run as vectorized masks
+"""
+
+import math
+import threading
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: without NumPy the results page filters in SQL
+    np = None
+
+from geo_index import EARTH_RADIUS_KM, bounding_box
+
+# Columns kept per table, in the order rows come back from select()
+COLUMNS = {
+    'venues': ('id', 'name', 'city', 'address', 'style', 'is_open_air', 'price', 'phone', 'capacity',
+               'image_url', 'lat', 'lon'),
+    'suppliers': ('id', 'name', 'supplier_type', 'phone', 'city', 'price', 'image_url', 'lat', 'lon'),
+}
+# Stored as float64 with NaN for NULL, so comparisons drop NULLs as SQL does;
+# rows give them back with the model's type
+NUMERIC = {'is_open_air': bool, 'price': int, 'capacity': int, 'lat': float, 'lon': float}
+
+# 'like' answers per column and keywords, kept for the lifetime of one catalog version
+LIKE_CACHE_SIZE = 256
+
+# Up to this many matching distinct values, comparing codes beats a table lookup
+FEW_CODES = 8
+
+# (operation, column, value), e.g. ('in', 'city', ['חיפה']), ('>=', 'capacity', 300),
+# ('like', 'name', ['אולם']) (any keyword, case-insensitive), ('within', None, (lat, lon, km)),
+# ('in', 'id', [ids]), ('not_in', 'id', [ids])
+Filter = Tuple[str, Optional[str], object]
+
+
+class ColumnTable:
+    """
+    One catalog table as column arrays, in id order
+
+    Text columns are dictionary-encoded: a code per row (as narrow an integer
+    type as the number of distinct values allows) and the list of them.
+    Predicates on them are answered once per distinct value and mapped back
+    with a single array lookup, so 'city in region' costs the same however
+    many rows share a city.
+    """
+
+    def __init__(self, table: str, rows: Iterable[Sequence]):
+        """
+        Args:
+            table: 'venues' or 'suppliers'
+            rows: Tuples in COLUMNS[table] order, sorted by id
+        """
+        self.table = table
+        self.columns = COLUMNS[table]
+        self.Row = namedtuple(f'{table.title()}Row', self.columns)
+        values = list(zip(*rows)) or [()] * len(self.columns)
+        self.ids = np.array(values[0], dtype=np.int64)
+        self.numeric: Dict[str, 'np.ndarray'] = {}
+        self.codes: Dict[str, 'np.ndarray'] = {}
+        self.dictionary: Dict[str, List] = {}
+        for column, column_values in zip(self.columns[1:], values[1:]):
+            if column in NUMERIC:
+                self.numeric[column] = np.array([np.nan if v is None else v for v in column_values], dtype=np.float64)
+            else:
+                lookup = {}
+                codes = [lookup.setdefault(v, len(lookup)) for v in column_values]
+                self.codes[column] = np.array(codes, dtype=np.min_scalar_type(max(len(lookup) - 1, 0)))
+                self.dictionary[column] = list(lookup)
+        # Haversine terms that only depend on the row
+        self._lat_radians = np.radians(self.numeric['lat'])
+        self._lon_radians = np.radians(self.numeric['lon'])
+        self._cos_lat = np.cos(self._lat_radians)
+        # Rows by latitude (no coordinates last), so a latitude band is two binary searches
+        self._by_lat = np.argsort(self.numeric['lat'], kind='stable')
+        self._sorted_lats = self.numeric['lat'][self._by_lat]
+        self._like: Dict[Tuple[str, Tuple[str, ...]], 'np.ndarray'] = {}
+        self._orders: Dict[str, 'np.ndarray'] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mask(self, filters: Iterable[Filter]) -> 'np.ndarray':
+        """Rows passing every filter"""
+        mask = np.ones(len(self), dtype=bool)
+        for operation, column, value in filters:
+            if operation == 'in' and column == 'id':
+                keep = np.zeros(len(self), dtype=bool)
+                keep[self._positions(value)] = True
+                mask &= keep
+            elif operation == 'in':
+                mask &= self._in(column, value)
+            elif operation == 'like':
+                mask &= self._like_any(column, value)
+            elif operation == 'within':
+                mask &= self._within(*value)
+            elif operation == 'not_in':
+                mask[self._positions(value)] = False
+            elif operation in ('>=', '<=', '=='):
+                column_values = self.numeric[column]
+                mask &= (column_values >= value if operation == '>=' else
+                         column_values <= value if operation == '<=' else column_values == value)
+            else:
+                raise ValueError(f'Unknown filter: {operation}')
+        return mask
+
+    def _positions(self, ids: Iterable[int]) -> 'np.ndarray':
+        # ids are sorted, so each lookup is a binary search
+        ids = np.sort(np.fromiter(ids, dtype=np.int64))  # Sorted probes search much faster
+        positions = np.searchsorted(self.ids, ids)
+        found = positions < len(self)
+        found[found] = self.ids[positions[found]] == ids[found]
+        return positions[found]
+
+    def _in(self, column: str, wanted: Iterable) -> 'np.ndarray':
+        wanted = set(wanted)
+        hits = np.fromiter((value in wanted for value in self.dictionary[column]), dtype=bool,
+                           count=len(self.dictionary[column]))
+        return self._rows_with(column, hits)
+
+    def _like_any(self, column: str, keywords: Iterable[str]) -> 'np.ndarray':
+        key = (column, tuple(keyword.lower() for keyword in keywords))
+        hits = self._like.get(key)
+        if hits is None:
+            hits = np.fromiter(
+                (value is not None and any(keyword in value.lower() for keyword in key[1])
+                 for value in self.dictionary[column]),
+                dtype=bool, count=len(self.dictionary[column]))
+            with self._lock:
+                if len(self._like) >= LIKE_CACHE_SIZE:
+                    self._like.clear()
+                self._like[key] = hits
+        return self._rows_with(column, hits)
+
+    def _rows_with(self, column: str, hits: 'np.ndarray') -> 'np.ndarray':
+        # hits has one flag per distinct value of the column
+        codes = self.codes[column]
+        matched = np.flatnonzero(hits).astype(codes.dtype)  # Same type, so comparisons don't widen codes
+        if len(matched) > FEW_CODES:
+            return np.take(hits, codes)
+        mask = np.zeros(len(codes), dtype=bool)
+        for code in matched:
+            mask |= codes == code
+        return mask
+
+    def _within(self, lat: float, lon: float, radius_km: float) -> 'np.ndarray':
+        # Rows inside the bounding box first; the trigonometry only runs for
+        # those. Rows without coordinates are NaN and fall outside any box.
+        box = bounding_box(lat, lon, radius_km)
+        first = np.searchsorted(self._sorted_lats, box['south'], side='left')
+        last = np.searchsorted(self._sorted_lats, box['north'], side='right')
+        candidates = self._by_lat[first:last]
+        lons = self.numeric['lon'][candidates]
+        candidates = candidates[(lons >= box['west']) & (lons <= box['east'])]
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        a = (np.sin((self._lat_radians[candidates] - lat1) / 2) ** 2
+             + math.cos(lat1) * self._cos_lat[candidates] * np.sin((self._lon_radians[candidates] - lon1) / 2) ** 2)
+        # Haversine distance <= radius, compared before its (monotonic) arcsin
+        limit = math.sin(min(radius_km / (2 * EARTH_RADIUS_KM), math.pi / 2)) ** 2
+        mask = np.zeros(len(self), dtype=bool)
+        mask[candidates] = a <= limit
+        return mask
+
+    def indices(self, mask: 'np.ndarray', order_by: Optional[str] = None) -> 'np.ndarray':
+        """Positions of the rows in the mask, by id or by a numeric column (NULLs last)"""
+        if order_by is None:
+            return np.flatnonzero(mask)
+        order = self._orders.get(order_by)
+        if order is None:
+            order = self._orders[order_by] = np.argsort(self.numeric[order_by], kind='stable')
+        return order[mask[order]]
+
+    def rows(self, positions: 'np.ndarray') -> List[Tuple]:
+        """Rows at the positions, as named tuples with the table's columns"""
+        columns = [self.ids[positions].tolist()]
+        for column in self.columns[1:]:
+            if column in NUMERIC:
+                convert = NUMERIC[column]
+                columns.append([None if v != v else convert(v) for v in self.numeric[column][positions].tolist()])
+            else:
+                dictionary = self.dictionary[column]
+                columns.append([dictionary[code] for code in self.codes[column][positions].tolist()])
+        return [self.Row(*row) for row in zip(*columns)]
+
+    def select(self, filters: Iterable[Filter], order_by: Optional[str] = None) -> List[Tuple]:
+        return self.rows(self.indices(self.mask(filters), order_by))
+
+
+class CatalogColumns:
+    """Both catalog tables as of one catalog version"""
+
+    def __init__(self, tables: Dict[str, ColumnTable], version: int):
+        self.tables = tables
+        self.version = version
+
+    def __getitem__(self, table: str) -> ColumnTable:
+        return self.tables[table]
+
+
+class ColumnarCatalog:
+    """
+    Holds the columns for the current catalog version
+
+    A stale copy is rebuilt by the first request that notices; requests
+    arriving meanwhile keep using the previous copy instead of waiting.
+    """
+
+    def __init__(self, connect: Callable):
+        """
+        Args:
+            connect: Returns a new sqlite3 connection to the app database
+        """
+        self.connect = connect
+        self._columns: Optional[CatalogColumns] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    @property
+    def enabled(self) -> bool:
+        return np is not None
+
+    def columns(self, version: int) -> CatalogColumns:
+        """Columns of the given catalog version, or the previous ones while they are being loaded"""
+        current = self._columns
+        if current is not None and current.version == version:
+            return current
+        if not self._lock.acquire(blocking=current is None):
+            return current
+        try:
+            if self._columns is None or self._columns.version != version:
+                self._columns = self._load(version)
+                self.builds += 1
+            return self._columns
+        finally:
+            self._lock.release()
+
+    def _load(self, version: int) -> CatalogColumns:
+        conn = self.connect()
+        try:
+            conn.execute('BEGIN')  # Both tables from one snapshot
+            tables = {table: ColumnTable(table, conn.execute(f'SELECT {", ".join(columns)} FROM {table} ORDER BY id'))
+                      for table, columns in COLUMNS.items()}
+            conn.rollback()
+        finally:
+            conn.close()
+        return CatalogColumns(tables, version)
+
+    def stats(self) -> Dict:
+        columns = self._columns
+        return {
+            'enabled': self.enabled,
+            'version': columns.version if columns else None,
+            'rows': {table: len(t) for table, t in columns.tables.items()} if columns else {},
+            'builds': self.builds,
+        }
+
+
+# Global instance (initialized in app.py)
+columnar_catalog: Optional[ColumnarCatalog] = None
+
+
+def init_columnar_catalog(connect: Callable) -> ColumnarCatalog:
+    """
+    Initialize global columnar catalog
+
+    Args:
+        connect: Returns a new sqlite3 connection to the app database
+    """
+    global columnar_catalog
+    columnar_catalog = ColumnarCatalog(connect)
+    return columnar_catalog
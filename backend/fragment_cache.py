@@ -0,0 +1,94 @@
+"""
+Fragment Cache for EasyVents
+Keeps rendered HTML fragments (e.g. vendor cards) in a bounded LRU
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+
+class FragmentCache:
+    """
+    Process-local LRU of rendered fragments
+
+    Keys include the catalog version, so a catalog change makes every older
+    entry unreachable; the cache also drops them as soon as it sees a newer
+    version instead of waiting for them to be evicted.
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        """
+        Args:
+            max_entries: Fragments kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: Hashable, version: int, render: Callable[[], str]) -> str:
+        """
+        Cached fragment for (key, version), rendering and storing it on a miss
+
+        Args:
+            key: Identifies the fragment within a version, e.g. (vendor type, id, locale)
+            version: Catalog version the fragment was rendered from
+            render: Produces the fragment HTML
+        """
+        with self._lock:
+            if version != self._version:
+                if self._version is None or version > self._version:
+                    self._entries.clear()
+                    self._version = version
+                else:
+                    # A request that read the version before a concurrent change: don't cache
+                    self.misses += 1
+                    return render()
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        html = render()  # Outside the lock; two threads may render the same card once each
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = html
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return html
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'version': self._version,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+# Global instance (initialized in app.py)
+fragment_cache: Optional[FragmentCache] = None
+
+
+def init_fragment_cache(max_entries: int = 5000) -> FragmentCache:
+    """
+    Initialize global fragment cache
+
+    Args:
+        max_entries: LRU capacity
+    """
+    global fragment_cache
+    fragment_cache = FragmentCache(max_entries)
+    return fragment_cache
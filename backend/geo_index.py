@@ -0,0 +1,255 @@
+"""
+Geo Index for EasyVents
+Coordinates for venues and suppliers from an offline city gazetteer, searched with SQLite R*Tree
+"""
+
+import csv
+import math
+import re
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from vendor_search import normalize
+
+City = namedtuple('City', 'name region lat lon')
+
+# Catalog tables with coordinates, and the vendor type their rows are shown as
+GEO_TABLES = {'venues': 'Venue', 'suppliers': 'Supplier'}
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Nearest-N searches widen from this radius until they find enough vendors
+NEAREST_START_KM = 2
+NEAREST_MAX_KM = 600  # Further than any two points in the country
+
+LAT_LON = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$')
+
+# (distance in km, vendor type, id)
+Hit = Tuple[float, str, int]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Dict[str, float]:
+    """South/north/west/east edges of a box containing the circle"""
+    dlat = radius_km / KM_PER_DEGREE
+    dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    return {'south': lat - dlat, 'north': lat + dlat, 'west': lon - dlon, 'east': lon + dlon}
+
+
+class Gazetteer:
+    """
+    Towns with their centre coordinates and region, read from a CSV file
+
+    Columns: name, region, lat, lon, aliases (other spellings separated by |).
+    Names are looked up in their search form, so 'רעננה', "Ra'anana" and
+    'raanana' find the same town.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Gazetteer CSV file
+        """
+        self.path = path
+        self.cities: Dict[str, City] = {}
+        self.spellings: Dict[str, City] = {}
+        self._lookup: Dict[str, City] = {}
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                city = City(row['name'].strip(), row['region'].strip(), float(row['lat']), float(row['lon']))
+                self.cities[city.name] = city
+                for spelling in [city.name] + [a.strip() for a in (row.get('aliases') or '').split('|') if a.strip()]:
+                    self.spellings[spelling] = city
+                    self._lookup.setdefault(normalize(spelling), city)
+
+    def find(self, name: str) -> Optional[City]:
+        return self.cities.get((name or '').strip()) or self._lookup.get(normalize(name or ''))
+
+    def in_region(self, region: str) -> List[str]:
+        return [city.name for city in self.cities.values() if city.region == region]
+
+
+class GeoIndex:
+    """
+    Radius and nearest-N search over venue and supplier coordinates
+
+    Each table gets lat/lon columns and an R*Tree ({table}_geo) kept in step
+    by triggers, so rows written by the app, bulk imports or manual SQL are
+    all indexed. Rows inserted without coordinates, or moved to another city,
+    take the town centre from the gazetteer table, also through triggers.
+    """
+
+    def __init__(self, connect: Callable, gazetteer: Gazetteer):
+        """
+        Args:
+            connect: Returns a new sqlite3 connection to the app database
+            gazetteer: Towns used to place vendors and resolve ?near=
+        """
+        self.connect = connect
+        self.gazetteer = gazetteer
+
+    def setup(self) -> int:
+        """
+        Create columns, gazetteer table, R*Trees and triggers where missing, and
+        place rows that have no coordinates yet
+
+        Returns:
+            Number of rows given coordinates
+        """
+        conn = self.connect()
+        try:
+            conn.execute('CREATE TABLE IF NOT EXISTS gazetteer '
+                         '(name TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL)')
+            current = {tuple(row) for row in conn.execute('SELECT name, lat, lon FROM gazetteer')}
+            wanted = {(name, city.lat, city.lon) for name, city in self.gazetteer.spellings.items()}
+            if current != wanted:
+                conn.execute('DELETE FROM gazetteer')
+                conn.executemany('INSERT INTO gazetteer (name, lat, lon) VALUES (?, ?, ?)', sorted(wanted))
+
+            placed = 0
+            for table in GEO_TABLES:
+                self._setup_table(conn, table)
+                placed += self._place_missing(conn, table)
+            conn.commit()
+            return placed
+        finally:
+            conn.close()
+
+    def _setup_table(self, conn, table: str) -> None:
+        columns = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        for column in ('lat', 'lon'):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} REAL')
+
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (f'{table}_geo',)).fetchone()
+        conn.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS {table}_geo '
+                     'USING rtree(id, min_lat, max_lat, min_lon, max_lon)')
+        if not exists:
+            conn.execute(f'INSERT INTO {table}_geo SELECT id, lat, lat, lon, lon FROM {table} '
+                         'WHERE lat IS NOT NULL AND lon IS NOT NULL')
+
+        from_gazetteer = ('lat = (SELECT lat FROM gazetteer WHERE name = NEW.city), '
+                          'lon = (SELECT lon FROM gazetteer WHERE name = NEW.city)')
+        conn.executescript(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_geo_insert AFTER INSERT ON {table}
+            WHEN NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL
+            BEGIN
+                INSERT INTO {table}_geo VALUES (NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon);
+            END;
+            CREATE TRIGGER IF NOT EXISTS {table}_geo_update AFTER UPDATE OF id, lat, lon ON {table}
+            BEGIN
+                DELETE FROM {table}_geo WHERE id = OLD.id;
+                INSERT INTO {table}_geo SELECT NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon
+                    WHERE NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL;
+            END;
+            CREATE TRIGGER IF NOT EXISTS {table}_geo_delete AFTER DELETE ON {table}
+            BEGIN
+                DELETE FROM {table}_geo WHERE id = OLD.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS {table}_geocode_insert AFTER INSERT ON {table}
+            WHEN NEW.lat IS NULL AND NEW.city IN (SELECT name FROM gazetteer)
+            BEGIN
+                UPDATE {table} SET {from_gazetteer} WHERE id = NEW.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS {table}_geocode_city AFTER UPDATE OF city ON {table}
+            WHEN NEW.city IS NOT OLD.city AND NEW.lat IS OLD.lat AND NEW.lon IS OLD.lon
+            BEGIN
+                UPDATE {table} SET {from_gazetteer} WHERE id = NEW.id;
+            END;
+        ''')
+
+    def _place_missing(self, conn, table: str) -> int:
+        # Covers rows from before the triggers, and spellings only the search form matches
+        placed = 0
+        cities = [row[0] for row in conn.execute(
+            f'SELECT DISTINCT city FROM {table} WHERE lat IS NULL AND city IS NOT NULL')]
+        for name in cities:
+            city = self.gazetteer.find(name)
+            if city:
+                placed += conn.execute(f'UPDATE {table} SET lat = ?, lon = ? WHERE lat IS NULL AND city = ?',
+                                       (city.lat, city.lon, name)).rowcount
+        return placed
+
+    def locate(self, place: str) -> Optional[Tuple[float, float]]:
+        """Coordinates of 'lat,lon' or of a town in the gazetteer"""
+        match = LAT_LON.match(place or '')
+        if match:
+            lat, lon = float(match.group(1)), float(match.group(2))
+            return (lat, lon) if -90 <= lat <= 90 and -180 <= lon <= 180 else None
+        city = self.gazetteer.find(place)
+        return (city.lat, city.lon) if city else None
+
+    @staticmethod
+    def box_sql(table: str, lat: float, lon: float, radius_km: float) -> Tuple[str, Dict[str, float]]:
+        """SQL condition on {table}.id selecting rows inside the circle's bounding box, with its parameters"""
+        sql = (f'{table}.id IN (SELECT id FROM {table}_geo WHERE min_lat <= :north AND max_lat >= :south '
+               f'AND min_lon <= :east AND max_lon >= :west)')
+        return sql, bounding_box(lat, lon, radius_km)
+
+    def within(self, lat: float, lon: float, radius_km: float, tables: Iterable[str] = GEO_TABLES) -> List[Hit]:
+        """Vendors within radius_km, nearest first"""
+        conn = self.connect()
+        try:
+            return self._within(conn, lat, lon, radius_km, tables)
+        finally:
+            conn.close()
+
+    def nearest(self, lat: float, lon: float, count: int, tables: Iterable[str] = GEO_TABLES,
+                max_radius_km: Optional[float] = None) -> List[Hit]:
+        """The count nearest vendors (no further than max_radius_km), nearest first"""
+        tables = list(tables)
+        max_radius_km = max_radius_km or NEAREST_MAX_KM
+        conn = self.connect()
+        try:
+            radius = min(NEAREST_START_KM, max_radius_km)
+            while True:
+                hits = self._within(conn, lat, lon, radius, tables)
+                if len(hits) >= count or radius >= max_radius_km:
+                    return hits[:count]
+                radius = min(radius * 4, max_radius_km)
+        finally:
+            conn.close()
+
+    def _within(self, conn, lat: float, lon: float, radius_km: float, tables: Iterable[str]) -> List[Hit]:
+        # The R*Tree stores 32-bit floats (rounded outwards, so the box never
+        # misses a row); distances from them are off by well under a metre
+        box = bounding_box(lat, lon, radius_km)
+        distances: Dict[Tuple[float, float], float] = {}  # Vendors share town centres
+        hits = []
+        for table in tables:
+            rows = conn.execute(
+                f'SELECT id, min_lat, min_lon FROM {table}_geo '
+                'WHERE min_lat <= :north AND max_lat >= :south AND min_lon <= :east AND max_lon >= :west', box)
+            vendor_type = GEO_TABLES[table]
+            for row_id, row_lat, row_lon in rows:
+                distance = distances.get((row_lat, row_lon))
+                if distance is None:
+                    distance = distances[(row_lat, row_lon)] = haversine_km(lat, lon, row_lat, row_lon)
+                if distance <= radius_km:
+                    hits.append((distance, vendor_type, row_id))
+        hits.sort()
+        return hits
+
+
+# Global instance (initialized in app.py)
+geo_index: Optional[GeoIndex] = None
+
+
+def init_geo_index(connect: Callable, gazetteer_path: str) -> GeoIndex:
+    """
+    Initialize global geo index
+
+    Args:
+        connect: Returns a new sqlite3 connection to the app database
+        gazetteer_path: Gazetteer CSV file
+    """
+    global geo_index
+    geo_index = GeoIndex(connect, Gazetteer(gazetteer_path))
+    return geo_index
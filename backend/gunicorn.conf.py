@@ -0,0 +1,116 @@
+"""
+Gunicorn configuration for EasyVents
+Picked up automatically when gunicorn is started from backend/
+
+Every setting can be overridden with the environment variable named next to it.
+"""
+
+import glob
+import multiprocessing
+import os
+import sys
+import tempfile
+
+port = os.environ.get('PORT', 5000)
+bind = f"0.0.0.0:{port}"
+
+# Workers write metric snapshots and profiler samples here so /metrics and
+# /admin/profiler can sum all of them
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), f'easyevents-metrics-{port}'))
+os.environ.setdefault('PROFILE_DIR', os.path.join(tempfile.gettempdir(), f'easyevents-profile-{port}'))
+
+# Worker model (WORKER_CLASS):
+#   sync    - one in-flight request per worker process
+#   gthread - each worker serves up to `threads` requests concurrently (default)
+#   asgi    - uvicorn workers serving asgi:asgi_app; idle connections hold no
+#             thread, active requests run on ASGI_THREADS threads per worker.
+#             Requires `pip install uvicorn` (in requirements-dev.txt).
+worker_mode = os.environ.get('WORKER_CLASS', 'gthread')
+
+if worker_mode == 'asgi':
+    wsgi_app = 'asgi:asgi_app'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'app:app'
+    worker_class = worker_mode
+
+# Sizing: sync workers block on every request, so they need the classic
+# 2 * cores + 1; threaded and async workers overlap I/O themselves and
+# run best with about one process per core.
+cpu_count = multiprocessing.cpu_count()
+if worker_mode == 'sync':
+    default_workers = cpu_count * 2 + 1
+else:
+    default_workers = max(2, cpu_count)
+
+workers = int(os.environ.get('WEB_CONCURRENCY', default_workers))
+threads = int(os.environ.get('THREADS', 4))
+
+# Import the app once in the master and fork it, so workers share the
+# loaded catalog, image index and compiled templates copy-on-write.
+# app.py starts no threads at import time; see the fork hooks below.
+preload_app = os.environ.get('PRELOAD_APP', '1') == '1'
+
+# Recycle workers periodically to cap slow memory growth; the jitter keeps
+# them from all restarting at the same moment
+max_requests = int(os.environ.get('MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('MAX_REQUESTS_JITTER', 200))
+
+timeout = int(os.environ.get('WORKER_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('KEEPALIVE', 5))
+
+
+def _easyevents_app():
+    """The app module, if it has been imported in this process"""
+    return sys.modules.get('app')
+
+
+def on_starting(server):
+    # Snapshots left by a previous run would be counted again, and the
+    # profiler always starts switched off
+    for directory in (os.environ['METRICS_DIR'], os.environ['PROFILE_DIR']):
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            os.remove(path)
+
+
+def when_ready(server):
+    # With preload the app is already imported here: warm it once in the
+    # master so every forked worker inherits the warm caches
+    easyevents = _easyevents_app()
+    if easyevents is not None:
+        easyevents.warm_caches()
+
+
+def post_fork(server, worker):
+    # SQLite/SQLAlchemy connections must never be shared across processes
+    easyevents = _easyevents_app()
+    if easyevents is not None:
+        easyevents.reset_after_fork()
+
+
+def post_worker_init(worker):
+    easyevents = _easyevents_app()
+    if easyevents is None:
+        return  # App not loaded under this name; its job workers start with the first request
+    if not preload_app:
+        easyevents.warm_caches()
+    easyevents.job_queue.start()
+
+
+def worker_exit(server, worker):
+    # Keep a recycled worker's final counts and samples in the aggregate
+    easyevents = _easyevents_app()
+    if easyevents is not None:
+        easyevents.metrics.flush()
+        easyevents.profiler.flush()
+
+
+def child_exit(server, worker):
+    # Runs in the master once the worker is gone: fold its final snapshot
+    # into the exited-workers total so per-pid files don't pile up
+    from metrics import fold_exited_worker
+    try:
+        fold_exited_worker(os.environ['METRICS_DIR'], worker.pid)
+    except (OSError, ValueError) as e:
+        server.log.warning("Could not fold metrics of worker %s: %s", worker.pid, e)
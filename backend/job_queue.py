@@ -0,0 +1,296 @@
+"""
+Job Queue for EasyVents
+Persistent SQLite-backed background jobs for slow side effects (email etc.)
+"""
+
+import json
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class JobQueue:
+    """
+    In-process background job queue persisted in a SQLite table
+
+    Jobs survive restarts. A worker claims a job by marking it 'running'
+    with a visibility timeout (locked_until); if the worker dies, the job
+    becomes claimable again once the timeout passes. Failed jobs are
+    retried with exponential backoff until max_attempts is reached.
+    """
+
+    def __init__(
+        self,
+        connect: Callable,
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        visibility_timeout: float = 60.0,
+        max_attempts: int = 5,
+        backoff: float = 5.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            connect: Factory returning a sqlite3 connection with Row factory
+            workers: Number of worker threads started by start()
+            poll_interval: Seconds an idle worker waits before polling again
+            visibility_timeout: Seconds a claimed job stays invisible to other workers
+            max_attempts: Default attempts before a job is marked 'failed'
+            backoff: Delay before the first retry, doubled on every further attempt
+            clock: Time source (overridable in tests)
+        """
+        self._connect = connect
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._clock = clock
+        self._handlers: Dict[str, Callable] = {}
+        self._recurring: Dict[str, float] = {}
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+        self._create_table()
+
+    def _create_table(self) -> None:
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                run_at REAL NOT NULL,
+                locked_until REAL,
+                last_error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_run_at ON jobs(status, run_at)')
+        conn.commit()
+        conn.close()
+
+    def handler(self, kind: str) -> Callable:
+        """Decorator registering a function as the handler for a job kind"""
+        def decorator(fn):
+            self._handlers[kind] = fn
+            return fn
+        return decorator
+
+    def enqueue(self, kind: str, payload: Dict, delay: float = 0, max_attempts: Optional[int] = None) -> int:
+        """
+        Add a job to the queue
+
+        Args:
+            kind: Registered handler name
+            payload: JSON-serialisable handler argument
+            delay: Seconds to wait before the job may run
+            max_attempts: Override the queue default
+
+        Returns:
+            Job id
+        """
+        return self.enqueue_many(kind, [payload], delay, max_attempts)[0]
+
+    def enqueue_many(
+        self,
+        kind: str,
+        payloads: Iterable[Dict],
+        delay: float = 0,
+        max_attempts: Optional[int] = None
+    ) -> List[int]:
+        """Add several jobs of the same kind in one transaction"""
+        run_at = self._clock() + delay
+        attempts = max_attempts or self.max_attempts
+        conn = self._connect()
+        ids = []
+        for payload in payloads:
+            cursor = conn.execute(
+                'INSERT INTO jobs (kind, payload, max_attempts, run_at) VALUES (?, ?, ?, ?)',
+                (kind, json.dumps(payload, ensure_ascii=False), attempts, run_at)
+            )
+            ids.append(cursor.lastrowid)
+        conn.commit()
+        conn.close()
+        self._wakeup.set()
+        return ids
+
+    def schedule(self, kind: str, interval: float) -> None:
+        """
+        Run a job kind every `interval` seconds
+
+        At most one instance is pending across all processes; the next run
+        is queued when the current one finishes (successfully or not).
+        """
+        self._recurring[kind] = interval
+        self._enqueue_if_idle(kind, delay=0)
+
+    def _enqueue_if_idle(self, kind: str, delay: float) -> None:
+        """Queue a job of this kind unless one is already queued or running"""
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            pending = conn.execute(
+                "SELECT 1 FROM jobs WHERE kind = ? AND status IN ('queued', 'running') LIMIT 1", (kind,)
+            ).fetchone()
+            if not pending:
+                conn.execute('INSERT INTO jobs (kind, payload, max_attempts, run_at) VALUES (?, ?, ?, ?)',
+                             (kind, '{}', 1, self._clock() + delay))
+            conn.execute('COMMIT')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def _claim(self) -> Optional[Dict]:
+        """Atomically take the next due job, or None"""
+        now = self._clock()
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('''
+                SELECT * FROM jobs
+                WHERE (status = 'queued' AND run_at <= ?)
+                   OR (status = 'running' AND locked_until <= ?)
+                ORDER BY run_at
+                LIMIT 1
+            ''', (now, now)).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, locked_until = ? WHERE id = ?",
+                (now + self.visibility_timeout, row['id'])
+            )
+            conn.execute('COMMIT')
+            job = dict(row)
+            job['attempts'] += 1
+            return job
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def _finish(self, job: Dict, error: Optional[str] = None) -> None:
+        conn = self._connect()
+        if error is None:
+            conn.execute("UPDATE jobs SET status = 'done', locked_until = NULL, last_error = NULL WHERE id = ?",
+                         (job['id'],))
+        elif job['attempts'] >= job['max_attempts']:
+            conn.execute("UPDATE jobs SET status = 'failed', locked_until = NULL, last_error = ? WHERE id = ?",
+                         (error, job['id']))
+        else:
+            retry_at = self._clock() + self.backoff * (2 ** (job['attempts'] - 1))
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', run_at = ?, locked_until = NULL, last_error = ? WHERE id = ?",
+                (retry_at, error, job['id'])
+            )
+        conn.commit()
+        conn.close()
+
+    def _process(self, job: Dict) -> None:
+        handler = self._handlers.get(job['kind'])
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{job['kind']}'")
+            handler(json.loads(job['payload']))
+        except Exception:
+            self._finish(job, traceback.format_exc(limit=5))
+        else:
+            self._finish(job)
+
+        if job['kind'] in self._recurring:
+            self._enqueue_if_idle(job['kind'], delay=self._recurring[job['kind']])
+
+    def run_pending(self, limit: Optional[int] = None) -> int:
+        """
+        Process due jobs on the calling thread (used by tests and CLI)
+
+        Returns:
+            Number of jobs processed
+        """
+        processed = 0
+        while limit is None or processed < limit:
+            job = self._claim()
+            if job is None:
+                break
+            self._process(job)
+            processed += 1
+        return processed
+
+    def _worker_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                print(f"Job queue error: {e}")
+                job = None
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._process(job)
+
+    def start(self) -> None:
+        """Start worker threads once per process (safe to call repeatedly)"""
+        if self._threads or self.workers <= 0:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Signal workers to exit and wait for them"""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def purge(self, older_than: float) -> int:
+        """
+        Delete done and failed jobs whose last run was more than `older_than` seconds ago
+
+        Returns:
+            Number of jobs deleted
+        """
+        conn = self._connect()
+        deleted = conn.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND run_at < ?",
+                               (self._clock() - older_than,)).rowcount
+        conn.commit()
+        conn.close()
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        """Count jobs per status"""
+        conn = self._connect()
+        rows = conn.execute('SELECT status, COUNT(*) AS count FROM jobs GROUP BY status').fetchall()
+        conn.close()
+        return {row['status']: row['count'] for row in rows}
+
+
+# Global instance (initialized in app.py)
+job_queue: Optional[JobQueue] = None
+
+
+def init_job_queue(connect: Callable, workers: int = 2) -> JobQueue:
+    """Initialize global job queue"""
+    global job_queue
+    job_queue = JobQueue(connect, workers=workers)
+    return job_queue
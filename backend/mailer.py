@@ -0,0 +1,74 @@
+"""
+Mailer for EasyVents
+Sends email over SMTP; prints messages when no SMTP server is configured
+"""
+
+import smtplib
+from email.message import EmailMessage
+from typing import Optional
+
+
+class Mailer:
+    """Thin SMTP client used by background jobs"""
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: int = 25,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        sender: str = 'EasyVents <no-reply@easyevents.local>',
+        timeout: float = 10.0
+    ):
+        """
+        Args:
+            host: SMTP server. If None, messages are printed instead of sent
+            port: SMTP port (e.g. 1025 for a local fake SMTP server)
+            username/password: Optional SMTP credentials
+            use_tls: Upgrade the connection with STARTTLS
+            sender: From header
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.sender = sender
+        self.timeout = timeout
+
+    def send(self, to: str, subject: str, body: str) -> None:
+        """
+        Send a plain text email
+
+        Raises:
+            smtplib.SMTPException / OSError on delivery failure (the job queue retries)
+        """
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = to
+        message['Subject'] = subject
+        message.set_content(body)
+
+        if not self.host:
+            print(f"EMAIL to {to}: {subject}\n{body}")
+            return
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or '')
+            smtp.send_message(message)
+
+
+# Global instance (initialized in app.py)
+mailer: Optional[Mailer] = None
+
+
+def init_mailer(host: Optional[str] = None, port: int = 25, **kwargs) -> Mailer:
+    """Initialize global mailer"""
+    global mailer
+    mailer = Mailer(host, port, **kwargs)
+    return mailer
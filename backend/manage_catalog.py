@@ -0,0 +1,89 @@
+"""
+EasyVents - Catalog Import/Export
+Loads vendor onboarding feeds into venues/suppliers and dumps them back out
+
+    python manage_catalog.py import venues feed.csv
+    python manage_catalog.py import suppliers feed.jsonl --dry-run
+    python manage_catalog.py export suppliers -o suppliers.jsonl
+    python manage_catalog.py export venues > venues.csv
+
+Rows with an id update that row; rows without one are matched on the natural
+key (venues: name + city, suppliers: name + type + city) and updated, or
+inserted when new. Only the columns present in the feed are written. The same
+operations are available to operators at /admin/catalog/<table>.
+"""
+
+import argparse
+import contextlib
+import os
+import sqlite3
+import sys
+import time
+
+from catalog_io import CATALOG_TABLES, FORMATS, CatalogTransfer, format_from_filename
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', help='Database file (default: the app database)')
+    parser.add_argument('--batch-size', type=int, default=2000, help='Rows per transaction (default 2000)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help='Upsert rows from a CSV / JSONL file ("-" for stdin)')
+    importer.add_argument('table', choices=sorted(CATALOG_TABLES))
+    importer.add_argument('path')
+    importer.add_argument('--format', choices=FORMATS, help='Default: from the file extension')
+    importer.add_argument('--dry-run', action='store_true', help='Validate only, write nothing')
+
+    exporter = commands.add_parser('export', help='Write a table as CSV / JSONL')
+    exporter.add_argument('table', choices=sorted(CATALOG_TABLES))
+    exporter.add_argument('-o', '--output', help='Output file (default: stdout)')
+    exporter.add_argument('--format', choices=FORMATS, help='Default: from the file extension, else csv')
+    args = parser.parse_args()
+
+    path = args.path if args.command == 'import' else args.output
+    fmt = args.format or format_from_filename(path, default=None if args.command == 'import' else 'csv')
+    if fmt is None:
+        parser.error('cannot tell the format from the file name; pass --format')
+
+    if args.db:
+        os.environ['EASYEVENTS_DB_PATH'] = os.path.abspath(args.db)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # Importing the app creates any missing tables; its startup messages must
+    # not end up in an export written to stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import DATABASE
+
+    transfer = CatalogTransfer(lambda: sqlite3.connect(DATABASE), args.batch_size)
+    transfer.ensure_indexes()
+
+    if args.command == 'export':
+        output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        try:
+            for chunk in transfer.export(args.table, fmt):
+                output.write(chunk)
+        finally:
+            if args.output:
+                output.close()
+        return
+
+    started = time.perf_counter()
+    source = sys.stdin.buffer if args.path == '-' else open(args.path, 'rb')
+    try:
+        result = transfer.import_stream(args.table, source, fmt, dry_run=args.dry_run)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+    elapsed = time.perf_counter() - started
+
+    for error in result.errors:
+        print(f"  line {error['line']}: {error['error']}", file=sys.stderr)
+    if result.error_count > len(result.errors):
+        print(f"  ... and {result.error_count - len(result.errors)} more", file=sys.stderr)
+    print(f"{'🔍 Checked' if args.dry_run else '✅ Imported'} {args.table}: {result.inserted:,} new, "
+          f"{result.updated:,} updated, {result.error_count:,} rejected in {elapsed:.1f}s")
+    sys.exit(1 if result.error_count else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+"""
+Metrics for EasyVents
+Request counters and histograms exposed in the Prometheus text format
+
+Each process keeps its own counts in memory. When a metrics directory is
+configured (always the case under gunicorn, see gunicorn.conf.py), every
+process periodically writes a snapshot to <dir>/<pid>.json and /metrics
+sums the snapshots of all workers. When a worker exits, the master folds
+its snapshot into <dir>/exited.json, so counters never go backwards when
+a worker is recycled and the directory doesn't grow with every recycle.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+# Upper bounds (inclusive) of the histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+REQUEST_STATS_KEY = 'easyevents.request_stats'
+
+# Sum of the snapshots of every worker that has exited
+EXITED_SNAPSHOT = 'exited.json'
+
+
+def format_labels(labels: Dict[str, object]) -> str:
+    """Render labels as the inside of a Prometheus label set: a="1",b="2" """
+    parts = []
+    for name, value in sorted(labels.items()):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{escaped}"')
+    return ','.join(parts)
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def merge_snapshots(snapshots: Iterable[dict]) -> dict:
+    """Sum counters and histogram buckets across snapshots"""
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, samples in snapshot['counters'].items():
+            merged = counters.setdefault(name, {})
+            for key, value in samples.items():
+                merged[key] = merged.get(key, 0) + value
+        for name, samples in snapshot['histograms'].items():
+            merged = histograms.setdefault(name, {})
+            for key, values in samples.items():
+                if key in merged:
+                    merged[key] = [a + b for a, b in zip(merged[key], values)]
+                else:
+                    merged[key] = list(values)
+    return {'counters': counters, 'histograms': histograms}
+
+
+def write_snapshot(path: str, snapshot: dict) -> None:
+    """Replace a snapshot file atomically, so readers never see half of one"""
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    os.replace(f'{path}.tmp', path)
+
+
+def fold_exited_worker(directory: str, pid: int) -> None:
+    """
+    Add an exited worker's snapshot to EXITED_SNAPSHOT and remove it
+
+    Called by the gunicorn master (the only writer of EXITED_SNAPSHOT)
+    after the worker has flushed its final counts.
+    """
+    path = os.path.join(directory, f'{pid}.json')
+    aggregate = os.path.join(directory, EXITED_SNAPSHOT)
+    snapshots = []
+    for snapshot_path in (aggregate, path):
+        try:
+            with open(snapshot_path, encoding='utf-8') as f:
+                snapshots.append(json.load(f))
+        except FileNotFoundError:
+            continue
+    write_snapshot(aggregate, merge_snapshots(snapshots))
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class Metrics:
+    """
+    Registry of counters and histograms
+
+    Metrics must be described before use. Samples are keyed by their
+    rendered label string so snapshots can be merged as plain JSON.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 5.0):
+        """
+        Args:
+            directory: Shared directory for per-process snapshots, or None
+                       to serve this process's counts only
+            flush_interval: Minimum seconds between snapshot writes
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._descriptions = {}  # name -> (type, help, buckets)
+        self._counters = {}      # name -> {labels: value}
+        self._histograms = {}    # name -> {labels: [bucket counts..., +Inf count, sum]}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = 0.0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            atexit.register(self._flush_at_exit)
+
+    def describe_counter(self, name: str, help_text: str) -> None:
+        self._descriptions[name] = ('counter', help_text, None)
+        self._counters.setdefault(name, {})
+
+    def describe_histogram(self, name: str, help_text: str, buckets: Iterable[float]) -> None:
+        self._descriptions[name] = ('histogram', help_text, tuple(buckets))
+        self._histograms.setdefault(name, {})
+
+    def inc(self, name: str, labels: Dict[str, object], amount: float = 1) -> None:
+        key = format_labels(labels)
+        with self._lock:
+            samples = self._counters[name]
+            samples[key] = samples.get(key, 0) + amount
+
+    def observe(self, name: str, labels: Dict[str, object], value: float) -> None:
+        buckets = self._descriptions[name][2]
+        key = format_labels(labels)
+        with self._lock:
+            samples = self._histograms[name]
+            sample = samples.get(key)
+            if sample is None:
+                sample = samples[key] = [0] * (len(buckets) + 1) + [0.0]
+            index = len(buckets)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    index = i
+                    break
+            sample[index] += 1
+            sample[-1] += value
+
+    # ---- multiprocess snapshots ----
+
+    def _snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'counters': {name: dict(samples) for name, samples in self._counters.items()},
+                'histograms': {name: {k: list(v) for k, v in samples.items()}
+                               for name, samples in self._histograms.items()},
+            }
+
+    def maybe_flush(self) -> None:
+        """Write a snapshot if the last one is older than flush_interval"""
+        if self.directory and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write this process's snapshot to the shared directory"""
+        if not self.directory:
+            return
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            write_snapshot(os.path.join(self.directory, f'{os.getpid()}.json'), self._snapshot())
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except OSError:
+            pass  # Directory already removed, nothing left to report to
+
+    def _collect(self) -> List[dict]:
+        if not self.directory:
+            return [self._snapshot()]
+        self.flush()
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Worker exited or is mid-write; its next snapshot will count
+        return snapshots
+
+    def merged(self) -> dict:
+        """Sum the snapshots of every process"""
+        return merge_snapshots(self._collect())
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        data = self.merged()
+        lines = []
+        for name, (kind, help_text, buckets) in sorted(self._descriptions.items()):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'counter':
+                for key, value in sorted(data['counters'].get(name, {}).items()):
+                    lines.append(f'{name}{{{key}}} {format_value(value)}')
+                continue
+            for key, values in sorted(data['histograms'].get(name, {}).items()):
+                prefix = f'{key},' if key else ''
+                cumulative = 0
+                for bound, count in zip(buckets, values):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{prefix}le="{format_value(bound)}"}} {cumulative}')
+                cumulative += values[len(buckets)]
+                lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+                lines.append(f'{name}_sum{{{key}}} {format_value(values[-1])}')
+                lines.append(f'{name}_count{{{key}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+class RequestStats:
+    """Per-request measurements filled in while the app handles the request"""
+
+    __slots__ = ('endpoint', 'queries', 'db_time')
+
+    def __init__(self):
+        self.endpoint = None
+        self.queries = 0
+        self.db_time = 0.0
+
+    def add_query(self, duration: float) -> None:
+        self.queries += 1
+        self.db_time += duration
+
+
+class MetricsMiddleware:
+    """
+    WSGI middleware recording count, latency, response size and DB usage per endpoint
+
+    Measurement ends when the server closes the response, so streamed
+    responses are timed and sized in full. The app is expected to set
+    RequestStats.endpoint (found in the environ under REQUEST_STATS_KEY).
+    """
+
+    def __init__(self, wsgi_app, metrics: 'Metrics'):
+        self.wsgi_app = wsgi_app
+        self.metrics = metrics
+
+    def __call__(self, environ, start_response):
+        started = time.perf_counter()
+        stats = environ[REQUEST_STATS_KEY] = RequestStats()
+        status = []
+
+        def recording_start_response(status_line, headers, exc_info=None):
+            status[:] = [status_line.split(' ', 1)[0]]
+            return start_response(status_line, headers, exc_info)
+
+        result = self.wsgi_app(environ, recording_start_response)
+        return MeteredResponse(result, lambda size: self._record(environ, stats, status, started, size))
+
+    def _record(self, environ, stats, status, started, size):
+        duration = time.perf_counter() - started
+        endpoint = stats.endpoint or 'unmatched'
+        metrics = self.metrics
+        metrics.inc('easyevents_http_requests_total', {
+            'endpoint': endpoint,
+            'method': environ.get('REQUEST_METHOD', ''),
+            'status': status[0] if status else '500',
+        })
+        labels = {'endpoint': endpoint}
+        metrics.observe('easyevents_http_request_duration_seconds', labels, duration)
+        metrics.observe('easyevents_http_response_size_bytes', labels, size)
+        metrics.observe('easyevents_db_queries_per_request', labels, stats.queries)
+        metrics.observe('easyevents_db_time_per_request_seconds', labels, stats.db_time)
+        metrics.maybe_flush()
+
+
+class MeteredResponse:
+    """Response iterable that counts bytes and reports once it is closed"""
+
+    def __init__(self, result, on_close):
+        self._result = result
+        self._on_close = on_close
+        self._size = 0
+
+    def __iter__(self):
+        for chunk in self._result:
+            self._size += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            if hasattr(self._result, 'close'):
+                self._result.close()
+        finally:
+            on_close, self._on_close = self._on_close, None
+            if on_close is not None:
+                on_close(self._size)
+
+
+def describe_http_metrics(metrics: Metrics) -> None:
+    """Register the metrics recorded by MetricsMiddleware"""
+    metrics.describe_counter('easyevents_http_requests_total', 'HTTP requests handled')
+    metrics.describe_histogram('easyevents_http_request_duration_seconds',
+                               'Time from receiving a request to sending its last byte', LATENCY_BUCKETS)
+    metrics.describe_histogram('easyevents_http_response_size_bytes', 'Response body size', SIZE_BUCKETS)
+    metrics.describe_histogram('easyevents_db_queries_per_request',
+                               'SQL statements executed per request', QUERY_COUNT_BUCKETS)
+    metrics.describe_histogram('easyevents_db_time_per_request_seconds',
+                               'Time spent in SQL statements per request', LATENCY_BUCKETS)
+
+
+# Global instance (initialized in app.py)
+metrics: Optional[Metrics] = None
+
+
+def init_metrics(directory: Optional[str] = None) -> Metrics:
+    """Initialize the global metrics registry with the HTTP metrics described"""
+    global metrics
+    metrics = Metrics(directory)
+    describe_http_metrics(metrics)
+    return metrics
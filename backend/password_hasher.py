@@ -0,0 +1,102 @@
+"""
+Password Hasher for EasyVents
+Runs password hashing on a bounded worker pool with configurable cost
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Optional
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full (or a job times out) and the request should be retried later"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Password hashing queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords on a bounded thread pool
+
+    hashlib's scrypt and pbkdf2 release the GIL, so the pool hashes in
+    parallel on separate cores while the number of queued jobs is capped:
+    once `workers + queue_size` jobs are in flight, new calls fail fast
+    with HasherBusy instead of piling up behind each other.
+    """
+
+    def __init__(
+        self,
+        method: str = 'scrypt',
+        workers: int = 2,
+        queue_size: int = 16,
+        timeout: float = 10.0,
+        retry_after: int = 2
+    ):
+        """
+        Args:
+            method: werkzeug hash method with optional cost parameters,
+                    e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000'
+            workers: Number of hashing threads
+            queue_size: Jobs allowed to wait for a free worker
+            timeout: Seconds to wait for a hashing job to complete before raising HasherBusy
+            retry_after: Seconds clients are told to wait when the queue is full
+        """
+        self.method = method
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hasher')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+        # werkzeug expands defaults into the stored prefix (e.g. 'scrypt' ->
+        # 'scrypt:32768:8:1'), so derive the canonical prefix from a real hash
+        self.method_prefix = generate_password_hash('', method=method).split('$', 1)[0]
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy(self.retry_after)
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # The job keeps its slot until it finishes, so the pool is saturated
+            raise HasherBusy(self.retry_after) from None
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured method"""
+        return self._submit(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """Check a password against a stored hash (any supported method)"""
+        return self._submit(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Check if a stored hash was made with different method or cost parameters"""
+        return password_hash.split('$', 1)[0] != self.method_prefix
+
+    def shutdown(self) -> None:
+        """Stop the worker pool"""
+        self._executor.shutdown(wait=False)
+
+
+# Global instance (initialized in app.py)
+password_hasher: Optional[PasswordHasher] = None
+
+
+def init_password_hasher(
+    method: str = 'scrypt',
+    workers: int = 2,
+    queue_size: int = 16
+) -> PasswordHasher:
+    """Initialize global password hasher"""
+    global password_hasher
+    password_hasher = PasswordHasher(method, workers, queue_size)
+    return password_hasher
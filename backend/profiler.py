@@ -0,0 +1,242 @@
+"""
+Sampling Profiler for EasyVents
+Statistical profiler for live traffic, aggregated per route as collapsed stacks
+
+A background thread looks at the Python stacks of the threads currently
+handling a sampled request every `interval` seconds and counts each stack
+under the request's route. The output is the "collapsed stack" format read
+by flamegraph.pl, speedscope and similar tools: one line per distinct stack,
+frames separated by ';', followed by the number of samples.
+
+When a shared directory is configured (always under gunicorn), the settings
+live in <dir>/profiler.json so a change made through one worker reaches all
+of them, and each worker writes its samples to <dir>/stacks-<pid>.json.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+SETTINGS_FILE = 'profiler.json'
+
+
+class SamplingProfiler:
+    """Samples the stacks of in-flight requests and counts them per route"""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        interval: float = 0.005,
+        max_depth: int = 100,
+        flush_interval: float = 5.0,
+        refresh_interval: float = 1.0
+    ):
+        """
+        Args:
+            directory: Shared directory for settings and per-process samples,
+                       or None to keep everything in this process
+            interval: Default seconds between samples
+            max_depth: Frames kept per stack, counted from the innermost
+            flush_interval: Minimum seconds between sample writes
+            refresh_interval: Seconds between checks for changed settings
+        """
+        self.directory = directory
+        self.max_depth = max_depth
+        self.flush_interval = flush_interval
+        self.refresh_interval = refresh_interval
+        self.settings = {'enabled': False, 'sample_rate': 0.01, 'interval': interval, 'generation': 0}
+
+        self._stacks: Dict[str, Counter] = {}
+        self._active: Dict[int, str] = {}  # thread id -> route being handled
+        self._lock = threading.Lock()
+        self._has_work = threading.Event()
+        self._thread = None
+        self._settings_mtime = None
+        self._last_refresh = 0.0
+        self._last_flush = 0.0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # ---- settings ----
+
+    def configure(self, **changes) -> dict:
+        """
+        Change enabled / sample_rate / interval for every process
+
+        Returns:
+            The new settings
+        """
+        settings = dict(self.settings, **changes)
+        settings['sample_rate'] = min(1.0, max(0.0, float(settings['sample_rate'])))
+        settings['interval'] = max(0.001, float(settings['interval']))
+        self._write_settings(settings)
+        return settings
+
+    def reset(self) -> None:
+        """Discard all collected samples in every process"""
+        self._write_settings(dict(self.settings, generation=self.settings['generation'] + 1))
+        if self.directory:
+            for filename in os.listdir(self.directory):
+                if filename.startswith('stacks-'):
+                    os.remove(os.path.join(self.directory, filename))
+
+    def _write_settings(self, settings: dict) -> None:
+        if self.directory:
+            path = os.path.join(self.directory, SETTINGS_FILE)
+            with open(f'{path}.{os.getpid()}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(settings, f)
+            os.replace(f'{path}.{os.getpid()}.tmp', path)
+        self._apply_settings(settings)
+
+    def _apply_settings(self, settings: dict) -> None:
+        if settings['generation'] != self.settings['generation']:
+            with self._lock:
+                self._stacks = {}
+        self.settings = settings
+
+    def _refresh_settings(self) -> None:
+        now = time.monotonic()
+        if not self.directory or now - self._last_refresh < self.refresh_interval:
+            return
+        self._last_refresh = now
+        path = os.path.join(self.directory, SETTINGS_FILE)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if mtime != self._settings_mtime:
+                with open(path, encoding='utf-8') as f:
+                    self._apply_settings(json.load(f))
+                self._settings_mtime = mtime
+        except (OSError, ValueError):
+            pass  # Not configured yet, or mid-write; try again later
+
+    # ---- request hooks ----
+
+    def should_sample(self) -> bool:
+        """Decide whether the current request is profiled"""
+        self._refresh_settings()
+        return self.settings['enabled'] and random.random() < self.settings['sample_rate']
+
+    def begin(self, route: str) -> None:
+        """Start sampling the calling thread under `route`"""
+        self._active[threading.get_ident()] = route
+        self._has_work.set()
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                    self._thread.start()
+
+    def end(self) -> None:
+        """Stop sampling the calling thread"""
+        if self._active.pop(threading.get_ident(), None) is not None:
+            self.maybe_flush()
+
+    # ---- sampling ----
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while True:
+            self._has_work.wait()
+            time.sleep(self.settings['interval'])
+            active = dict(self._active)
+            if not active:
+                self._has_work.clear()
+                if self._active:
+                    self._has_work.set()  # A request began while we were clearing
+                continue
+            frames = sys._current_frames()
+            samples = []
+            for ident, route in active.items():
+                frame = frames.get(ident)
+                if frame is not None and ident != own_ident:
+                    samples.append((route, self._collapse(frame)))
+            del frames
+            with self._lock:
+                for route, stack in samples:
+                    self._stacks.setdefault(route, Counter())[stack] += 1
+
+    def _collapse(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f'{os.path.basename(code.co_filename)}:{code.co_name}'.replace(';', ':'))
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    # ---- output ----
+
+    def maybe_flush(self) -> None:
+        if self.directory and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write this process's samples to the shared directory"""
+        if not self.directory:
+            return
+        self._last_flush = time.monotonic()
+        with self._lock:
+            snapshot = {'generation': self.settings['generation'],
+                        'stacks': {route: dict(stacks) for route, stacks in self._stacks.items()}}
+        path = os.path.join(self.directory, f'stacks-{os.getpid()}.json')
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(f'{path}.tmp', path)
+
+    def merged(self) -> Dict[str, Counter]:
+        """Samples of every process, per route"""
+        if not self.directory:
+            with self._lock:
+                return {route: Counter(stacks) for route, stacks in self._stacks.items()}
+        self.flush()
+        merged: Dict[str, Counter] = {}
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith('stacks-') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if snapshot['generation'] != self.settings['generation']:
+                continue  # Collected before the last reset
+            for route, stacks in snapshot['stacks'].items():
+                merged.setdefault(route, Counter()).update(stacks)
+        return merged
+
+    def collapsed(self, route: Optional[str] = None) -> str:
+        """
+        Samples in collapsed-stack format
+
+        Args:
+            route: Only this route's stacks; otherwise all routes, each
+                   stack prefixed with its route as the root frame
+        """
+        lines = []
+        for name, stacks in sorted(self.merged().items()):
+            if route is not None and name != route:
+                continue
+            for stack, count in stacks.most_common():
+                lines.append(f'{stack} {count}' if route is not None else f'{name};{stack} {count}')
+        return '\n'.join(lines) + ('\n' if lines else '')
+
+    def summary(self) -> dict:
+        """Settings plus the number of samples collected per route"""
+        return dict(self.settings, samples={
+            route: sum(stacks.values()) for route, stacks in self.merged().items()
+        })
+
+
+# Global instance (initialized in app.py)
+profiler: Optional[SamplingProfiler] = None
+
+
+def init_profiler(directory: Optional[str] = None) -> SamplingProfiler:
+    """Initialize the global sampling profiler (disabled until configured)"""
+    global profiler
+    profiler = SamplingProfiler(directory)
+    return profiler
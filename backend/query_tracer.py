@@ -0,0 +1,255 @@
+"""
+Query Tracer for EasyVents
+Times every SQL statement issued through sqlite3 or SQLAlchemy and reports it to listeners
+
+QueryTracer builds on those hooks: it logs statements slower than a threshold
+together with SQLite's EXPLAIN QUERY PLAN, and finds statements repeated many
+times within one request (the N+1 pattern).
+"""
+
+import re
+import sqlite3
+import time
+from collections import Counter
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+# Listeners are called as listener(statement, parameters, duration_seconds)
+QueryListener = Callable[[str, object, float], None]
+
+_listeners: List[QueryListener] = []
+
+
+def add_query_listener(listener: QueryListener) -> None:
+    """Register a callable to be notified after every traced statement"""
+    _listeners.append(listener)
+
+
+def _notify(statement: str, parameters, duration: float) -> None:
+    for listener in _listeners:
+        listener(statement, parameters, duration)
+
+
+class TracedCursor(sqlite3.Cursor):
+    """
+    sqlite3 cursor that times statements, including fetching their rows
+
+    SQLite does most of a SELECT's work while rows are stepped through, so a
+    statement returning rows is reported once they have all been fetched, or
+    when the cursor is closed, re-executed or dropped. Time spent by the
+    caller between fetches doesn't count.
+    """
+
+    _statement = None  # (sql, parameters) until reported
+    _elapsed = 0.0
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._elapsed += time.perf_counter() - started
+
+    def _report(self):
+        if self._statement is not None:
+            sql, parameters = self._statement
+            self._statement = None
+            _notify(sql, parameters, self._elapsed)
+
+    def _start(self, sql, parameters, method, *args):
+        self._report()
+        self._statement, self._elapsed = (sql, parameters), 0.0
+        try:
+            self._timed(method, *args)
+        finally:
+            if self.description is None:  # Failed, or no rows to fetch
+                self._report()
+        return self
+
+    def execute(self, sql, parameters=()):
+        return self._start(sql, parameters, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._start(sql, None, super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._report()
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if not rows:
+            self._report()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._report()
+        return rows
+
+    def __next__(self):
+        try:
+            return self._timed(super().__next__)
+        except StopIteration:
+            self._report()
+            raise
+
+    def close(self):
+        self._report()
+        super().close()
+
+    def __del__(self):
+        self._report()
+
+
+class TracedConnection(sqlite3.Connection):
+    """
+    sqlite3 connection whose shortcut methods go through TracedCursor
+
+    Usage: sqlite3.connect(path, factory=TracedConnection)
+    """
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or TracedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def instrument_engine(engine) -> None:
+    """
+    Time every statement a SQLAlchemy engine sends to the database
+
+    SQLAlchemy's hooks end at execute, so unlike TracedCursor this leaves out
+    the time spent fetching rows.
+    """
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_started'].pop()
+        _notify(statement, parameters, time.perf_counter() - started)
+
+    @event.listens_for(engine, 'handle_error')
+    def _failed(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get('query_started'):
+            started = connection.info['query_started'].pop()
+            _notify(exception_context.statement, exception_context.parameters, time.perf_counter() - started)
+
+
+# Literals and IN-lists are collapsed so "id = 1" and "id = 2" count as one statement
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\?(?:\s*,\s*\?)+')
+_WHITESPACE = re.compile(r'\s+')
+
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'WITH')
+
+
+def normalize_statement(statement: str) -> str:
+    """Statement shape with literal values replaced by ?"""
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('?', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class QueryTracer:
+    """Slow-statement log with query plans and per-request repetition counts"""
+
+    def __init__(
+        self,
+        explain_connect: Callable[[], sqlite3.Connection],
+        slow_threshold: float = 0.1,
+        repeat_threshold: int = 10
+    ):
+        """
+        Args:
+            explain_connect: Opens an untraced connection used for EXPLAIN QUERY PLAN
+            slow_threshold: Seconds after which a statement is logged as slow
+            repeat_threshold: Executions of one statement shape per request
+                              that count as an N+1 pattern
+        """
+        self.explain_connect = explain_connect
+        self.slow_threshold = slow_threshold
+        self.repeat_threshold = repeat_threshold
+
+    def statement_finished(
+        self,
+        statement: str,
+        parameters,
+        duration: float,
+        statements: Optional[Counter] = None,
+        context: str = ''
+    ) -> bool:
+        """
+        Record a finished statement
+
+        Args:
+            statements: Per-request counts of statement shapes to add to
+            context: Where the statement ran (endpoint), for the log line
+
+        Returns:
+            True if the statement was slow (and has been logged)
+        """
+        if statements is not None:
+            statements[normalize_statement(statement)] += 1
+
+        if duration < self.slow_threshold:
+            return False
+        where = f' in {context}' if context else ''
+        plan = '\n'.join(f'    {line}' for line in self.explain(statement, parameters))
+        print(f"[SLOW SQL] {duration * 1000:.1f} ms{where}: {_WHITESPACE.sub(' ', statement).strip()}\n{plan}")
+        return True
+
+    def explain(self, statement: str, parameters=None) -> List[str]:
+        """SQLite's query plan for a statement, one indented line per step"""
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return []
+        if not isinstance(parameters, (tuple, list, dict)):
+            parameters = ()  # executemany: unbound parameters are planned as NULL
+        try:
+            conn = self.explain_connect()
+            try:
+                rows = conn.execute(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            return [f'(no plan: {e})']
+
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node_id] + detail)
+        return lines
+
+    def repeated_statements(self, statements: Counter) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least repeat_threshold times in one request"""
+        return [(shape, count) for shape, count in statements.most_common()
+                if count >= self.repeat_threshold]
+
+
+# Global instance (initialized in app.py)
+query_tracer: Optional[QueryTracer] = None
+
+
+def init_query_tracer(
+    explain_connect: Callable[[], sqlite3.Connection],
+    slow_threshold: float = 0.1,
+    repeat_threshold: int = 10
+) -> QueryTracer:
+    """Initialize the global query tracer"""
+    global query_tracer
+    query_tracer = QueryTracer(explain_connect, slow_threshold, repeat_threshold)
+    return query_tracer
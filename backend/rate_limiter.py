@@ -0,0 +1,204 @@
+"""
+Rate Limiter for EasyVents
+Token-bucket rate limiting and concurrency admission control
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+
+class BucketStore(ABC):
+    """Base interface for token bucket storage"""
+
+    @abstractmethod
+    def take(self, key: str, rate: float, capacity: float, now: float) -> Tuple[bool, float]:
+        """
+        Take one token from a bucket, refilling it first
+
+        Args:
+            key: Bucket key, e.g. 'login:ip:1.2.3.4'
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+            now: Current time in seconds
+
+        Returns:
+            (allowed, retry_after) - retry_after is seconds until a token is available
+        """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget all buckets"""
+
+    @abstractmethod
+    def sweep(self, before: float) -> int:
+        """
+        Forget buckets last taken from before the given time
+
+        A bucket idle for its whole refill window is full again, the same as
+        one that doesn't exist, so dropping it changes no decision.
+
+        Returns:
+            Number of buckets removed
+        """
+
+    @staticmethod
+    def _refill(tokens: float, updated: float, rate: float, capacity: float, now: float) -> Tuple[bool, float, float]:
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            return True, tokens - 1, 0.0
+        return False, tokens, (1 - tokens) / rate
+
+
+class MemoryBucketStore(BucketStore):
+    """Per-process bucket store with a bounded number of keys"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> Tuple[bool, float]:
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            allowed, tokens, retry_after = self._refill(tokens, updated, rate, capacity, now)
+            self._buckets[key] = (tokens, now)
+            # Least recently used buckets are the ones most likely to be full again
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed, retry_after
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def sweep(self, before: float) -> int:
+        with self._lock:
+            idle = [key for key, (_, updated) in self._buckets.items() if updated < before]
+            for key in idle:
+                del self._buckets[key]
+            return len(idle)
+
+
+class SQLiteBucketStore(BucketStore):
+    """Bucket store shared by all worker processes through a SQLite table"""
+
+    def __init__(self, connect: Callable):
+        """
+        Args:
+            connect: Factory returning a sqlite3 connection
+        """
+        self._connect = connect
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> Tuple[bool, float]:
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated = (row[0], row[1]) if row else (capacity, now)
+            allowed, tokens, retry_after = self._refill(tokens, updated, rate, capacity, now)
+            conn.execute('INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                         (key, tokens, now))
+            conn.execute('COMMIT')
+            return allowed, retry_after
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def reset(self) -> None:
+        conn = self._connect()
+        conn.execute('DELETE FROM rate_limit_buckets')
+        conn.commit()
+        conn.close()
+
+    def sweep(self, before: float) -> int:
+        conn = self._connect()
+        try:
+            removed = conn.execute('DELETE FROM rate_limit_buckets WHERE updated < ?', (before,)).rowcount
+            conn.commit()
+            return removed
+        finally:
+            conn.close()
+
+
+class RateLimiter:
+    """Named token-bucket rules evaluated against a bucket store"""
+
+    def __init__(self, store: BucketStore, rules: Dict[str, Tuple[int, int]]):
+        """
+        Args:
+            store: Bucket storage backend
+            rules: Rule name -> (requests, per_seconds), e.g. {'login:ip': (20, 60)}
+        """
+        self.store = store
+        self.rules = rules
+        self.enabled = True
+
+    def hit(self, rule: str, key: str) -> Tuple[bool, int]:
+        """
+        Count one request against a rule
+
+        Returns:
+            (allowed, retry_after) - retry_after is whole seconds, 0 if allowed
+        """
+        if not self.enabled or rule not in self.rules:
+            return True, 0
+        requests, per_seconds = self.rules[rule]
+        allowed, retry_after = self.store.take(f'{rule}:{key}', requests / per_seconds, requests, time.time())
+        return allowed, int(retry_after) + 1 if not allowed else 0
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop buckets idle for longer than the longest rule's refill window"""
+        window = max((per_seconds for _, per_seconds in self.rules.values()), default=0)
+        return self.store.sweep((time.time() if now is None else now) - window)
+
+
+class ConcurrencyLimiter:
+    """Caps how many requests may run an expensive section at the same time"""
+
+    def __init__(self, limit: int, retry_after: int = 1):
+        self.limit = limit
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def try_acquire(self) -> bool:
+        """Take a slot without waiting"""
+        return self._slots.acquire(blocking=False)
+
+    def release(self) -> None:
+        self._slots.release()
+
+
+# Global instance (initialized in app.py)
+rate_limiter: Optional[RateLimiter] = None
+
+
+def init_rate_limiter(rules: Dict[str, Tuple[int, int]], connect: Optional[Callable] = None) -> RateLimiter:
+    """
+    Initialize global rate limiter
+
+    Args:
+        rules: Rule name -> (requests, per_seconds)
+        connect: sqlite3 connection factory for a store shared across processes.
+                 If None, buckets are kept in memory per process
+    """
+    global rate_limiter
+    store = SQLiteBucketStore(connect) if connect is not None else MemoryBucketStore()
+    rate_limiter = RateLimiter(store, rules)
+    return rate_limiter
@@ -1,307 +1,409 @@
+"""
+EasyVents - Synthetic Data Generator
+Fills the database with a realistic, reproducible dataset at any scale
+
+The catalog starts with the hand-picked Israeli venues and suppliers below,
+followed by generated ones. Users, events, their vendors and guests can be
+generated on top, e.g. a production-sized dataset for benchmarking:
+
+    python seed_large_data.py --venues 10000 --suppliers 100000 \\
+        --users 100000 --events 100000 --guests 1000000
+
+The same --seed always produces the same rows. Rows are written with
+executemany in large transactions, so a million guests take seconds rather
+than hours. The catalog is replaced on every run (use --append to keep it);
+previously generated users and everything they own are always replaced.
+Generated users share the password "Seed1234" (hashed once).
+
+Options:
+    --venues / --suppliers   generated catalog rows on top of the curated ones (default 120 each)
+    --users / --events / --guests   default 0
+    --seed N        random seed (default 42)
+    --batch-size N  rows per transaction (default 50000)
+    --db PATH       database file (default: the app's database)
+"""
+
+import argparse
 import os
 import random
-from pathlib import Path
-from app import app, db, Venue, Supplier, get_local_venue_image, image_manager
-
-# --- LOCAL IMAGES ONLY ---
-# Using ImageManager for strict folder-based image selection
-
-# Track image indices per category
-_image_indices = {}
-
-def get_venue_image(style, venue_index=0):
-    """Selects a unique venue image - uses ImageManager for strict folder rules"""
-    # Determine category based on style
-    if 'pool' in style.lower() or 'villa' in style.lower():
-        category = 'pool'
-    elif 'wedding' in style.lower() or 'garden' in style.lower():
-        category = 'wedding'
-    else:
-        category = 'hall'
-    
-    # Get image using ImageManager
-    images = image_manager.get_images(category, count=100)
-    if not images:
-        return None
-    
-    # Return image by index (rotates through all available images)
-    return images[venue_index % len(images)]
-
-def get_supplier_image(type_, subtype=None):
-    """Suppliers use provider-specific images from ImageManager - STRICT folder rules"""
-    # Map supplier types to image categories
-    category_map = {
-        'Catering': 'food',
-        'DJ': 'dj',
-        'Orchestra': 'orchestra',
-        'Photographer': 'photographers',
-        'Designer': 'design'
-    }
-    
-    category = category_map.get(type_)
-    if not category:
-        # No matching category - return None instead of fake fallback
-        return None
-    
-    # For food, determine food_type based on subtype
-    if category == 'food':
-        food_type_map = {
-            'Meat_Chef': 'Meat',
-            'Meat_Asado': 'Meat',
-            'Dairy_Boutique': 'Milk',
-            'Sushi_Luxury': 'Neutral',
-            'Street_Food': 'Neutral',
-            'Dessert': 'Neutral'
-        }
-        food_type = food_type_map.get(subtype, 'Neutral')
-        # Get ALL images for food
-        images = image_manager.get_images('food', food_type=food_type, count=100)
-    else:
-        # For other categories, get ALL images (not just 1)
-        images = image_manager.get_images(category, count=100)
-    
-    if not images:
-        return None
-    
-    # Get next image in rotation for this category
-    if category not in _image_indices:
-        _image_indices[category] = 0
-    
-    image_url = images[_image_indices[category] % len(images)]
-    _image_indices[category] += 1
-    
-    return image_url
-
-def seed_data():
-    print("🌱 Seeding database with ISRAELI VENUES...")
-    print("📸 Real names, Real venues!")
-    print("🖼️ Images can repeat - we focus on quality!")
-    
-    with app.app_context():
-        db.drop_all()
-        db.create_all()
-        
-        # --- VENUES (אולמות בישראל) ---
-        venues_data = [
-            # HALLS (אולמות)
-            ('אולם הוד', 'תל אביב', 'רחוב דיזנגוף 50', 'Luxury_Hall', False, 280, 450),
-            ('אולם השרון', 'ראשון לציון', 'רחוב הרצל 15', 'Luxury_Hall', False, 320, 600),
-            ('אולם מלכי', 'ירושלים', 'דרך חברון 12', 'Luxury_Hall', False, 350, 750),
-            ('אולם כרמל', 'חיפה', 'רחוב פאנאדי 8', 'Luxury_Hall', False, 300, 550),
-            ('אולם הרימון', 'פתח תקווה', 'אבן גבירול 22', 'Luxury_Hall', False, 290, 500),
-            ('אולם יהלום', 'נתניה', 'רחוב גרנדציה 5', 'Luxury_Hall', False, 310, 480),
-            ('אולם אילת', 'אילת', 'רחוב משה דיין 1', 'Modern_Loft', False, 400, 350),
-            ('לופט קונספט', 'תל אביב', 'רחוב פלורנטין 35', 'Modern_Loft', False, 450, 200),
-            
-            # GARDENS / WEDDING VENUES (גנים לחתונה)
-            ('גן הורדים', 'קיסריה', 'רחוב העתיקות 3', 'Garden_Classic', True, 500, 600),
-            ('גן המלך', 'רעננה', 'רחוב הפארק 10', 'Garden_Classic', True, 450, 500),
-            ('גן הנוער', 'ראשון לציון', 'כיכר התרבות 2', 'Garden_Classic', True, 380, 450),
-            ('גן העץ', 'רחובות', 'רחוב המדע 7', 'Garden_Classic', True, 420, 550),
-            ('גן הגן', 'קיבוץ געש', 'דרך החוף 1', 'Boho_Nature', True, 350, 400),
-            ('גן הטבע', 'משמר השרון', 'רחוב השדות 6', 'Boho_Nature', True, 370, 450),
-            
-            # POOL VILLAS (וילות עם בריכה)
-            ('וילת הבריכה', 'קיסריה', 'רחוב הדרים 5', 'Villa_Pool', True, 6000, 120),
-            ('וילה בנוף', 'סביון', 'רחוב הזית 2', 'Villa_Pool', True, 7500, 150),
-            ('וילת המים', 'כפר סבא', 'רחוב הגפן 8', 'Villa_Pool', True, 5000, 100),
-            ('וילה לבנה', 'הרצליה', 'רחוב הגלים 3', 'Villa_Pool', True, 8000, 130),
-            ('וילת השקיעה', 'אילת', 'רחוב הים 4', 'Villa_Pool', True, 6500, 110),
-            ('בריכת קריסטל', 'מושב בצרה', 'דרך הגן 1', 'Villa_Pool', True, 5500, 95),
-            ('וילה בשדה', 'קיבוץ יגור', 'דרך הכניסה 1', 'Rustic_Barn', True, 3500, 80),
-            ('אסם יקום', 'יקום', 'דרך המושב 1', 'Rustic_Barn', True, 3000, 70),
-        ]
-
-        print(f"🏠 Adding {len(venues_data)} venues...")
-        for idx, (name, city, addr, style, open_air, price, cap) in enumerate(venues_data):
-            v = Venue(
-                name=name,
-                city=city,
-                address=addr,
-                style=style.split('_')[0],
-                is_open_air=open_air,
-                price=price,
-                capacity=cap,
-                phone=f"03-{random.randint(1000000, 9999999)}",
-                image_url=None
-            )
-            db.session.add(v)
-            db.session.flush()
-            # Get local image with rotation - NO REPEATS
-            v.image_url = get_venue_image(style, idx)
-
-        # --- SUPPLIERS ---
-        # Structure: (Name, Type, Subtype, City, Price)
-        suppliers_data = [
-            # DESIGNERS
-            ('עיצובים מהלב', 'Designer', 'Floral', 'תל אביב', 5000),
-            ('פרחי ירושלים', 'Designer', 'Floral', 'ירושלים', 4500),
-            ('סטייל ועיצוב', 'Designer', 'Table', 'חיפה', 6000),
-            ('עיצוב אירועים יוקרתי', 'Designer', 'Floral', 'הרצליה', 8000),
-            ('מג\'יק טאץ\'', 'Designer', 'Table', 'ראשון לציון', 5500),
-            ('פרחים וצבעים', 'Designer', 'Floral', 'באר שבע', 4000),
-            ('עיצוב שולחנות בוטיק', 'Designer', 'Table', 'רעננה', 4500),
-            ('עיצוב חופות', 'Designer', 'Floral', 'נתניה', 3500),
-            ('וינטג\' סטייל', 'Designer', 'Table', 'יפו', 5500),
-            
-            # ORCHESTRAS
-            ('תזמורת הלב', 'Orchestra', 'Live', 'כל הארץ', 12000),
-            ('צלילי המזרח', 'Orchestra', 'Live', 'באר שבע', 10000),
-            ('הלהקה החיה', 'Orchestra', 'Live', 'תל אביב', 15000),
-            ('סימפוניה', 'Orchestra', 'Live', 'ירושלים', 13000),
-            ('מקצב הלב', 'Orchestra', 'Live', 'חיפה', 11000),
-            
-            # DJs
-            ('DJ Ronen', 'DJ', 'Party', 'תל אביב', 4000),
-            ('DJ Galit', 'DJ', 'Wedding', 'הרצליה', 4500),
-            ('DJ BeatMaster', 'DJ', 'Party', 'ראשון לציון', 3500),
-            ('DJ Party', 'DJ', 'Party', 'חיפה', 3000),
-            ('DJ Sky', 'DJ', 'Party', 'אילת', 5000),
-            ('DJ Melody', 'DJ', 'Wedding', 'ירושלים', 4200),
-            ('DJ Groove', 'DJ', 'Party', 'רמת גן', 4000),
-            ('DJ Wedding', 'DJ', 'Wedding', 'פתח תקווה', 3900),
-            ('DJ Soul', 'DJ', 'Wedding', 'יפו', 4300),
-
-            # CATERING - MEAT
-            ('קייטרינג השף', 'Catering', 'Meat_Chef', 'נתניה', 250),
-            ('בשרים על האש', 'Catering', 'Meat_Asado', 'אשדוד', 200),
-            ('קייטרינג גורמה', 'Catering', 'Meat_Chef', 'תל אביב', 350),
-            ('שף בוטיק', 'Catering', 'Meat_Chef', 'הרצליה', 400),
-            ('אסאדו בטבע', 'Catering', 'Meat_Asado', 'כל הארץ', 300),
-            ('בשרים מעושנים', 'Catering', 'Meat_Asado', 'ראשון לציון', 330),
-            ('פוד טראק המבורגר', 'Catering', 'Street_Food', 'מרכז', 160),
-
-            # CATERING - DAIRY / SUSHI / DESSERT
-            ('טעמים וריחות', 'Catering', 'Dairy_Boutique', 'פתח תקווה', 220),
-            ('מתוקים ומלוחים', 'Catering', 'Dessert', 'רמת גן', 280),
-            ('סושי לאירועים', 'Catering', 'Sushi_Luxury', 'תל אביב', 320),
-            ('פיצה בטאבון', 'Catering', 'Street_Food', 'כל הארץ', 150),
-            ('קייטרינג חלבי', 'Catering', 'Dairy_Boutique', 'ירושלים', 240),
-            ('קינוחים ומתוקים', 'Catering', 'Dessert', 'תל אביב', 120),
-            ('סושי סטריט', 'Catering', 'Street_Food', 'תל אביב', 180), # Sushi Stand
-
-            # PHOTOGRAPHERS
-            ('פוקוס צילום', 'Photographer', 'Moments', 'חולון', 8000),
-            ('רגעים יפים', 'Photographer', 'Moments', 'רמת גן', 7500),
-            ('קליק אחד', 'Photographer', 'Artistic', 'ירושלים', 6500),
-            ('עדשה רחבה', 'Photographer', 'Artistic', 'תל אביב', 9000),
-            ('זכרונות מתוקים', 'Photographer', 'Moments', 'חיפה', 7000),
-            ('פלאש', 'Photographer', 'Moments', 'באר שבע', 6000),
-            ('סטודיו אור', 'Photographer', 'Artistic', 'ראשון לציון', 8500),
-            ('צילום אמנותי', 'Photographer', 'Artistic', 'הרצליה', 9500),
-            ('וידאו וסטילס', 'Photographer', 'Moments', 'פתח תקווה', 7800),
-        ]
-
-        for name, type_, subtype, city, price in suppliers_data:
-            s = Supplier(
-                name=name,
-                supplier_type=type_,
-                city=city,
-                price=price,
-                phone=f"050-{random.randint(1000000, 9999999)}",
-                image_url=get_supplier_image(type_, subtype)
-            )
-            db.session.add(s)
-
-            db.session.add(s)
-
-        # --- GENERATE 200+ EXTRA ITEMS ---
-        print("🚀 Generating 200+ extra items...")
-        
-        cities = ['תל אביב', 'ירושלים', 'חיפה', 'ראשון לציון', 'פתח תקווה', 'אשדוד', 'נתניה', 'באר שבע', 'חולון', 'רמת גן', 'הרצליה', 'כפר סבא', 'רעננה', 'מודיעין', 'חדרה', 'לוד', 'רמלה', 'נס ציונה', 'גדרה', 'אופקים', 'דימונה', 'מצפה רמון', 'אילת', 'קיסריה', 'יפו']
-        adjectives = ['היוקרתי', 'הקסום', 'המושלם', 'בטבע', 'על הים', 'האורבני', 'הכפרי', 'המודרני', 'הקלאסי', 'המלכותי', 'הרומנטי', 'הנעים', 'המיוחד', 'של חלומות', 'בנוף']
-        venue_nouns = ['אחוזת', 'גני', 'אולמי', 'חצר', 'משכן', 'ארמון', 'בית', 'מתחם', 'קטע', 'מרחב', 'אולם', 'גן', 'בריכת']
-        venue_adjectives = ['יוקרה', 'קסם', 'שלום', 'טבע', 'עירוני', 'כפרי', 'עץ', 'אבן', 'זכוכית']
-        
-        # Generate 120 Extra Venues
-        print("  📍 Adding 120 new venues...")
-        venue_counter = len(venues_data)
-        
-        for i in range(120):
-            # Randomly choose venue type
-            venue_type = random.choice(['hall', 'pool', 'wedding'])
-            
-            if venue_type == 'pool':
-                base_style = 'Villa'
-                open_air = True
-                image_url = get_venue_image('Villa_Pool', venue_counter)
-            elif venue_type == 'wedding':
-                base_style = 'Garden'
-                open_air = True
-                image_url = get_venue_image('Garden_Classic', venue_counter)
-            else:
-                base_style = 'Luxury'
-                open_air = False
-                image_url = get_venue_image('Luxury_Hall', venue_counter)
-                
-            city = random.choice(cities)
-            
-            name = f"{random.choice(venue_nouns)} {random.choice(venue_adjectives)}"
-            if random.random() > 0.6:
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+SEED_EMAIL_DOMAIN = 'seed.easyevents.local'
+SEED_PASSWORD = 'Seed1234'
+
+# --- CURATED CATALOG (אולמות וספקים בישראל) ---
+# Venues: (Name, City, Address, Style_Category, Open air, Price, Capacity)
+CURATED_VENUES = [
+    # HALLS (אולמות)
+    ('אולם הוד', 'תל אביב', 'רחוב דיזנגוף 50', 'Luxury_Hall', False, 280, 450),
+    ('אולם השרון', 'ראשון לציון', 'רחוב הרצל 15', 'Luxury_Hall', False, 320, 600),
+    ('אולם מלכי', 'ירושלים', 'דרך חברון 12', 'Luxury_Hall', False, 350, 750),
+    ('אולם כרמל', 'חיפה', 'רחוב פאנאדי 8', 'Luxury_Hall', False, 300, 550),
+    ('אולם הרימון', 'פתח תקווה', 'אבן גבירול 22', 'Luxury_Hall', False, 290, 500),
+    ('אולם יהלום', 'נתניה', 'רחוב גרנדציה 5', 'Luxury_Hall', False, 310, 480),
+    ('אולם אילת', 'אילת', 'רחוב משה דיין 1', 'Modern_Loft', False, 400, 350),
+    ('לופט קונספט', 'תל אביב', 'רחוב פלורנטין 35', 'Modern_Loft', False, 450, 200),
+
+    # GARDENS / WEDDING VENUES (גנים לחתונה)
+    ('גן הורדים', 'קיסריה', 'רחוב העתיקות 3', 'Garden_Classic', True, 500, 600),
+    ('גן המלך', 'רעננה', 'רחוב הפארק 10', 'Garden_Classic', True, 450, 500),
+    ('גן הנוער', 'ראשון לציון', 'כיכר התרבות 2', 'Garden_Classic', True, 380, 450),
+    ('גן העץ', 'רחובות', 'רחוב המדע 7', 'Garden_Classic', True, 420, 550),
+    ('גן הגן', 'קיבוץ געש', 'דרך החוף 1', 'Boho_Nature', True, 350, 400),
+    ('גן הטבע', 'משמר השרון', 'רחוב השדות 6', 'Boho_Nature', True, 370, 450),
+
+    # POOL VILLAS (וילות עם בריכה)
+    ('וילת הבריכה', 'קיסריה', 'רחוב הדרים 5', 'Villa_Pool', True, 6000, 120),
+    ('וילה בנוף', 'סביון', 'רחוב הזית 2', 'Villa_Pool', True, 7500, 150),
+    ('וילת המים', 'כפר סבא', 'רחוב הגפן 8', 'Villa_Pool', True, 5000, 100),
+    ('וילה לבנה', 'הרצליה', 'רחוב הגלים 3', 'Villa_Pool', True, 8000, 130),
+    ('וילת השקיעה', 'אילת', 'רחוב הים 4', 'Villa_Pool', True, 6500, 110),
+    ('בריכת קריסטל', 'מושב בצרה', 'דרך הגן 1', 'Villa_Pool', True, 5500, 95),
+    ('וילה בשדה', 'קיבוץ יגור', 'דרך הכניסה 1', 'Rustic_Barn', True, 3500, 80),
+    ('אסם יקום', 'יקום', 'דרך המושב 1', 'Rustic_Barn', True, 3000, 70),
+]
+
+# Suppliers: (Name, Type, Subtype, City, Price)
+CURATED_SUPPLIERS = [
+    # DESIGNERS
+    ('עיצובים מהלב', 'Designer', 'Floral', 'תל אביב', 5000),
+    ('פרחי ירושלים', 'Designer', 'Floral', 'ירושלים', 4500),
+    ('סטייל ועיצוב', 'Designer', 'Table', 'חיפה', 6000),
+    ('עיצוב אירועים יוקרתי', 'Designer', 'Floral', 'הרצליה', 8000),
+    ('מג\'יק טאץ\'', 'Designer', 'Table', 'ראשון לציון', 5500),
+    ('פרחים וצבעים', 'Designer', 'Floral', 'באר שבע', 4000),
+    ('עיצוב שולחנות בוטיק', 'Designer', 'Table', 'רעננה', 4500),
+    ('עיצוב חופות', 'Designer', 'Floral', 'נתניה', 3500),
+    ('וינטג\' סטייל', 'Designer', 'Table', 'יפו', 5500),
+
+    # ORCHESTRAS
+    ('תזמורת הלב', 'Orchestra', 'Live', 'כל הארץ', 12000),
+    ('צלילי המזרח', 'Orchestra', 'Live', 'באר שבע', 10000),
+    ('הלהקה החיה', 'Orchestra', 'Live', 'תל אביב', 15000),
+    ('סימפוניה', 'Orchestra', 'Live', 'ירושלים', 13000),
+    ('מקצב הלב', 'Orchestra', 'Live', 'חיפה', 11000),
+
+    # DJs
+    ('DJ Ronen', 'DJ', 'Party', 'תל אביב', 4000),
+    ('DJ Galit', 'DJ', 'Wedding', 'הרצליה', 4500),
+    ('DJ BeatMaster', 'DJ', 'Party', 'ראשון לציון', 3500),
+    ('DJ Party', 'DJ', 'Party', 'חיפה', 3000),
+    ('DJ Sky', 'DJ', 'Party', 'אילת', 5000),
+    ('DJ Melody', 'DJ', 'Wedding', 'ירושלים', 4200),
+    ('DJ Groove', 'DJ', 'Party', 'רמת גן', 4000),
+    ('DJ Wedding', 'DJ', 'Wedding', 'פתח תקווה', 3900),
+    ('DJ Soul', 'DJ', 'Wedding', 'יפו', 4300),
+
+    # CATERING - MEAT
+    ('קייטרינג השף', 'Catering', 'Meat_Chef', 'נתניה', 250),
+    ('בשרים על האש', 'Catering', 'Meat_Asado', 'אשדוד', 200),
+    ('קייטרינג גורמה', 'Catering', 'Meat_Chef', 'תל אביב', 350),
+    ('שף בוטיק', 'Catering', 'Meat_Chef', 'הרצליה', 400),
+    ('אסאדו בטבע', 'Catering', 'Meat_Asado', 'כל הארץ', 300),
+    ('בשרים מעושנים', 'Catering', 'Meat_Asado', 'ראשון לציון', 330),
+    ('פוד טראק המבורגר', 'Catering', 'Street_Food', 'מרכז', 160),
+
+    # CATERING - DAIRY / SUSHI / DESSERT
+    ('טעמים וריחות', 'Catering', 'Dairy_Boutique', 'פתח תקווה', 220),
+    ('מתוקים ומלוחים', 'Catering', 'Dessert', 'רמת גן', 280),
+    ('סושי לאירועים', 'Catering', 'Sushi_Luxury', 'תל אביב', 320),
+    ('פיצה בטאבון', 'Catering', 'Street_Food', 'כל הארץ', 150),
+    ('קייטרינג חלבי', 'Catering', 'Dairy_Boutique', 'ירושלים', 240),
+    ('קינוחים ומתוקים', 'Catering', 'Dessert', 'תל אביב', 120),
+    ('סושי סטריט', 'Catering', 'Street_Food', 'תל אביב', 180), # Sushi Stand
+
+    # PHOTOGRAPHERS
+    ('פוקוס צילום', 'Photographer', 'Moments', 'חולון', 8000),
+    ('רגעים יפים', 'Photographer', 'Moments', 'רמת גן', 7500),
+    ('קליק אחד', 'Photographer', 'Artistic', 'ירושלים', 6500),
+    ('עדשה רחבה', 'Photographer', 'Artistic', 'תל אביב', 9000),
+    ('זכרונות מתוקים', 'Photographer', 'Moments', 'חיפה', 7000),
+    ('פלאש', 'Photographer', 'Moments', 'באר שבע', 6000),
+    ('סטודיו אור', 'Photographer', 'Artistic', 'ראשון לציון', 8500),
+    ('צילום אמנותי', 'Photographer', 'Artistic', 'הרצליה', 9500),
+    ('וידאו וסטילס', 'Photographer', 'Moments', 'פתח תקווה', 7800),
+]
+
+# --- VOCABULARY FOR GENERATED ROWS ---
+CITIES = ['תל אביב', 'ירושלים', 'חיפה', 'ראשון לציון', 'פתח תקווה', 'אשדוד', 'נתניה', 'באר שבע', 'חולון',
+          'רמת גן', 'הרצליה', 'כפר סבא', 'רעננה', 'מודיעין', 'חדרה', 'לוד', 'רמלה', 'נס ציונה', 'גדרה',
+          'אופקים', 'דימונה', 'מצפה רמון', 'אילת', 'קיסריה', 'יפו']
+ADJECTIVES = ['היוקרתי', 'הקסום', 'המושלם', 'בטבע', 'על הים', 'האורבני', 'הכפרי', 'המודרני', 'הקלאסי',
+              'המלכותי', 'הרומנטי', 'הנעים', 'המיוחד', 'של חלומות', 'בנוף']
+VENUE_NOUNS = ['אחוזת', 'גני', 'אולמי', 'חצר', 'משכן', 'ארמון', 'בית', 'מתחם', 'קטע', 'מרחב', 'אולם', 'גן', 'בריכת']
+VENUE_ADJECTIVES = ['יוקרה', 'קסם', 'שלום', 'טבע', 'עירוני', 'כפרי', 'עץ', 'אבן', 'זכוכית']
+STREETS = ['הזית', 'הגפן', 'הים', 'הפרחים', 'הראשונים', 'הנחל', 'הגיא', 'הבוקר']
+# Generated venue kind: (style, open air, Style_Category used for the image)
+VENUE_KINDS = [('Luxury', False, 'Luxury_Hall'), ('Villa', True, 'Villa_Pool'), ('Garden', True, 'Garden_Classic')]
+
+SUPPLIER_TYPES = {
+    'Catering': ['Meat_Chef', 'Meat_Asado', 'Dairy_Boutique', 'Sushi_Luxury', 'Street_Food', 'Dessert'],
+    'DJ': ['Party', 'Wedding'],
+    'Photographer': ['Artistic', 'Moments'],
+    'Designer': ['Floral', 'Table'],
+    'Orchestra': ['Live']
+}
+SUPPLIER_NAMES = {
+    'Catering': ['קייטרינג', 'בשרים', 'סושי', 'קינוחים', 'טעמים', 'פיצה', 'עוגות', 'שפע'],
+    'DJ': ['DJ', 'דיג\'יי', 'מוזיקה', 'סאונד', 'ביט'],
+    'Photographer': ['צילום', 'קליק', 'עדשה', 'קאמרה', 'זיכרון'],
+    'Designer': ['עיצוב', 'דקור', 'פרחים', 'סטייל', 'הפקה'],
+    'Orchestra': ['תזמורת', 'להקה', 'צלילים', 'מוזיקה', 'סימפוניה'],
+}
+SURNAMES = ['כהן', 'לוי', 'ישראל', 'רון', 'גל', 'אור', 'שיר', 'דן', 'עמי', 'שלום',
+            'ברק', 'אדם', 'אריה', 'חן', 'דוד', 'מזרחי', 'פרץ', 'ביטון', 'אברהם', 'פרידמן']
+FIRST_NAMES = ['נועה', 'תמר', 'מאיה', 'יעל', 'שירה', 'אביגיל', 'הדסה', 'רחל', 'דנה', 'מיכל',
+               'איתי', 'יוסף', 'דוד', 'אורי', 'נועם', 'אריאל', 'יונתן', 'משה', 'עומר', 'אלון']
+
+# Image folder for each Style_Category / supplier type
+VENUE_IMAGE_CATEGORY = {'Villa_Pool': 'pool', 'Garden_Classic': 'wedding', 'Boho_Nature': 'wedding'}
+SUPPLIER_IMAGE_CATEGORY = {'Catering': 'food', 'DJ': 'dj', 'Orchestra': 'orchestra',
+                           'Photographer': 'photographers', 'Designer': 'design'}
+FOOD_TYPES = {'Meat_Chef': 'Meat', 'Meat_Asado': 'Meat', 'Dairy_Boutique': 'Milk'}
+
+# Values the plan form submits
+EVENT_TYPES = ['wedding', 'bar-mitzvah', 'brit', 'engagement', 'party', 'business', 'birthday', 'other']
+TIMES_OF_DAY = ['morning', 'afternoon', 'evening']
+EVENT_VENUE_TYPES = ['hall', 'garden', 'hotel', 'synagogue', 'restaurant']
+EVENT_STYLES = ['luxury', 'modern', 'rustic', 'vintage', 'boho', 'classic']
+REGIONS = ['north', 'sharon', 'center', 'jerusalem', 'south']
+BUDGETS = ['low', 'medium', 'high', 'premium', 'luxury']
+EVENT_STATUSES = ['תכנון', 'תכנון', 'תכנון', 'הוזמן', 'הסתיים']
+GUEST_STATUSES = ['pending', 'pending', 'confirmed', 'confirmed', 'declined', 'maybe']
+VENDORS_PER_EVENT = (0, 4)
+
+
+class Generator:
+    """Writes one dataset; every table draws from its own seeded random stream"""
+
+    def __init__(self, conn, seed, batch_size, images):
+        self.conn = conn
+        self.seed = seed
+        self.batch_size = batch_size
+        self.images = images
+        self.now = datetime(2025, 1, 1)  # Fixed so dates are reproducible too
+
+    def rng(self, table):
+        return random.Random(f'{self.seed}:{table}')
+
+    def insert(self, label, sql, rows, total):
+        """executemany in batch_size transactions, reporting progress"""
+        started = time.perf_counter()
+        done = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                done += self._write(sql, batch)
+                batch = []
+                self._progress(label, done, total, started)
+        if batch:
+            done += self._write(sql, batch)
+        self._progress(label, done, total, started, final=True)
+
+    def _write(self, sql, batch):
+        with self.conn:
+            self.conn.executemany(sql, batch)
+        return len(batch)
+
+    @staticmethod
+    def _progress(label, done, total, started, final=False):
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed else 0
+        print(f"\r  {label}: {done:,}/{total:,} ({rate:,.0f} rows/s)", end='\n' if final else '', flush=True)
+
+    def image(self, category, index, food_type=None):
+        key = f'food_{food_type}' if category == 'food' else category
+        available = self.images.get(key) or []
+        return available[index % len(available)] if available else None
+
+    # ---- catalog ----
+
+    def venues(self, count):
+        rng = self.rng('venues')
+        for index, (name, city, address, style, open_air, price, capacity) in enumerate(CURATED_VENUES):
+            yield (name, city, address, style.split('_')[0], open_air, price, capacity,
+                   f"03-{rng.randint(1000000, 9999999)}", self.venue_image(style, index))
+
+        for index in range(len(CURATED_VENUES), len(CURATED_VENUES) + count):
+            style, open_air, image_style = rng.choice(VENUE_KINDS)
+            city = rng.choice(CITIES)
+            name = f"{rng.choice(VENUE_NOUNS)} {rng.choice(VENUE_ADJECTIVES)}"
+            if rng.random() > 0.6:
                 name += f" - {city}"
-                
-            v = Venue(
-                name=name,
-                city=city,
-                address=f"רחוב {random.choice(['הזית', 'הגפן', 'הים', 'הפרחים', 'הראשונים', 'הנחל', 'הגיא', 'הבוקר'])} {random.randint(1, 200)}",
-                style=base_style,
-                is_open_air=open_air,
-                price=random.randint(180, 800),
-                capacity=random.randint(50, 1200),
-                phone=f"0{random.choice(['3','4','8','9'])}-{random.randint(1000000, 9999999)}",
-                image_url=image_url
-            )
-            venue_counter += 1
-            db.session.add(v)
-
-        # Generate 120 Extra Suppliers
-        print("  🎵 Adding 120 new suppliers...")
-        supplier_types = {
-            'Catering': ['Meat_Chef', 'Meat_Asado', 'Dairy_Boutique', 'Sushi_Luxury', 'Street_Food', 'Dessert'],
-            'DJ': ['Party', 'Wedding'],
-            'Photographer': ['Artistic', 'Moments'],
-            'Designer': ['Floral', 'Table'],
-            'Orchestra': ['Live']
-        }
-        
-        catering_names = ['קייטרינג', 'בשרים', 'סושי', 'קינוחים', 'טעמים', 'פיצה', 'עוגות', 'שפע']
-        dj_names = ['DJ', 'דיג\'יי', 'מוזיקה', 'סאונד', 'ביט']
-        photographer_names = ['צילום', 'קליק', 'עדשה', 'קאמרה', 'זיכרון']
-        designer_names = ['עיצוב', 'דקור', 'פרחים', 'סטייל', 'הפקה']
-        orchestra_names = ['תזמורת', 'להקה', 'צלילים', 'מוזיקה', 'סימפוניה']
-        surnames = ['כהן', 'לוי', 'ישראל', 'רון', 'גל', 'אור', 'שיר', 'דן', 'עמי', 'שלום', 'ברק', 'אדם', 'אריה', 'חן', 'דוד']
-        
-        for i in range(120):
-            sType = random.choice(list(supplier_types.keys()))
-            sSubtype = random.choice(supplier_types[sType])
-            
-            # Choose name based on type
-            if sType == 'Catering':
-                name = f"{random.choice(catering_names)} {random.choice(surnames)}"
-            elif sType == 'DJ':
-                name = f"{random.choice(dj_names)} {random.choice(surnames)}"
-            elif sType == 'Photographer':
-                name = f"{random.choice(photographer_names)} {random.choice(surnames)}"
-            elif sType == 'Designer':
-                name = f"{random.choice(designer_names)} {random.choice(surnames)}"
-            else:  # Orchestra
-                name = f"{random.choice(orchestra_names)} {random.choice(surnames)}"
-            
-            if random.random() > 0.6:
-                name += f" {random.choice(adjectives).strip('הה')}"
-                
-            s = Supplier(
-                name=name,
-                supplier_type=sType,
-                city=random.choice(cities),
-                price=random.randint(1000, 20000) if sType != 'Catering' else random.randint(120, 600),
-                phone=f"05{random.randint(0, 9)}-{random.randint(1000000, 9999999)}",
-                image_url=get_supplier_image(sType, sSubtype)
-            )
-            db.session.add(s)
-
-        db.session.commit()
-        print("✅ Data seeded successfully with STRICT VISUAL LOGIC!")
+            yield (name, city, f"רחוב {rng.choice(STREETS)} {rng.randint(1, 200)}", style, open_air,
+                   rng.randint(180, 800), rng.randint(50, 1200),
+                   f"0{rng.choice('3489')}-{rng.randint(1000000, 9999999)}", self.venue_image(image_style, index))
+
+    def venue_image(self, style, index):
+        return self.image(VENUE_IMAGE_CATEGORY.get(style, 'hall'), index)
+
+    def suppliers(self, count):
+        rng = self.rng('suppliers')
+        per_category = {}
+        for name, type_, subtype, city, price in CURATED_SUPPLIERS:
+            yield (name, type_, city, price, f"050-{rng.randint(1000000, 9999999)}",
+                   self.supplier_image(type_, subtype, per_category))
+
+        for _ in range(count):
+            type_ = rng.choice(list(SUPPLIER_TYPES))
+            subtype = rng.choice(SUPPLIER_TYPES[type_])
+            name = f"{rng.choice(SUPPLIER_NAMES[type_])} {rng.choice(SURNAMES)}"
+            if rng.random() > 0.6:
+                name += f" {rng.choice(ADJECTIVES)}"
+            price = rng.randint(120, 600) if type_ == 'Catering' else rng.randint(1000, 20000)
+            yield (name, type_, rng.choice(CITIES), price, f"05{rng.randint(0, 9)}-{rng.randint(1000000, 9999999)}",
+                   self.supplier_image(type_, subtype, per_category))
+
+    def supplier_image(self, type_, subtype, per_category):
+        category = SUPPLIER_IMAGE_CATEGORY.get(type_)
+        if not category:
+            return None
+        index = per_category[category] = per_category.get(category, -1) + 1
+        return self.image(category, index, FOOD_TYPES.get(subtype, 'Neutral'))
+
+    # ---- users, events, guests ----
+
+    def users(self, count, password_hash):
+        rng = self.rng('users')
+        for n in range(count):
+            created = self.now - timedelta(days=rng.randint(0, 730), seconds=rng.randint(0, 86399))
+            yield (rng.choice(FIRST_NAMES), rng.choice(SURNAMES), f'user{n}@{SEED_EMAIL_DOMAIN}',
+                   f"05{rng.randint(0, 9)}-{rng.randint(1000000, 9999999)}", password_hash,
+                   rng.random() < 0.3, created.strftime('%Y-%m-%d %H:%M:%S'))
+
+    def events(self, count, user_ids):
+        rng = self.rng('events')
+        for _ in range(count):
+            created = self.now - timedelta(days=rng.randint(0, 365), seconds=rng.randint(0, 86399))
+            date = created + timedelta(days=rng.randint(30, 540))
+            regions = ','.join(rng.sample(REGIONS, rng.randint(1, 2)))
+            yield (rng.choice(user_ids), rng.choice(EVENT_TYPES), date.strftime('%Y-%m-%d'), rng.choice(TIMES_OF_DAY),
+                   rng.choice(EVENT_VENUE_TYPES), rng.choice(EVENT_STYLES), regions,
+                   rng.choice(BUDGETS), rng.choice([50, 100, 150, 200, 300, 400, 600]), rng.choice(EVENT_STATUSES),
+                   created.strftime('%Y-%m-%d %H:%M:%S'))
+
+    def event_vendors(self, event_ids, venues, suppliers):
+        rng = self.rng('event_vendors')
+        for event_id in event_ids:
+            picks = rng.randint(*VENDORS_PER_EVENT)
+            if picks and venues:
+                vendor_id, name, price = rng.choice(venues)
+                yield (event_id, 'Venue', vendor_id, name, price)
+            for vendor_id, name, price in rng.sample(suppliers, min(len(suppliers), max(0, picks - 1))):
+                yield (event_id, 'Supplier', vendor_id, name, price)
+
+    def guests(self, count, event_ids):
+        rng = self.rng('guests')
+        for _ in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(SURNAMES)
+            created = self.now - timedelta(days=rng.randint(0, 180), seconds=rng.randint(0, 86399))
+            yield (rng.choice(event_ids), f'{first} {last}', f"05{rng.randint(0, 9)}{rng.randint(1000000, 9999999)}",
+                   f'{rng.randrange(10 ** 6)}@guest.{SEED_EMAIL_DOMAIN}' if rng.random() < 0.5 else None,
+                   rng.choice(GUEST_STATUSES), rng.choice([1, 1, 2, 2, 2, 3, 4]), created.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def remove_seed_users(conn):
+    """Delete previously generated users together with their events, vendors and guests"""
+    seed_users = f"SELECT id FROM users WHERE email LIKE '%@{SEED_EMAIL_DOMAIN}'"
+    seed_events = f'SELECT id FROM events WHERE user_id IN ({seed_users})'
+    with conn:
+        for table in ('guests', 'event_vendors', 'checklist_items'):
+            conn.execute(f'DELETE FROM {table} WHERE event_id IN ({seed_events})')
+        conn.execute(f'DELETE FROM events WHERE user_id IN ({seed_users})')
+        conn.execute(f'DELETE FROM users WHERE id IN ({seed_users})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--venues', type=int, default=120)
+    parser.add_argument('--suppliers', type=int, default=120)
+    parser.add_argument('--users', type=int, default=0)
+    parser.add_argument('--events', type=int, default=0)
+    parser.add_argument('--guests', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=50000)
+    parser.add_argument('--append', action='store_true', help='Keep the existing catalog')
+    parser.add_argument('--db', help='Database file (default: the app database)')
+    args = parser.parse_args()
+    if args.events and not args.users:
+        parser.error('--events needs --users')
+    if args.guests and not args.events:
+        parser.error('--guests needs --events')
+
+    if args.db:
+        os.environ['EASYEVENTS_DB_PATH'] = os.path.abspath(args.db)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # Importing the app creates any missing tables
+    from app import DATABASE, image_manager, password_hasher
+    from werkzeug.security import generate_password_hash
+
+    print(f"🌱 Generating data into {DATABASE} (seed {args.seed})...")
+    conn = sqlite3.connect(DATABASE)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    generator = Generator(conn, args.seed, args.batch_size, image_manager.get_image_mapping())
+
+    if not args.append:
+        with conn:
+            conn.execute('DELETE FROM venues')
+            conn.execute('DELETE FROM suppliers')
+    generator.insert(
+        '🏠 venues',
+        'INSERT INTO venues (name, city, address, style, is_open_air, price, capacity, phone, image_url) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        generator.venues(args.venues), len(CURATED_VENUES) + args.venues
+    )
+    generator.insert(
+        '🎵 suppliers',
+        'INSERT INTO suppliers (name, supplier_type, city, price, phone, image_url) VALUES (?, ?, ?, ?, ?, ?)',
+        generator.suppliers(args.suppliers), len(CURATED_SUPPLIERS) + args.suppliers
+    )
+
+    remove_seed_users(conn)
+    if args.users:
+        password_hash = generate_password_hash(SEED_PASSWORD, method=password_hasher.method)
+        generator.insert(
+            '👤 users',
+            'INSERT INTO users (first_name, last_name, email, phone, password_hash, newsletter, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            generator.users(args.users, password_hash), args.users
+        )
+    if args.events:
+        user_ids = [row[0] for row in conn.execute(
+            f"SELECT id FROM users WHERE email LIKE '%@{SEED_EMAIL_DOMAIN}' ORDER BY id")]
+        generator.insert(
+            '📅 events',
+            'INSERT INTO events (user_id, event_type, date, time_of_day, venue_type, style, region, budget, '
+            'guests, status, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            generator.events(args.events, user_ids), args.events
+        )
+        event_ids = [row[0] for row in conn.execute(
+            f"SELECT e.id FROM events e JOIN users u ON u.id = e.user_id "
+            f"WHERE u.email LIKE '%@{SEED_EMAIL_DOMAIN}' ORDER BY e.id")]
+        venues = conn.execute('SELECT id, name, price FROM venues ORDER BY id').fetchall()
+        suppliers = conn.execute('SELECT id, name, price FROM suppliers ORDER BY id').fetchall()
+        generator.insert(
+            '🛒 event vendors',
+            'INSERT OR IGNORE INTO event_vendors (event_id, vendor_type, vendor_id, vendor_name, vendor_price) '
+            'VALUES (?, ?, ?, ?, ?)',
+            generator.event_vendors(event_ids, venues, suppliers), args.events * 2
+        )
+    if args.guests:
+        generator.insert(
+            '🎉 guests',
+            'INSERT INTO guests (event_id, name, phone, email, status, invites_count, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            generator.guests(args.guests, event_ids), args.guests
+        )
+
+    conn.execute('ANALYZE')  # Fresh statistics for the query planner
+    conn.close()
+    print("✅ Data generated successfully!")
+
 
 if __name__ == '__main__':
-    seed_data()
+    main()
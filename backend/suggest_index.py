@@ -0,0 +1,243 @@
+"""
+Suggest Index for EasyVents
+Per-keystroke typeahead over cities, vendor names and categories, answered from memory
+"""
+
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from vendor_search import normalize
+
+KINDS = ('city', 'venue', 'supplier', 'category')
+
+# Terms each catalog row contributes: (kind, column)
+ROW_TERMS = {
+    'venues': (('venue', 'name'), ('city', 'city')),
+    'suppliers': (('supplier', 'name'), ('city', 'city'), ('category', 'supplier_type')),
+}
+
+# More changes than this since the last refresh: reload everything instead
+FULL_REBUILD_CHANGES = 20000
+
+# Answers kept per index generation, so popular short prefixes are not re-ranked
+ANSWER_CACHE_SIZE = 2000
+
+LOOKUP_CHUNK = 500  # Stay well below SQLite's bound-parameter limit
+
+Term = Tuple[str, str]  # (kind, text)
+
+
+class SuggestIndex:
+    """
+    Sorted array of (search key, kind, text, word position), searched by prefix with bisect
+
+    Every term is filed under each of its word starts, so 'גן' finds 'רמת גן'
+    as well as 'גן הדקל'. Terms are counted, so rows can be added and removed
+    one at a time and a term disappears with the last row using it.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, str, str, int]] = []
+        self.counts: Dict[Term, int] = {}
+        self._answers: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def _term_keys(term: Term) -> List[Tuple[str, str, str, int]]:
+        words = normalize(term[1]).split()
+        return [(' '.join(words[i:]), term[0], term[1], i) for i in range(len(words))]
+
+    def load(self, terms: Dict[Term, int]) -> None:
+        """Replace the contents with counted terms in one go"""
+        self.counts = dict(terms)
+        self._keys = sorted(key for term in self.counts for key in self._term_keys(term))
+        self._answers.clear()
+
+    def add(self, term: Term) -> None:
+        count = self.counts.get(term, 0)
+        self.counts[term] = count + 1
+        if not count:
+            for key in self._term_keys(term):
+                insort(self._keys, key)
+            self._answers.clear()
+
+    def remove(self, term: Term) -> None:
+        count = self.counts.get(term, 0)
+        if count > 1:
+            self.counts[term] = count - 1
+            return
+        self.counts.pop(term, None)
+        for key in self._term_keys(term):
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+        self._answers.clear()
+
+    def prefix(self, query: str, kind: Optional[str] = None, limit: int = 8) -> List[Dict]:
+        """
+        Terms with a word starting with the query, most used first
+
+        Counts only order the answers; they change without clearing the
+        answer cache, so a cached answer's order may lag slightly behind.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        cache_key = (prefix, kind, limit)
+        answer = self._answers.get(cache_key)
+        if answer is not None:
+            self._answers.move_to_end(cache_key)
+            return answer
+
+        matches = {}
+        position = bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+            _, term_kind, text, word = self._keys[position]
+            if kind is None or term_kind == kind:
+                # A term whose first word matches beats a match on a later word
+                matches[(term_kind, text)] = min(word, matches.get((term_kind, text), word))
+            position += 1
+
+        ranked = sorted(matches.items(), key=lambda item: (item[1] > 0, -self.counts[item[0]], len(item[0][1])))
+        answer = [{'text': text, 'kind': term_kind, 'count': self.counts[(term_kind, text)]}
+                  for (term_kind, text), _ in ranked[:limit]]
+        self._answers[cache_key] = answer
+        while len(self._answers) > ANSWER_CACHE_SIZE:
+            self._answers.popitem(last=False)
+        return answer
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+class CatalogSuggestions:
+    """
+    Keeps a SuggestIndex in step with the catalog
+
+    Triggers log every changed venue / supplier id in catalog_changes (see
+    init_catalog_meta in app.py). A refresh re-reads only the rows logged
+    since the previous one and swaps their old terms for the new ones; a
+    full reload happens on first use, after a bulk change, or when the log
+    entries this process needed have already been pruned (at app startup and
+    by the hourly prune_catalog_changes job).
+    """
+
+    def __init__(self, connect: Callable):
+        """
+        Args:
+            connect: Returns a new sqlite3 connection to the app database
+        """
+        self.connect = connect
+        self.index = SuggestIndex()
+        self.version = None
+        self.change_id = None
+        self._rows: Dict[Tuple[str, int], Tuple[Term, ...]] = {}
+        self._lock = threading.RLock()
+        self._refreshing = threading.Lock()
+        self.full_builds = 0
+        self.incremental_updates = 0
+
+    def suggest(self, query: str, version: int, kind: Optional[str] = None, limit: int = 8) -> List[Dict]:
+        """Suggestions for a prefix, from an index brought up to the given catalog version first"""
+        if version != self.version:
+            self.refresh(version)
+        with self._lock:
+            return self.index.prefix(query, kind, limit)
+
+    def refresh(self, version: int) -> None:
+        # Only one refresh at a time; the others answer from the index as it is
+        if not self._refreshing.acquire(blocking=self.version is None):
+            return
+        try:
+            if version == self.version:
+                return
+            conn = self.connect()
+            try:
+                conn.execute('BEGIN')  # One snapshot for the log and the rows
+                first_id, last_id = conn.execute('SELECT MIN(id), MAX(id) FROM catalog_changes').fetchone()
+                last_id = last_id or 0
+                pruned = first_id is not None and self.change_id is not None and first_id > self.change_id + 1
+                if self.change_id is None or pruned or last_id - self.change_id > FULL_REBUILD_CHANGES:
+                    self._load_all(conn)
+                elif last_id > self.change_id:
+                    self._apply_changes(conn, self.change_id, last_id)
+                conn.rollback()
+            finally:
+                conn.close()
+            self.change_id = last_id
+            self.version = version
+        finally:
+            self._refreshing.release()
+
+    def _load_all(self, conn) -> None:
+        rows = {}
+        counts: Dict[Term, int] = {}
+        for table in ROW_TERMS:
+            for row in self._read(conn, table):
+                terms = rows[(table, row[0])] = self._terms(table, row)
+                for term in terms:
+                    counts[term] = counts.get(term, 0) + 1
+        with self._lock:
+            self._rows = rows
+            self.index.load(counts)
+        self.full_builds += 1
+
+    def _apply_changes(self, conn, after_id: int, last_id: int) -> None:
+        changed = conn.execute(
+            'SELECT DISTINCT table_name, row_id FROM catalog_changes WHERE id > ? AND id <= ?', (after_id, last_id)
+        ).fetchall()
+        current = {}
+        for table in ROW_TERMS:
+            ids = [row_id for name, row_id in changed if name == table]
+            for start in range(0, len(ids), LOOKUP_CHUNK):
+                for row in self._read(conn, table, ids[start:start + LOOKUP_CHUNK]):
+                    current[(table, row[0])] = self._terms(table, row)
+        with self._lock:
+            for key in changed:
+                key = tuple(key)
+                for term in self._rows.pop(key, ()):
+                    self.index.remove(term)
+                if key in current:
+                    self._rows[key] = current[key]
+                    for term in current[key]:
+                        self.index.add(term)
+        self.incremental_updates += 1
+
+    @staticmethod
+    def _read(conn, table: str, ids: Optional[List[int]] = None):
+        columns = ', '.join(column for _, column in ROW_TERMS[table])
+        sql = f'SELECT id, {columns} FROM {table}'
+        if ids is None:
+            return conn.execute(sql)
+        return conn.execute(f'{sql} WHERE id IN ({",".join("?" * len(ids))})', ids)
+
+    @staticmethod
+    def _terms(table: str, row) -> Tuple[Term, ...]:
+        return tuple((kind, row[i + 1].strip()) for i, (kind, _) in enumerate(ROW_TERMS[table])
+                     if row[i + 1] and row[i + 1].strip())
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'version': self.version,
+                'terms': len(self.index),
+                'full_builds': self.full_builds,
+                'incremental_updates': self.incremental_updates,
+            }
+
+
+# Global instance (initialized in app.py)
+suggestions: Optional[CatalogSuggestions] = None
+
+
+def init_suggestions(connect: Callable) -> CatalogSuggestions:
+    """
+    Initialize global catalog suggestions
+
+    Args:
+        connect: Returns a new sqlite3 connection to the app database
+    """
+    global suggestions
+    suggestions = CatalogSuggestions(connect)
+    return suggestions
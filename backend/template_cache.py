@@ -0,0 +1,93 @@
+"""
+Template Cache for EasyVents
+Keeps compiled Jinja templates on disk so fresh workers load them instead of compiling
+"""
+
+import os
+from typing import Dict, List, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache
+from jinja2.bccache import Bucket
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """
+    Jinja bytecode cache in a directory filled at build time
+
+    Jinja checks each entry against the template source, so an entry left
+    over from an older build is simply recompiled. A read-only directory
+    (e.g. a locked-down container) still serves what the build put there;
+    failing to write a new entry only costs that worker a compile.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Where compiled templates are stored
+        """
+        super().__init__(directory, pattern='%s.jinja')
+        self.hits = 0
+        self.misses = 0
+        self.write_errors = 0
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            if not self.write_errors:
+                print(f"⚠️ Cannot write template cache to {self.directory}: {e}")
+            self.write_errors += 1
+
+    def stats(self) -> Dict:
+        return {
+            'directory': self.directory,
+            'hits': self.hits,
+            'misses': self.misses,
+            'write_errors': self.write_errors,
+        }
+
+
+def compile_templates(env: Environment) -> List[str]:
+    """
+    Load every template of env, filling its bytecode cache
+
+    Returns:
+        Names of the templates loaded
+    """
+    names = env.list_templates()
+    for name in names:
+        env.get_template(name)
+    return names
+
+
+# Global instance (initialized in app.py)
+template_cache: Optional[TemplateBytecodeCache] = None
+
+
+def init_template_cache(env: Environment, directory: str) -> Optional[TemplateBytecodeCache]:
+    """
+    Initialize global template cache and attach it to env
+
+    Args:
+        env: Jinja environment (app.jinja_env)
+        directory: Cache directory, created if missing
+
+    Returns:
+        The cache, or None when the directory cannot be used
+    """
+    global template_cache
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        print(f"⚠️ Template cache disabled, cannot create {directory}: {e}")
+        return None
+    template_cache = TemplateBytecodeCache(directory)
+    env.bytecode_cache = template_cache
+    return template_cache
@@ -0,0 +1,256 @@
+"""
+Vendor Search for EasyVents
+Typo-tolerant Hebrew/English search over vendor names and types, from an in-memory n-gram index
+"""
+
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Hebrew final forms are written differently but are the same letter
+FINAL_LETTERS = str.maketrans('ךםןףץ', 'כמנפצ')
+
+# Geresh, gershayim and their ASCII stand-ins: ג'יי / ג׳יי / גיי are one spelling
+GERESH = re.compile('[׳״\'"`‘’“”]')
+
+# Full spelling adds ו/י that defective spelling leaves out (תזמורת / תיזמורת,
+# קייטרינג / קיטרנג), so they are dropped after a word's first letter
+MATRES_LECTIONIS = re.compile('(?<=[א-ת])[וי]')
+
+NON_WORD = re.compile(r'[^\w]+')
+
+# Loanwords written in either script, searched as one spelling
+SPELLING_VARIANTS = {
+    "די ג'יי": 'dj',
+    "די ג'י": 'dj',
+    "דיג'יי": 'dj',
+    "דיג'י": 'dj',
+    'מייק אפ': 'makeup',
+    'מייקאפ': 'makeup',
+    'make up': 'makeup',
+}
+
+# Query words matching a vendor word at least this closely count as a match
+MIN_SIMILARITY = 0.45
+
+# A query word that is the start of a longer word (the user is still typing)
+PREFIX_SIMILARITY = 0.9
+
+# Key of a vendor in the catalog: (vendor type, id)
+VendorKey = Tuple[str, int]
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    text = GERESH.sub('', text.lower().replace('־', ' ')).translate(FINAL_LETTERS)  # Maqaf joins words
+    return ' '.join(NON_WORD.sub(' ', text).replace('_', ' ').split())
+
+
+_VARIANTS = [(f' {_fold(variant)} ', f' {spelling} ') for variant, spelling in SPELLING_VARIANTS.items()]
+
+
+def normalize(text: str) -> str:
+    """
+    Search form of a name: lowercase, no niqqud or accents, no final letters,
+    geresh or inner ו/י, one space between words, and loanwords in one spelling
+    """
+    if not text:
+        return ''
+    text = f' {_fold(text)} '
+    for variant, spelling in _VARIANTS:
+        text = text.replace(variant, spelling)
+    return MATRES_LECTIONIS.sub('', text).strip()
+
+
+def ngrams(word: str, n: int = 3) -> frozenset:
+    """Character n-grams of a word padded with a space on each side"""
+    padded = f' {word} '
+    return frozenset(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+
+
+class _Entry:
+    """Vendors sharing a name and category, suggested and ranked as one"""
+
+    __slots__ = ('name', 'vendor_type', 'category', 'words', 'vendors')
+
+    def __init__(self, name: str, vendor_type: str, category: str, words: Tuple[int, ...]):
+        self.name = name
+        self.vendor_type = vendor_type
+        self.category = category
+        self.words = words
+        self.vendors: List[VendorKey] = []
+
+
+class VendorSearchIndex:
+    """
+    Immutable n-gram index over one catalog version
+
+    Vendor names come from a small vocabulary, so the n-grams index the
+    distinct words rather than the vendors: a query word is matched against
+    the vocabulary, and the vendors containing the matched words are ranked
+    by how closely every query word matched.
+    """
+
+    def __init__(self, rows: Iterable[Sequence], version: Optional[int] = None):
+        """
+        Args:
+            rows: (vendor type, id, name, category) for every vendor
+            version: Catalog version the rows were read at
+        """
+        self.version = version
+        self.entries: List[_Entry] = []
+        self.vendor_count = 0
+        self.words: List[str] = []
+        word_ids: Dict[str, int] = {}
+        entry_ids: Dict[Tuple[str, str, str], int] = {}
+        self._word_entries: List[List[int]] = []
+
+        for vendor_type, vendor_id, name, category in rows:
+            key = (vendor_type, name, category or '')
+            entry_id = entry_ids.get(key)
+            if entry_id is None:
+                words = []
+                for word in normalize(f'{name} {category or ""}').split():
+                    if word not in word_ids:
+                        word_ids[word] = len(self.words)
+                        self.words.append(word)
+                        self._word_entries.append([])
+                    if word_ids[word] not in words:
+                        words.append(word_ids[word])
+                entry_id = entry_ids[key] = len(self.entries)
+                self.entries.append(_Entry(name, vendor_type, category or '', tuple(words)))
+                for word_id in words:
+                    self._word_entries[word_id].append(entry_id)
+            self.entries[entry_id].vendors.append((vendor_type, vendor_id))
+            self.vendor_count += 1
+
+        self._gram_sizes = [len(ngrams(word)) for word in self.words]
+        self._gram_words: Dict[str, List[int]] = defaultdict(list)
+        for word_id, word in enumerate(self.words):
+            for gram in ngrams(word):
+                self._gram_words[gram].append(word_id)
+        self._sorted_words = sorted((word, word_id) for word_id, word in enumerate(self.words))
+
+    def similar_words(self, word: str) -> Dict[int, float]:
+        """Vocabulary words close to a query word, with their similarity (0-1]"""
+        matches: Dict[int, float] = {}
+        position = bisect_left(self._sorted_words, (word, -1))
+        while position < len(self._sorted_words) and self._sorted_words[position][0].startswith(word):
+            candidate, word_id = self._sorted_words[position]
+            matches[word_id] = 1.0 if candidate == word else PREFIX_SIMILARITY
+            position += 1
+        if len(word) < 2:
+            return matches
+
+        grams = ngrams(word)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for word_id in self._gram_words.get(gram, ()):
+                shared[word_id] += 1
+        for word_id, count in shared.items():
+            similarity = 2 * count / (len(grams) + self._gram_sizes[word_id])  # Dice coefficient
+            if similarity >= MIN_SIMILARITY and similarity > matches.get(word_id, 0):
+                matches[word_id] = similarity
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = 10) -> List[Tuple[float, _Entry]]:
+        """
+        Entries matching every word of the query, best first
+
+        Returns:
+            (score, entry) pairs; score is the mean similarity of the query words
+        """
+        words = normalize(query).split()
+        if not words:
+            return []
+        scores: Optional[Dict[int, float]] = None
+        for word in words:
+            best: Dict[int, float] = {}
+            for word_id, similarity in self.similar_words(word).items():
+                for entry_id in self._word_entries[word_id]:
+                    if similarity > best.get(entry_id, 0):
+                        best[entry_id] = similarity
+            if scores is None:
+                scores = best
+            else:
+                scores = {entry_id: score + best[entry_id] for entry_id, score in scores.items() if entry_id in best}
+            if not scores:
+                return []
+
+        def rank(item):
+            entry_id, score = item
+            entry = self.entries[entry_id]
+            return (score, len(entry.vendors), -len(entry.name))
+
+        ranked = scores.items()
+        ranked = heapq.nlargest(limit, ranked, key=rank) if limit else sorted(ranked, key=rank, reverse=True)
+        return [(round(score / len(words), 3), self.entries[entry_id]) for entry_id, score in ranked]
+
+    def match_vendors(self, query: str) -> Dict[VendorKey, float]:
+        """Score of every vendor matching the query"""
+        return {vendor: score for score, entry in self.search(query, limit=None) for vendor in entry.vendors}
+
+
+class VendorSearch:
+    """
+    Holds the index for the current catalog version
+
+    A stale index is rebuilt by the first request that notices; requests
+    arriving meanwhile keep using the previous index instead of waiting.
+    """
+
+    def __init__(self, load_rows: Callable[[], Iterable[Sequence]]):
+        """
+        Args:
+            load_rows: Reads (vendor type, id, name, category) for the whole catalog
+        """
+        self.load_rows = load_rows
+        self._index: Optional[VendorSearchIndex] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def index(self, version: int) -> VendorSearchIndex:
+        """Index of the given catalog version, or the previous one while it is being built"""
+        current = self._index
+        if current is not None and current.version == version:
+            return current
+        if not self._lock.acquire(blocking=current is None):
+            return current
+        try:
+            if self._index is None or self._index.version != version:
+                self._index = VendorSearchIndex(self.load_rows(), version)
+                self.builds += 1
+            return self._index
+        finally:
+            self._lock.release()
+
+    def stats(self) -> Dict:
+        index = self._index
+        return {
+            'version': index.version if index else None,
+            'vendors': index.vendor_count if index else 0,
+            'entries': len(index.entries) if index else 0,
+            'words': len(index.words) if index else 0,
+            'builds': self.builds,
+        }
+
+
+# Global instance (initialized in app.py)
+vendor_search: Optional[VendorSearch] = None
+
+
+def init_vendor_search(load_rows: Callable[[], Iterable[Sequence]]) -> VendorSearch:
+    """
+    Initialize global vendor search
+
+    Args:
+        load_rows: Reads (vendor type, id, name, category) for the whole catalog
+    """
+    global vendor_search
+    vendor_search = VendorSearch(load_rows)
+    return vendor_search
@@ -0,0 +1,39 @@
+"""
+EasyVents - Template Warmup
+Compiles every template into the Jinja bytecode cache, as a build step
+
+    python backend/warm_templates.py
+    JINJA_CACHE_DIR=/var/cache/easyevents python backend/warm_templates.py
+
+Run it where the app will run (same path, same Python version): cache entries
+are keyed on the template's file path and only valid for the interpreter that
+wrote them. Workers started afterwards load templates from the cache instead
+of compiling them on their first requests.
+"""
+
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as scratch:
+        # Importing the app sets up a database; keep it out of the build
+        os.environ['EASYEVENTS_DB_PATH'] = os.path.join(scratch, 'warmup.db')
+        with contextlib.redirect_stdout(sys.stderr):
+            from app import app, template_cache
+            from template_cache import compile_templates
+
+        if template_cache is None:
+            sys.exit('Template cache directory is not usable, nothing to warm')
+        started = time.perf_counter()
+        names = compile_templates(app.jinja_env)
+        elapsed = time.perf_counter() - started
+    print(f"Compiled {len(names)} templates into {template_cache.directory} in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+EasyEvents API Concurrency Benchmark
+Compares gunicorn worker modes (sync / gthread / asgi) under many polling clients
+
+Each client keeps one HTTP/1.1 keep-alive connection open and polls the JSON
+API like an open dashboard tab would. Results are printed and written as JSON.
+
+Usage:
+    python benchmarks/api_concurrency.py --modes sync gthread asgi --clients 200 --duration 15
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+from bench_utils import percentile, start_gunicorn
+
+POLL_PATHS = ['/api/current_user', '/api/cart', '/api/images/hall?count=3']
+
+
+def start_server(mode, port, workers):
+    """Start gunicorn from backend/ in the given worker mode"""
+    return start_gunicorn(dict(os.environ, WORKER_CLASS=mode), port, workers)
+
+
+def poll_client(port, stop_at, interval, latencies, errors, lock):
+    """One open tab: a keep-alive connection polling the API until stop_at"""
+    conn = http.client.HTTPConnection('localhost', port, timeout=30)
+    i = 0
+    while time.time() < stop_at:
+        path = POLL_PATHS[i % len(POLL_PATHS)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            ok = False
+            conn.close()
+            conn = http.client.HTTPConnection('localhost', port, timeout=30)
+        elapsed = time.perf_counter() - started
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors[0] += 1
+        if interval:
+            time.sleep(interval)
+    conn.close()
+
+
+def run_mode(mode, args):
+    process = start_server(mode, args.port, args.workers)
+    try:
+        latencies, errors, lock = [], [0], threading.Lock()
+        stop_at = time.time() + args.duration
+        clients = [
+            threading.Thread(target=poll_client, args=(args.port, stop_at, args.interval, latencies, errors, lock))
+            for _ in range(args.clients)
+        ]
+        started = time.time()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        elapsed = time.time() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        'mode': mode,
+        'clients': args.clients,
+        'workers': args.workers,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=['sync', 'gthread', 'asgi'])
+    parser.add_argument('--clients', type=int, default=100, help='Concurrent keep-alive connections')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per mode')
+    parser.add_argument('--interval', type=float, default=0.5, help='Seconds between polls per client')
+    parser.add_argument('--workers', type=int, default=1, help='Gunicorn worker processes')
+    parser.add_argument('--port', type=int, default=5077)
+    parser.add_argument('--output', default='api_concurrency.json')
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes:
+        print(f'[BENCH] {mode}: {args.clients} clients for {args.duration}s...')
+        result = run_mode(mode, args)
+        print(f"         {result['rps']} req/s, p50 {result['p50_ms']} ms, "
+              f"p95 {result['p95_ms']} ms, errors {result['errors']}")
+        results.append(result)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+    print(f'[SAVED] {args.output}')
+
+
+if __name__ == '__main__':
+    main()
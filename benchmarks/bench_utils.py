@@ -0,0 +1,39 @@
+"""
+EasyEvents Benchmark Helpers
+Shared by the load benchmarks: starting a local gunicorn and summarizing latencies
+"""
+
+import http.client
+import os
+import subprocess
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(PROJECT_ROOT, 'backend')
+
+
+def start_gunicorn(env, port, workers):
+    """Start gunicorn from backend/ (settings from gunicorn.conf.py and env) and wait until it answers"""
+    env = dict(env, PORT=str(port), WEB_CONCURRENCY=str(workers))
+    process = subprocess.Popen(['gunicorn'], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('localhost', port, timeout=2)
+            conn.request('GET', '/api/current_user')
+            conn.getresponse().read()
+            conn.close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"gunicorn ({env.get('WORKER_CLASS', 'default workers')}) did not start")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile, or None without values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
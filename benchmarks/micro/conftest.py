@@ -0,0 +1,49 @@
+"""
+EasyEvents Microbenchmark Configuration
+Points the app at a throwaway database before it is imported and seeds synthetic catalogs
+
+Run through benchmarks/micro/run.py, which compares the results with the
+stored baseline.
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+MICRO_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(MICRO_DIR))
+
+_tmp = tempfile.mkdtemp(prefix='easyevents-micro-')
+atexit.register(shutil.rmtree, _tmp, ignore_errors=True)
+os.environ['EASYEVENTS_DB_PATH'] = os.path.join(_tmp, 'micro.db')
+
+for path in ('backend', 'benchmarks', 'scripts'):
+    sys.path.insert(0, os.path.join(PROJECT_ROOT, path))
+
+import app as easyevents  # noqa: E402  (must see EASYEVENTS_DB_PATH)
+from user_journeys import seed_catalog  # noqa: E402
+
+# Total catalog rows; a fifth of them venues, the rest suppliers
+CATALOG_SIZES = [int(size) for size in os.environ.get('CATALOG_SIZES', '1000,10000,100000').split(',')]
+
+
+@pytest.fixture(scope='session')
+def flask_app():
+    return easyevents.app
+
+
+@pytest.fixture(scope='module', params=CATALOG_SIZES, ids=lambda size: f'{size}rows')
+def catalog(request):
+    """Replace the catalog with `size` synthetic rows"""
+    size = request.param
+    conn = easyevents.get_db_connection()
+    conn.execute('DELETE FROM venues')
+    conn.execute('DELETE FROM suppliers')
+    conn.commit()
+    conn.close()
+    seed_catalog(os.environ['EASYEVENTS_DB_PATH'], size // 5, size - size // 5, seed=size)
+    return size
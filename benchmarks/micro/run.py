@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+EasyEvents Microbenchmark Runner
+Runs the pytest-benchmark suite and fails when a benchmark is slower than the stored baseline
+
+Each benchmark's fastest round is compared with benchmarks/micro/baseline.json;
+the minimum is far less sensitive to scheduler noise than the median. A
+minimum more than --threshold above the baseline is a regression and the run
+exits with status 1. Baselines only compare on the same machine, so record
+one with --save on the machine that runs the check (e.g. the CI runner).
+
+Usage:
+    python benchmarks/micro/run.py                  # compare against the baseline
+    python benchmarks/micro/run.py --save           # record a new baseline
+    python benchmarks/micro/run.py --threshold 0.1 -k grouped_results
+    CATALOG_SIZES=1000,10000 python benchmarks/micro/run.py
+
+Requires: pip install -r requirements-dev.txt (pytest-benchmark)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+MICRO_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(MICRO_DIR))
+BASELINE_PATH = os.path.join(MICRO_DIR, 'baseline.json')
+
+
+def run_suite(extra_args):
+    """Run the benchmarks; returns {benchmark name: fastest round in seconds} and machine info"""
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, 'report.json')
+        command = [
+            sys.executable, '-m', 'pytest', MICRO_DIR,
+            '-o', 'addopts=',  # Skip the UI suite's HTML report options from pytest.ini
+            '-p', 'no:cacheprovider',
+            '-q', '--benchmark-only', '--benchmark-columns=min,median,iqr,rounds',
+            f'--benchmark-json={report_path}',
+        ] + extra_args
+        status = subprocess.call(command, cwd=PROJECT_ROOT)
+        if status != 0:
+            sys.exit(status)
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+
+    minimums = {bench['fullname'].split('::', 1)[1]: bench['stats']['min'] for bench in report['benchmarks']}
+    machine = {key: report['machine_info'].get(key) for key in ('node', 'processor', 'python_version')}
+    machine['cpu'] = report['machine_info'].get('cpu', {}).get('brand_raw')
+    return minimums, machine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--save', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown, as a fraction (default 0.25 = 25%%)')
+    parser.add_argument('-k', help='Only run benchmarks matching this pytest expression')
+    args = parser.parse_args()
+
+    minimums, machine = run_suite(['-k', args.k] if args.k else [])
+
+    if args.save:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'machine': machine, 'minimums': minimums}, f, indent=2, sort_keys=True)
+        print(f'[SAVED] baseline with {len(minimums)} benchmarks -> {BASELINE_PATH}')
+        return
+
+    if not os.path.exists(BASELINE_PATH):
+        print('[WARN] No baseline yet; record one with --save')
+        return
+    with open(BASELINE_PATH, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline['machine'] != machine:
+        print(f"[WARN] Baseline was recorded on {baseline['machine']}, this is {machine}")
+
+    regressions = []
+    print(f"\n{'benchmark':<56} {'baseline':>12} {'now':>12} {'change':>8}")
+    for name, fastest in sorted(minimums.items()):
+        before = baseline['minimums'].get(name)
+        if before is None:
+            print(f'{name:<56} {"-":>12} {fastest * 1000:>10.3f}ms {"new":>8}')
+            continue
+        change = fastest / before - 1
+        flag = '  REGRESSION' if change > args.threshold else ''
+        print(f'{name:<56} {before * 1000:>10.3f}ms {fastest * 1000:>10.3f}ms {change:>+7.1%}{flag}')
+        if flag:
+            regressions.append(name)
+
+    if regressions:
+        print(f'\n[FAIL] {len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}')
+        sys.exit(1)
+    print(f'\n[OK] No benchmark slower than the baseline by more than {args.threshold:.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Microbenchmarks for the app's hot functions
+"""
+
+import os
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import app as easyevents
+
+RESULTS_QUERY = '/results?event_type=wedding&region=center&region=sharon&guests=200&budget=high'
+
+
+def test_get_grouped_results(benchmark, flask_app, catalog):
+    def run():
+        with flask_app.test_request_context(RESULTS_QUERY):
+            return easyevents.get_grouped_results()
+
+    # The 100k-row catalog takes seconds per call; a few rounds are enough
+    rounds = max(3, 300000 // catalog)
+    grouped = benchmark.pedantic(run, rounds=rounds, warmup_rounds=1)
+    assert any(grouped.values())
+
+
+def test_get_grouped_results_unfiltered(benchmark, flask_app, catalog):
+    def run():
+        with flask_app.test_request_context('/results'):
+            return easyevents.get_grouped_results()
+
+    rounds = max(3, 300000 // catalog)
+    benchmark.pedantic(run, rounds=rounds, warmup_rounds=1)
+
+
+def test_image_manager_get_images(benchmark):
+    images = benchmark(easyevents.image_manager.get_images, 'hall', None, 6)
+    assert images
+
+
+def test_image_manager_get_food_images(benchmark):
+    benchmark(easyevents.image_manager.get_images, 'food', 'Meat', 6)
+
+
+def test_image_manager_get_image_mapping(benchmark):
+    benchmark(easyevents.image_manager.get_image_mapping)
+
+
+def test_get_local_venue_image(benchmark):
+    venues = [SimpleNamespace(id=i, style=style, name=name) for i, (style, name) in enumerate([
+        ('Luxury', 'אולם פאר'), ('Pool villa', 'וילה עם בריכה'), ('Boho', 'גן אירועים'), (None, None)
+    ], start=1)]
+
+    def run():
+        return [easyevents.get_local_venue_image(venue) for venue in venues]
+
+    assert all(benchmark(run))
+
+
+def test_parse_guest_lines(benchmark):
+    rng = random.Random(7)
+    lines = [f'אורח {i} - 05{rng.randrange(10 ** 8):08d} - {rng.randint(1, 5)}' if i % 3 else f'אורח {i} - 2'
+             for i in range(1000)]
+
+    def run():
+        return [easyevents.parse_guest_line(line) for line in lines]
+
+    assert len(benchmark(run)) == 1000
+
+
+def test_remove_white_background(benchmark, tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    from image_utils import remove_white_background
+
+    source = tmp_path / 'source.png'
+    image = Image.new('RGB', (256, 256), (255, 255, 255))
+    for x in range(64, 192):
+        for y in range(64, 192):
+            image.putpixel((x, y), (200, 30, 60))
+    image.save(source)
+    output = str(tmp_path / 'output.png')
+
+    benchmark.pedantic(remove_white_background, args=(str(source), output), rounds=5, warmup_rounds=1)
+    assert os.path.exists(output)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+EasyEvents User Journey Load Benchmark
+Drives the main planning flow with concurrent virtual users and reports latency per step
+
+Every virtual user registers and logs in once (not timed), then repeats the journey:
+
+    plan -> create_event -> results -> cart add (xN) -> save_cart_to_event
+         -> cart clear -> manage event -> batch add guests -> list guests
+
+The app runs against a fresh, seeded database in a temporary directory, either
+in this process (Flask test client, one per virtual user) or in a local
+gunicorn started from backend/ (keep-alive HTTP connections). Results are
+printed and written as JSON, including the commit they were measured on.
+
+Usage:
+    python benchmarks/user_journeys.py --target inprocess --users 8 --duration 20
+    python benchmarks/user_journeys.py --target gunicorn --users 32 --workers 4 --venues 5000 --suppliers 20000
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from bench_utils import BACKEND_DIR, PROJECT_ROOT, percentile, start_gunicorn
+
+EVENT_TYPES = ['wedding', 'bar-mitzvah', 'brit', 'engagement', 'party', 'business', 'birthday']
+REGIONS = ['north', 'sharon', 'center', 'jerusalem', 'south']
+BUDGETS = ['low', 'medium', 'high', 'premium', 'luxury']
+GUEST_COUNTS = [50, 100, 150, 200, 300, 400]
+
+CITIES = ['חיפה', 'נתניה', 'הרצליה', 'כפר סבא', 'תל אביב', 'רמת גן', 'פתח תקווה', 'ירושלים', 'באר שבע', 'אשדוד']
+VENUE_STYLES = ['מודרני', 'קלאסי', 'כפרי', 'יוקרתי', 'בוהו', 'וינטג']
+VENUE_KINDS = ['אולם', 'גן אירועים', 'מלון', 'מסעדה']
+SUPPLIER_TYPES = ['צילום', 'תקליטן', 'קייטרינג', 'תזמורת', 'עיצוב']
+
+
+# ---- dataset ----
+
+def seed_catalog(db_path, venues, suppliers, seed):
+    """Bulk insert a synthetic catalog; returns the venue and supplier ids"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            'INSERT INTO venues (name, city, address, style, is_open_air, price, phone, capacity) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            ((f'{rng.choice(VENUE_KINDS)} {i}', rng.choice(CITIES), f'רחוב הבדיקה {i}', rng.choice(VENUE_STYLES),
+              rng.random() < 0.4, rng.randrange(8000, 60000, 500), '03-0000000', rng.randrange(80, 800, 10))
+             for i in range(venues))
+        )
+        conn.executemany(
+            'INSERT INTO suppliers (name, supplier_type, phone, city, price) VALUES (?, ?, ?, ?, ?)',
+            ((f'ספק {i}', rng.choice(SUPPLIER_TYPES), '050-0000000', rng.choice(CITIES),
+              rng.randrange(1000, 30000, 250))
+             for i in range(suppliers))
+        )
+    venue_ids = [row[0] for row in conn.execute('SELECT id FROM venues')]
+    supplier_ids = [row[0] for row in conn.execute('SELECT id FROM suppliers')]
+    conn.close()
+    return venue_ids, supplier_ids
+
+
+# ---- clients ----
+
+class InProcessClient:
+    """One virtual user talking to the app through Flask's test client"""
+
+    def __init__(self, flask_app):
+        self.client = flask_app.test_client()
+
+    def request(self, method, path, json_body=None, form=None, headers=None):
+        response = self.client.open(path, method=method, json=json_body, data=form, headers=headers)
+        body = response.get_data()
+        response.close()
+        return response.status_code, body
+
+
+class HTTPClient:
+    """One virtual user with a keep-alive connection and its own cookies"""
+
+    def __init__(self, port):
+        self.port = port
+        self.conn = http.client.HTTPConnection('localhost', port, timeout=60)
+        self.cookies = {}
+
+    def request(self, method, path, json_body=None, form=None, headers=None):
+        headers = dict(headers or {})
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        elif form is not None:
+            body = urlencode(form, doseq=True).encode('utf-8')
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = http.client.HTTPConnection('localhost', self.port, timeout=60)
+            raise
+
+        for header in response.headers.get_all('Set-Cookie') or []:
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies[name] = morsel.value
+        return response.status, data
+
+
+# ---- journey ----
+
+class Recorder:
+    """Latencies and errors per journey step, shared by all virtual users"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.journeys = 0
+        self.lock = threading.Lock()
+
+    def call(self, step, client, method, path, expect=(200,), **kwargs):
+        started = time.perf_counter()
+        try:
+            status, body = client.request(method, path, **kwargs)
+        except (OSError, http.client.HTTPException):
+            status, body = None, b''
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            if status in expect:
+                self.latencies.setdefault(step, []).append(elapsed)
+            else:
+                self.errors[step] = self.errors.get(step, 0) + 1
+        return status, body
+
+
+def sign_up(client, user_index, run_id):
+    """Register and log in a fresh user (setup, not timed)"""
+    email = f'bench_{run_id}_{user_index}@example.com'
+    password = 'Benchmark123'
+    client.request('POST', '/api/register', json_body={
+        'firstName': 'Bench', 'lastName': f'User{user_index}', 'email': email, 'password': password
+    })
+    status, _ = client.request('POST', '/api/login', json_body={'email': email, 'password': password})
+    if status != 200:
+        raise RuntimeError(f'Could not log in virtual user {user_index} (status {status})')
+
+
+def run_journey(client, rng, catalog, args, recorder):
+    venue_ids, supplier_ids = catalog
+    form = {
+        'event_type': rng.choice(EVENT_TYPES),
+        'guests': str(rng.choice(GUEST_COUNTS)),
+        'budget': rng.choice(BUDGETS),
+        'region': rng.sample(REGIONS, rng.randint(1, 2)),
+    }
+
+    recorder.call('plan', client, 'GET', '/plan')
+    recorder.call('create_event', client, 'POST', '/create_event', expect=(302,), form=form)
+    recorder.call('results', client, 'GET', '/results?' + urlencode(form, doseq=True))
+
+    picks = [('Venue', rng.choice(venue_ids))]
+    picks += [('Supplier', supplier_id) for supplier_id in rng.sample(supplier_ids, args.cart_items - 1)]
+    for item_type, item_id in picks:
+        recorder.call('cart_add', client, 'POST', '/api/cart/add', json_body={'type': item_type, 'id': item_id})
+
+    status, body = recorder.call('save_cart_to_event', client, 'POST', '/api/save_cart_to_event', expect=(201,),
+                                 json_body={}, headers={'Idempotency-Key': uuid.uuid4().hex})
+    recorder.call('cart_clear', client, 'POST', '/api/cart/clear')
+    if status != 201:
+        return
+    event_id = json.loads(body)['event_id']
+
+    recorder.call('manage_event', client, 'GET', f'/event/{event_id}/manage')
+    lines = '\n'.join(f'אורח {rng.randrange(10 ** 6)} - 05{rng.randrange(10 ** 8):08d} - {rng.randint(1, 4)}'
+                      for _ in range(args.guests_per_journey))
+    recorder.call('guests_batch', client, 'POST', f'/api/event/{event_id}/guests/batch', json_body={'text': lines})
+    recorder.call('guests_list', client, 'GET', f'/api/event/{event_id}/guests')
+
+
+def virtual_user(client, user_index, catalog, args, recorder, stop_at):
+    rng = random.Random(args.seed * 1000 + user_index)
+    while time.time() < stop_at:
+        run_journey(client, rng, catalog, args, recorder)
+        with recorder.lock:
+            recorder.journeys += 1
+
+
+# ---- targets ----
+
+def summarize(values):
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50) * 1000, 2),
+        'p95_ms': round(percentile(values, 95) * 1000, 2),
+        'p99_ms': round(percentile(values, 99) * 1000, 2),
+        'max_ms': round(max(values) * 1000, 2),
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=['inprocess', 'gunicorn'], default='inprocess')
+    parser.add_argument('--users', type=int, default=8, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds of load after warm-up')
+    parser.add_argument('--venues', type=int, default=1000, help='Synthetic venues to seed')
+    parser.add_argument('--suppliers', type=int, default=5000, help='Synthetic suppliers to seed')
+    parser.add_argument('--cart-items', type=int, default=4, help='Items added to the cart per journey')
+    parser.add_argument('--guests-per-journey', type=int, default=20, help='Guests batch-added per journey')
+    parser.add_argument('--workers', type=int, default=2, help='Gunicorn worker processes (gunicorn target)')
+    parser.add_argument('--port', type=int, default=5078)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='user_journeys.json')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ,
+                   EASYEVENTS_DB_PATH=os.path.join(tmp, 'bench.db'),
+                   RATELIMIT_ENABLED='0',  # Every virtual user comes from 127.0.0.1
+                   METRICS_DIR=os.path.join(tmp, 'metrics'),
+                   PROFILE_DIR=os.path.join(tmp, 'profile'))
+        os.environ.update(env)
+        sys.path.insert(0, BACKEND_DIR)
+        import app as easyevents  # Creates the schema in the fresh database
+
+        print(f'[SEED] {args.venues} venues, {args.suppliers} suppliers...')
+        catalog = seed_catalog(env['EASYEVENTS_DB_PATH'], args.venues, args.suppliers, args.seed)
+
+        process = None
+        if args.target == 'gunicorn':
+            process = start_gunicorn(env, args.port, args.workers)
+
+        try:
+            run_id = uuid.uuid4().hex[:8]
+            clients = [HTTPClient(args.port) if process else InProcessClient(easyevents.app)
+                       for _ in range(args.users)]
+            for i, client in enumerate(clients):
+                sign_up(client, i, run_id)
+
+            # One untimed journey per user warms caches and connections
+            warmup = Recorder()
+            for i, client in enumerate(clients):
+                run_journey(client, random.Random(i), catalog, args, warmup)
+
+            recorder = Recorder()
+            print(f'[BENCH] {args.target}: {args.users} users for {args.duration}s...')
+            stop_at = time.time() + args.duration
+            threads = [threading.Thread(target=virtual_user, args=(client, i, catalog, args, recorder, stop_at))
+                       for i, client in enumerate(clients)]
+            started = time.time()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.time() - started
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    result = {
+        'commit': current_commit(),
+        'python': sys.version.split()[0],
+        'target': args.target,
+        'users': args.users,
+        'workers': args.workers if args.target == 'gunicorn' else None,
+        'dataset': {'venues': args.venues, 'suppliers': args.suppliers,
+                    'cart_items': args.cart_items, 'guests_per_journey': args.guests_per_journey},
+        'duration_s': round(elapsed, 2),
+        'journeys': recorder.journeys,
+        'requests': len(all_latencies),
+        'errors': sum(recorder.errors.values()),
+        'rps': round(len(all_latencies) / elapsed, 1),
+        'overall': summarize(all_latencies) if all_latencies else None,
+        'steps': {step: dict(summarize(values), errors=recorder.errors.get(step, 0))
+                  for step, values in recorder.latencies.items()},
+    }
+
+    print(f"         {result['rps']} req/s, {result['journeys']} journeys, errors {result['errors']}")
+    for step, stats in result['steps'].items():
+        print(f"         {step:<20} p50 {stats['p50_ms']:>8} ms  p95 {stats['p95_ms']:>8} ms  "
+              f"p99 {stats['p99_ms']:>8} ms  n={stats['count']}")
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f'[SAVED] {args.output}')
+
+
+if __name__ == '__main__':
+    main()
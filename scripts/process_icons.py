@@ -1,27 +1,7 @@
 from PIL import Image, ImageDraw
+from image_utils import remove_white_background
 import os
 
-def remove_white_background(input_path, output_path):
-    """Remove white background from image"""
-    img = Image.open(input_path)
-    print(f'Processing: {input_path} - Mode: {img.mode}, Size: {img.size}')
-    
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-    
-    data = img.getdata()
-    new_data = []
-    for item in data:
-        # If pixel is white or very light
-        if item[0] > 240 and item[1] > 240 and item[2] > 240:
-            new_data.append((255, 255, 255, 0))
-        else:
-            new_data.append(item)
-    
-    img.putdata(new_data)
-    img.save(output_path, 'PNG')
-    print(f'✓ Saved: {output_path}')
-
 def create_bar_mitzvah_icon(output_path):
     """Create a simple bar mitzvah icon - Star of David style"""
     size = 200
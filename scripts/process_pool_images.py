@@ -1,27 +1,6 @@
-from PIL import Image
+from image_utils import remove_white_background
 import os
 
-def remove_white_background(input_path, output_path, threshold=240):
-    """Remove white/light background from image"""
-    img = Image.open(input_path)
-    print(f'Processing: {input_path} - Mode: {img.mode}, Size: {img.size}')
-    
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-    
-    data = img.getdata()
-    new_data = []
-    for item in data:
-        # If pixel is white or very light
-        if item[0] > threshold and item[1] > threshold and item[2] > threshold:
-            new_data.append((255, 255, 255, 0))
-        else:
-            new_data.append(item)
-    
-    img.putdata(new_data)
-    img.save(output_path, 'PNG')
-    print(f'✓ Saved: {output_path}')
-
 # Process summer and pool images
 images_path = 'backend/static/images/'
 
@@ -1,36 +1,6 @@
-from PIL import Image
+from image_utils import remove_white_background
 import os
 
-# Function to remove white background from image
-def remove_white_background(image_path, output_path):
-    # Open the image
-    img = Image.open(image_path)
-    
-    # Convert to RGBA if not already
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-    
-    # Get image data
-    data = img.getdata()
-    
-    # Create new image data with transparent background
-    new_data = []
-    for item in data:
-        # If pixel is white or very light (close to white)
-        if item[0] > 240 and item[1] > 240 and item[2] > 240:
-            # Make it transparent
-            new_data.append((255, 255, 255, 0))
-        else:
-            # Keep original
-            new_data.append(item)
-    
-    # Update image
-    img.putdata(new_data)
-    
-    # Save the image
-    img.save(output_path, 'PNG')
-    print(f"✓ Saved: {output_path}")
-
 # Remove background from bride-groom illustration
 print("Processing bride-groom-illustration.png...")
 remove_white_background(
@@ -1 +1,6 @@
 # EasyEvents Test Suite
+import os
+
+# Tests make many requests from one client address; the limiter is switched
+# back on by its own tests (test_rate_limiter.py)
+os.environ.setdefault('RATELIMIT_ENABLED', '0')
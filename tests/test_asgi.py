@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+import asyncio
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import backend.app
+from backend.app import app, STREAM_ERROR_NOTICE
+
+sys.modules.setdefault('app', backend.app)  # asgi.py imports the app module under its own name
+from asgi import ThreadPoolWSGIAdapter
+
+
+class ThreadPoolWSGIAdapterTests(unittest.TestCase):
+    def request(self, path, query=b''):
+        adapter = ThreadPoolWSGIAdapter(app, max_threads=8)
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query,
+                 'headers': [(b'host', b'localhost')]}
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            sent.append(message)
+
+        try:
+            asyncio.run(adapter(scope, receive, send))
+        finally:
+            adapter.executor.shutdown()
+        body = b''.join(message.get('body', b'') for message in sent if message['type'] == 'http.response.body')
+        return sent[0]['status'], body.decode('utf-8'), len(sent)
+
+    def test_streamed_page_keeps_its_request_context(self):
+        # Small chunks, so the body is pulled across many pool threads
+        with mock.patch('backend.app.STREAM_CHUNK_SIZE', 512), mock.patch.dict(app.config, {'TESTING': False}), \
+                mock.patch.object(app.logger, 'exception') as log_exception:
+            status, html, messages = self.request('/results')
+        self.assertEqual(status, 200)
+        self.assertGreater(messages, 4)
+        self.assertNotIn(STREAM_ERROR_NOTICE, html)
+        self.assertIn('</html>', html)
+        log_exception.assert_not_called()
+
+    def test_json_api(self):
+        status, body, _ = self.request('/api/current_user')
+        self.assertEqual(status, 200)
+        self.assertIn('"authenticated"', body)
+
+
+if __name__ == "__main__":
+    unittest.main()
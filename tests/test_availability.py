@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection
+from availability import parse_day, parse_range
+
+
+class ParseDayTests(unittest.TestCase):
+    def test_formats(self):
+        self.assertEqual(parse_day('2031-06-10'), '2031-06-10')
+        self.assertEqual(parse_day('10/06/2031'), '2031-06-10')
+        self.assertEqual(parse_day('10.6.2031'), '2031-06-10')
+        self.assertIsNone(parse_day('31/02/2031'))
+        self.assertIsNone(parse_day('בקיץ'))
+        self.assertIsNone(parse_day(None))
+
+    def test_ranges(self):
+        self.assertEqual(parse_range('2031-06-10', None), ('2031-06-10', '2031-06-10'))
+        self.assertIsNone(parse_range('2031-06-10', '2031-06-01'))
+        self.assertIsNone(parse_range('2031-01-01', '2032-06-01'))
+
+
+class AvailabilityTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.tag = uuid.uuid4().hex[:6]
+        conn = get_db_connection()
+        self.supplier_id = conn.execute(
+            'INSERT INTO suppliers (name, supplier_type, city, price) VALUES (?, ?, ?, ?)',
+            (f'צלם {self.tag}', 'צילום', 'חיפה', 3000)
+        ).lastrowid
+        self.event_id = conn.execute(
+            "INSERT INTO events (user_id, event_type, date, time_of_day, status) "
+            "VALUES (0, 'wedding', ?, 'evening', 'תכנון')",
+            ('2031-06-10',)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO event_vendors (event_id, vendor_type, vendor_id, vendor_name) VALUES (?, 'Supplier', ?, ?)",
+            (self.event_id, self.supplier_id, f'צלם {self.tag}')
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM event_vendors WHERE event_id = ?', (self.event_id,))
+        conn.execute('DELETE FROM events WHERE id = ?', (self.event_id,))
+        conn.execute("DELETE FROM bookings WHERE vendor_type = 'Supplier' AND vendor_id = ?", (self.supplier_id,))
+        conn.execute('DELETE FROM suppliers WHERE id = ?', (self.supplier_id,))
+        conn.commit()
+        conn.close()
+
+    def update_event(self, **values):
+        conn = get_db_connection()
+        conn.execute(f'UPDATE events SET {", ".join(f"{k} = ?" for k in values)} WHERE id = ?',
+                     (*values.values(), self.event_id))
+        conn.commit()
+        conn.close()
+
+    def booked(self, start='2031-06-01', end='2031-06-30'):
+        data = self.app.get(f'/api/availability?type=Supplier&ids={self.supplier_id}&from={start}&to={end}').get_json()
+        return data['booked'].get(str(self.supplier_id), {})
+
+    def shown(self, query):
+        html = self.app.get(f'/results?{query}').get_data(as_text=True)
+        return f'data-name="צלם {self.tag}"' in html
+
+    def test_confirmed_events_book_their_vendors(self):
+        self.assertEqual(self.booked(), {})  # Still planning
+        self.update_event(status='בתהליך')
+        self.assertEqual(self.booked(), {'2031-06-10': ['evening']})
+
+        self.update_event(date='2031-06-12', time_of_day='')
+        self.assertEqual(self.booked(), {'2031-06-12': ['day']})
+
+        self.update_event(status='בוטל')
+        self.assertEqual(self.booked(), {})
+
+    def test_removing_the_vendor_frees_the_date(self):
+        self.update_event(status='בתהליך')
+        conn = get_db_connection()
+        conn.execute('DELETE FROM event_vendors WHERE event_id = ?', (self.event_id,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.booked(), {})
+
+    def test_results_hide_booked_vendors(self):
+        self.update_event(status='בתהליך')
+        self.assertTrue(self.shown('city=חיפה'))
+        self.assertFalse(self.shown('city=חיפה&date=2031-06-10&time_of_day=evening'))
+        self.assertFalse(self.shown('city=חיפה&date=10/06/2031'))
+        self.assertTrue(self.shown('city=חיפה&date=2031-06-10&time_of_day=morning'))
+        self.assertTrue(self.shown('city=חיפה&date=2031-06-11&time_of_day=evening'))
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.app.get('/api/availability?type=Supplier&ids=1&from=2031-06-01').status_code, 200)
+        self.assertEqual(self.app.get('/api/availability?type=Guest&ids=1&from=2031-06-01').status_code, 400)
+        self.assertEqual(self.app.get('/api/availability?type=Supplier&ids=a&from=2031-06-01').status_code, 400)
+        too_long = '/api/availability?type=Supplier&ids=1&from=2031-06-01&to=2033-01-01'
+        self.assertEqual(self.app.get(too_long).status_code, 400)
+
+    def test_manual_blocks(self):
+        url = f'/admin/availability/Supplier/{self.supplier_id}'
+        admin = {'Authorization': 'Bearer test-admin-token'}
+        self.assertEqual(self.app.post(url, json={'from': '2031-06-01'}).status_code, 403)
+        with mock.patch('backend.app.ADMIN_TOKEN', 'test-admin-token'):
+            data = self.app.post(url, json={'from': '2031-06-01', 'to': '2031-06-03'}, headers=admin).get_json()
+            self.assertEqual(data['blocked'], 3)
+            self.assertEqual(self.app.post(url, json={'from': '2031-06-01'}, headers=admin).get_json()['blocked'], 0)
+            self.assertFalse(self.shown('city=חיפה&date=2031-06-02&time_of_day=noon'))
+
+            self.update_event(status='בתהליך')
+            data = self.app.delete(url, json={'from': '2031-06-01', 'to': '2031-06-30'}, headers=admin).get_json()
+            self.assertEqual(data['released'], 3)
+        self.assertEqual(self.booked(), {'2031-06-10': ['evening']})  # The event's booking stays
+
+
+if __name__ == "__main__":
+    unittest.main()
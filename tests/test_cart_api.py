@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import time
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, Venue
+from cart_store import MemoryCartStore, SQLiteCartStore
+
+
+class CartApiTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+        with app.app_context():
+            venue = Venue.query.first()
+            self.venue_id, self.venue_price = venue.id, venue.price
+
+    def test_add_stores_canonical_item(self):
+        result = self.app.post('/api/cart/add', json={
+            'id': self.venue_id, 'type': 'Venue', 'name': 'Fake', 'price': 1
+        })
+        self.assertTrue(result.get_json()['success'])
+
+        cart = self.app.get('/api/cart').get_json()
+        self.assertEqual(cart['count'], 1)
+        self.assertEqual(cart['cart'][0]['price'], self.venue_price)
+        self.assertNotEqual(cart['cart'][0]['name'], 'Fake')
+
+    def test_duplicate_item_rejected(self):
+        self.app.post('/api/cart/add', json={'id': self.venue_id, 'type': 'Venue'})
+        result = self.app.post('/api/cart/add', json={'id': self.venue_id, 'type': 'Venue'})
+        self.assertFalse(result.get_json()['success'])
+        self.assertEqual(self.app.get('/api/cart').get_json()['count'], 1)
+
+    def test_unknown_item_rejected(self):
+        result = self.app.post('/api/cart/add', json={'id': 999999999, 'type': 'Venue'})
+        self.assertEqual(result.status_code, 404)
+
+    def test_clear_cart(self):
+        self.app.post('/api/cart/add', json={'id': self.venue_id, 'type': 'Venue'})
+        self.app.post('/api/cart/clear')
+        self.assertEqual(self.app.get('/api/cart').get_json()['count'], 0)
+
+
+class MemoryCartStoreTests(unittest.TestCase):
+    def test_set_semantics(self):
+        store = MemoryCartStore()
+        self.assertTrue(store.add('c1', {'type': 'Venue', 'id': 1, 'name': 'a', 'price': 10}))
+        self.assertFalse(store.add('c1', {'type': 'Venue', 'id': 1, 'name': 'a', 'price': 10}))
+        self.assertTrue(store.add('c1', {'type': 'Supplier', 'id': 1, 'name': 'b', 'price': 5}))
+        self.assertEqual([i['type'] for i in store.items('c1')], ['Venue', 'Supplier'])
+        self.assertEqual(store.count('c2'), 0)
+
+    def test_sweep_drops_abandoned_carts(self):
+        store = MemoryCartStore()
+        store.add('old', {'type': 'Venue', 'id': 1, 'name': 'a', 'price': 10})
+        with mock.patch('cart_store.time.time', return_value=time.time() + 3600):
+            store.add('new', {'type': 'Venue', 'id': 1, 'name': 'a', 'price': 10})
+            self.assertEqual(store.sweep(older_than=60), 1)
+        self.assertEqual((store.count('old'), store.count('new')), (0, 1))
+
+
+class SQLiteCartStoreTests(unittest.TestCase):
+    def test_sweep_drops_abandoned_carts(self):
+        store = SQLiteCartStore(get_db_connection)
+        old, new = f'old-{uuid.uuid4().hex}', f'new-{uuid.uuid4().hex}'
+        for cart_id in (old, new):
+            store.add(cart_id, {'type': 'Venue', 'id': 1, 'name': 'a', 'price': 10})
+            store.add(cart_id, {'type': 'Venue', 'id': 2, 'name': 'b', 'price': 20})
+        conn = get_db_connection()
+        conn.execute("UPDATE cart_items SET added_at = datetime('now', '-2 days') WHERE cart_id = ?", (old,))
+        conn.commit()
+        conn.close()
+
+        self.assertGreaterEqual(store.sweep(older_than=24 * 3600), 2)  # Plus any other stale carts
+        self.assertEqual((store.count(old), store.count(new)), (0, 2))
+        store.clear(new)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import sys
+import os
+import io
+import json
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection
+from catalog_io import validate_row
+
+
+class CatalogRowValidationTests(unittest.TestCase):
+    def test_converts_types(self):
+        values = validate_row('venues', {
+            'name': ' אולם הים ', 'city': 'חיפה', 'price': '15,000', 'is_open_air': 'כן', 'capacity': 300.0
+        })
+        self.assertEqual(values, {'name': 'אולם הים', 'city': 'חיפה', 'price': 15000,
+                                  'is_open_air': True, 'capacity': 300})
+
+    def test_missing_columns_are_left_out_and_empty_ones_cleared(self):
+        values = validate_row('suppliers', {'id': '7', 'phone': ''})
+        self.assertEqual(values, {'id': 7, 'phone': None})
+
+    def test_rejects_bad_rows(self):
+        with self.assertRaises(ValueError):
+            validate_row('venues', {'name': 'אולם'})  # No id and no city
+        with self.assertRaises(ValueError):
+            validate_row('venues', {'name': 'אולם', 'city': 'חיפה', 'price': '-5'})
+        with self.assertRaises(ValueError):
+            validate_row('suppliers', {'name': 'x' * 121, 'supplier_type': 'DJ'})
+
+
+class CatalogApiTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+        self.admin = {'Authorization': 'Bearer test-admin-token'}
+        patcher = mock.patch('backend.app.ADMIN_TOKEN', 'test-admin-token')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.city = f'עיר בדיקה {uuid.uuid4().hex[:8]}'
+
+    def tearDown(self):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM suppliers WHERE city = ?', (self.city,))
+        conn.commit()
+        conn.close()
+
+    def import_feed(self, body, fmt):
+        return self.app.post(f'/admin/catalog/suppliers?format={fmt}', data=body.encode('utf-8'),
+                             headers=self.admin).get_json()
+
+    def test_requires_admin(self):
+        self.assertEqual(self.app.get('/admin/catalog/venues').status_code, 403)
+        self.assertEqual(self.app.post('/admin/catalog/venues?format=csv', data=b'').status_code, 403)
+
+    def test_csv_import_upserts_on_natural_key(self):
+        feed = f'name,supplier_type,city,price\nDJ בדיקה,DJ,{self.city},3000\nצלם בדיקה,צילום,{self.city},4000\n'
+        result = self.import_feed(feed, 'csv')
+        self.assertEqual((result['inserted'], result['updated'], result['error_count']), (2, 0, 0))
+
+        result = self.import_feed(f'name,supplier_type,city,price\nDJ בדיקה,DJ,{self.city},3500\n,DJ,,\n', 'csv')
+        self.assertEqual((result['inserted'], result['updated'], result['error_count']), (0, 1, 1))
+        self.assertEqual(result['errors'][0]['line'], 3)
+
+        conn = get_db_connection()
+        rows = conn.execute('SELECT name, price, phone FROM suppliers WHERE city = ? ORDER BY name',
+                            (self.city,)).fetchall()
+        conn.close()
+        self.assertEqual([tuple(row) for row in rows], [('DJ בדיקה', 3500, None), ('צלם בדיקה', 4000, None)])
+
+    def test_feed_without_optional_key_column(self):
+        name = f'ספק ללא עיר {self.city}'
+        result = self.import_feed(f'name,supplier_type,price\n{name},DJ,3000\n', 'csv')
+        self.assertEqual((result['inserted'], result['updated'], result['error_count']), (1, 0, 0))
+        result = self.import_feed(f'name,supplier_type,price\n{name},DJ,3500\n', 'csv')
+        self.assertEqual((result['inserted'], result['updated'], result['error_count']), (0, 1, 0))
+
+        conn = get_db_connection()
+        rows = conn.execute('SELECT city, price FROM suppliers WHERE name = ?', (name,)).fetchall()
+        conn.execute('DELETE FROM suppliers WHERE name = ?', (name,))
+        conn.commit()
+        conn.close()
+        self.assertEqual([tuple(row) for row in rows], [(None, 3500)])
+
+    def test_uploaded_jsonl_file(self):
+        feed = json.dumps({'name': 'קייטרינג בדיקה', 'supplier_type': 'קייטרינג', 'city': self.city},
+                          ensure_ascii=False) + '\nnot json\n'
+        result = self.app.post('/admin/catalog/suppliers', headers=self.admin, data={
+            'file': (io.BytesIO(feed.encode('utf-8')), 'feed.jsonl')
+        }).get_json()
+        self.assertEqual((result['inserted'], result['error_count']), (1, 1))
+
+    def test_dry_run_writes_nothing(self):
+        feed = f'name,supplier_type,city\nספק בדיקה,DJ,{self.city}\n'
+        result = self.app.post('/admin/catalog/suppliers?format=csv&dry_run=1', data=feed.encode('utf-8'),
+                               headers=self.admin).get_json()
+        self.assertEqual(result['inserted'], 1)
+        conn = get_db_connection()
+        count = conn.execute('SELECT COUNT(*) FROM suppliers WHERE city = ?', (self.city,)).fetchone()[0]
+        conn.close()
+        self.assertEqual(count, 0)
+
+    def test_export_round_trips(self):
+        self.import_feed(f'name,supplier_type,city,price\nDJ ייצוא,DJ,{self.city},2000\n', 'csv')
+        response = self.app.get('/admin/catalog/suppliers?format=jsonl', headers=self.admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        exported = [row for row in rows if row['city'] == self.city]
+        self.assertEqual(len(exported), 1)
+        self.assertEqual(exported[0]['price'], 2000)
+
+        csv_text = self.app.get('/admin/catalog/suppliers', headers=self.admin).get_data().decode('utf-8-sig')
+        self.assertTrue(csv_text.startswith('id,name,supplier_type,phone,city,price,image_url'))
+
+    def test_unknown_format(self):
+        self.assertEqual(self.app.get('/admin/catalog/venues?format=xml', headers=self.admin).status_code, 400)
+        self.assertEqual(self.app.post('/admin/catalog/venues', data=b'x', headers=self.admin).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
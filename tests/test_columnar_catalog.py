@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import re
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, columnar_catalog, get_catalog_version
+from columnar_catalog import ColumnTable, np
+
+VENUES = [
+    # id, name, city, address, style, is_open_air, price, phone, capacity, image_url, lat, lon
+    (1, 'אולם הכרמל', 'חיפה', 'הנמל 1', 'יוקרתי', 0, 90000, None, 500, None, 32.794, 34.9896),
+    (2, 'גן הדקלים', 'חיפה', None, 'כפרי', 1, 40000, None, 200, None, 32.794, 34.9896),
+    (3, 'אולם המלכות', 'תל אביב', None, 'מודרני יוקרתי', 0, 150000, None, None, None, None, None),
+    (4, 'Garden Hall', 'אילת', None, None, None, None, None, 800, None, 29.5577, 34.9519),
+]
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class ColumnTableTests(unittest.TestCase):
+    def setUp(self):
+        self.venues = ColumnTable('venues', VENUES)
+
+    def ids(self, filters, order_by=None):
+        return [row.id for row in self.venues.select(filters, order_by)]
+
+    def test_filters_combine(self):
+        self.assertEqual(self.ids([('in', 'city', ['חיפה', 'ירושלים'])]), [1, 2])
+        self.assertEqual(self.ids([('like', 'style', ['יוקרתי'])]), [1, 3])
+        self.assertEqual(self.ids([('like', 'name', ['גן', 'garden'])]), [2, 4])
+        self.assertEqual(self.ids([('in', 'city', ['חיפה']), ('>=', 'capacity', 300)]), [1])
+        self.assertEqual(self.ids([('==', 'is_open_air', 1)]), [2])
+        self.assertEqual(self.ids([('not_in', 'id', [1, 4])]), [2, 3])
+        self.assertEqual(self.ids([('within', None, (32.8, 35.0, 5))]), [1, 2])
+
+    def test_nulls_fail_comparisons_as_in_sql(self):
+        self.assertEqual(self.ids([('>=', 'capacity', 100)]), [1, 2, 4])
+        self.assertEqual(self.ids([('<=', 'price', 1000000)]), [1, 2, 3])
+        self.assertEqual(self.ids([('==', 'is_open_air', 0)]), [1, 3])
+
+    def test_sorted_slices(self):
+        self.assertEqual(self.ids([], order_by='price'), [2, 1, 3, 4])
+        self.assertEqual(self.ids([('in', 'city', ['חיפה', 'תל אביב'])], order_by='capacity'), [2, 1, 3])
+
+    def test_rows_keep_the_model_types(self):
+        row, = self.venues.select([('==', 'is_open_air', 1)])
+        self.assertEqual((row.name, row.price, row.capacity, row.is_open_air, row.address),
+                         ('גן הדקלים', 40000, 200, True, None))
+        self.assertIsInstance(row.price, int)
+
+    def test_empty_table(self):
+        self.assertEqual(ColumnTable('suppliers', []).select([('in', 'city', ['חיפה'])]), [])
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class ColumnarResultsTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.name = f'גן בדיקה {uuid.uuid4().hex[:6]}'
+        conn = get_db_connection()
+        self.venue_id = conn.execute(
+            'INSERT INTO venues (name, city, address, style, is_open_air, capacity, price) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (self.name, 'רעננה', 'הגפן 3', 'כפרי', 1, 350, 60000)
+        ).lastrowid
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM venues WHERE id = ?', (self.venue_id,))
+        conn.commit()
+        conn.close()
+
+    def names(self, query, columnar):
+        with mock.patch('backend.app.COLUMNAR_FILTERS', columnar):
+            html = self.app.get(f'/results?{query}').get_data(as_text=True)
+        return re.findall(r'data-name="([^"]*)"', html)
+
+    def test_same_results_as_sql(self):
+        for query in ('', 'region=sharon', 'region=sharon,north&guests=300', 'venue_type=garden&style=rustic',
+                      'budget=medium&open_air=1', 'open_air=0&guests=100', 'near=רעננה&radius=15'):
+            with self.subTest(query=query):
+                self.assertEqual(self.names(query, True), self.names(query, False))
+        self.assertIn(self.name, self.names('venue_type=garden&region=sharon&open_air=1', True))
+
+    def test_reloads_when_the_catalog_changes(self):
+        self.names('', True)
+        builds = columnar_catalog.builds
+        self.assertEqual(columnar_catalog.columns(get_catalog_version()).version, get_catalog_version())
+
+        conn = get_db_connection()
+        conn.execute('UPDATE venues SET capacity = 20 WHERE id = ?', (self.venue_id,))
+        conn.commit()
+        conn.close()
+        self.assertNotIn(self.name, self.names('guests=300', True))
+        self.assertEqual(columnar_catalog.builds, builds + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import sys
+import os
+import io
+import csv
+import uuid
+import zipfile
+import xml.etree.ElementTree as ET
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection
+from spreadsheet_export import stream_xlsx
+
+SHEET_NS = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def read_sheet(workbook_bytes, number=1):
+    """Cell texts per row of an exported worksheet; empty cells are omitted from the XML"""
+    with zipfile.ZipFile(io.BytesIO(workbook_bytes)) as workbook:
+        root = ET.fromstring(workbook.read(f'xl/worksheets/sheet{number}.xml'))
+    rows = []
+    for row in root.find('x:sheetData', SHEET_NS).findall('x:row', SHEET_NS):
+        values = []
+        for cell in row.findall('x:c', SHEET_NS):
+            column = ord(cell.get('r')[0]) - ord('A')
+            values += [''] * (column - len(values)) + [''.join(cell.itertext())]
+        rows.append(values)
+    return rows
+
+
+class XlsxWriterTests(unittest.TestCase):
+    def test_workbook_is_a_valid_zip_with_every_sheet(self):
+        chunks = list(stream_xlsx([
+            ('first', ['a', 'b'], ([i, f'<{i}> & "x"'] for i in range(1200))),
+            ('second', ['c'], []),
+        ]))
+        self.assertGreater(len(chunks), 3)  # Streamed, not built in one piece
+        data = b''.join(chunks)
+
+        with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+            self.assertIsNone(workbook.testzip())
+            self.assertIn('xl/worksheets/sheet2.xml', workbook.namelist())
+        rows = read_sheet(data)
+        self.assertEqual(rows[0], ['a', 'b'])
+        self.assertEqual(rows[-1], ['1199', '<1199> & "x"'])
+        self.assertEqual(len(rows), 1201)
+        self.assertEqual(read_sheet(data, 2), [['c']])
+
+
+class ExportApiTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+
+        user_id = self.create_user()
+        conn = get_db_connection()
+        self.event_ids = []
+        for event_type in ('wedding', 'birthday'):
+            cursor = conn.execute('INSERT INTO events (user_id, event_type, date) VALUES (?, ?, ?)',
+                                  (user_id, event_type, '2030-01-01'))
+            self.event_ids.append(cursor.lastrowid)
+        conn.executemany(
+            'INSERT INTO guests (event_id, name, phone, status, invites_count) VALUES (?, ?, ?, ?, ?)',
+            [(self.event_ids[0], f'אורח {i:04d}', '050-1234567', 'confirmed' if i % 2 else 'pending', 2)
+             for i in range(1500)] + [(self.event_ids[1], 'אורחת יחידה', None, 'maybe', 1)]
+        )
+        conn.execute('INSERT INTO event_vendors (event_id, vendor_type, vendor_id, vendor_name, vendor_price) '
+                     'VALUES (?, ?, ?, ?, ?)', (self.event_ids[0], 'Venue', 1, 'אולם פאר', 15000))
+        conn.commit()
+        conn.close()
+
+    def create_user(self):
+        """Register a user and log the test client in as them"""
+        email = f"export_{uuid.uuid4().hex[:8]}@example.com"
+        self.app.post('/api/register', json={
+            'firstName': 'Test', 'lastName': 'Export', 'email': email, 'password': 'Password123'
+        })
+        self.app.post('/api/login', json={'email': email, 'password': 'Password123'})
+        conn = get_db_connection()
+        user_id = conn.execute('SELECT id FROM users WHERE email = ?', (email,)).fetchone()['id']
+        conn.close()
+        return user_id
+
+    def test_event_guests_csv(self):
+        response = self.app.get(f'/api/event/{self.event_ids[0]}/export/guests.csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertIn('attachment', response.headers['Content-Disposition'])
+
+        rows = list(csv.reader(io.StringIO(response.get_data().decode('utf-8-sig'))))
+        self.assertEqual(rows[0][:4], ['שם', 'טלפון', 'אימייל', 'סטטוס'])
+        self.assertEqual(len(rows), 1501)
+        self.assertEqual(rows[1][:5], ['אורח 0000', '050-1234567', '', 'ממתין לתשובה', '2'])
+
+    def test_event_vendors_xlsx(self):
+        response = self.app.get(f'/api/event/{self.event_ids[0]}/export/vendors.xlsx')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(read_sheet(response.get_data())[1][:3], ['אולם פאר', 'Venue', '15000'])
+
+    def test_account_workbook(self):
+        data = self.app.get('/api/events/export.xlsx').get_data()
+        summary = read_sheet(data, 1)
+        self.assertEqual(len(summary), 3)
+        self.assertEqual(summary[1][4:], ['', '1500', '1500', '1', '15000'])  # 750 confirmed x 2 invites
+        guests = read_sheet(data, 2)
+        self.assertEqual(len(guests), 1502)
+        self.assertEqual((guests[-1][3], guests[-1][6]), ('אורחת יחידה', 'אולי'))
+
+    def test_other_users_events_are_refused(self):
+        self.create_user()
+        self.assertEqual(self.app.get(f'/api/event/{self.event_ids[0]}/export/guests.csv').status_code, 403)
+
+        rows = list(csv.reader(io.StringIO(
+            self.app.get('/api/events/export/guests.csv').get_data().decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
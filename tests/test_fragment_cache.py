@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import uuid
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, fragment_cache
+from fragment_cache import FragmentCache
+
+
+class FragmentCacheTests(unittest.TestCase):
+    def test_renders_once_per_key_and_version(self):
+        cache = FragmentCache()
+        renders = []
+
+        def render():
+            renders.append(1)
+            return '<div>card</div>'
+
+        for _ in range(3):
+            self.assertEqual(cache.get_or_render(('Venue', 1), 1, render), '<div>card</div>')
+        self.assertEqual(len(renders), 1)
+
+        cache.get_or_render(('Venue', 1), 2, render)
+        self.assertEqual(len(renders), 2)
+        self.assertEqual(cache.stats()['entries'], 1)  # Version 1 entries dropped
+
+    def test_stale_version_is_not_cached(self):
+        cache = FragmentCache()
+        cache.get_or_render('a', 5, lambda: 'new')
+        self.assertEqual(cache.get_or_render('b', 4, lambda: 'old'), 'old')
+        self.assertEqual(cache.get_or_render('b', 5, lambda: 'fresh'), 'fresh')
+
+    def test_evicts_least_recently_used(self):
+        cache = FragmentCache(max_entries=2)
+        cache.get_or_render('a', 1, lambda: 'a')
+        cache.get_or_render('b', 1, lambda: 'b')
+        cache.get_or_render('a', 1, lambda: 'a')
+        cache.get_or_render('c', 1, lambda: 'c')
+        self.assertEqual(cache.get_or_render('a', 1, lambda: 'rendered again'), 'a')
+        self.assertEqual(cache.get_or_render('b', 1, lambda: 'rendered again'), 'rendered again')
+
+
+class ResultCardCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.name = f'אולם מטמון {uuid.uuid4().hex[:8]}'
+        conn = get_db_connection()
+        self.venue_id = conn.execute(
+            'INSERT INTO venues (name, city, address, style, capacity, price) VALUES (?, ?, ?, ?, ?, ?)',
+            (self.name, 'תל אביב', 'רחוב הבדיקה 1', 'מודרני', 100, 1000)
+        ).lastrowid
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM venues WHERE id = ?', (self.venue_id,))
+        conn.commit()
+        conn.close()
+
+    def test_cards_come_from_cache_and_follow_catalog_changes(self):
+        self.assertIn(self.name, self.app.get('/results').get_data(as_text=True))
+        hits = fragment_cache.hits
+        self.assertIn(self.name, self.app.get('/results').get_data(as_text=True))
+        self.assertGreater(fragment_cache.hits, hits)
+
+        conn = get_db_connection()
+        conn.execute('UPDATE venues SET price = 1234 WHERE id = ?', (self.venue_id,))
+        conn.commit()
+        conn.close()
+        html = self.app.get('/results').get_data(as_text=True)
+        self.assertIn(f'data-id="{self.venue_id}"', html)
+        self.assertIn('data-price="1234"', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
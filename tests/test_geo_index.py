@@ -0,0 +1,154 @@
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, geo_index
+from geo_index import GeoIndex, haversine_km
+
+
+class GazetteerTests(unittest.TestCase):
+    def test_spellings_find_the_same_town(self):
+        gazetteer = geo_index.gazetteer
+        self.assertEqual(gazetteer.find('רעננה').name, 'רעננה')
+        self.assertEqual(gazetteer.find("Ra'anana").name, 'רעננה')
+        self.assertEqual(gazetteer.find('tel aviv').name, 'תל אביב')
+        self.assertIsNone(gazetteer.find('אטלנטיס'))
+        self.assertIn('חיפה', gazetteer.in_region('north'))
+
+    def test_locate(self):
+        self.assertEqual(geo_index.locate('32.1, 34.8'), (32.1, 34.8))
+        self.assertIsNone(geo_index.locate('132.1,34.8'))
+        self.assertEqual(geo_index.locate('חיפה'), tuple(geo_index.gazetteer.find('חיפה')[2:]))
+
+    def test_haversine(self):
+        tel_aviv, jerusalem = geo_index.locate('תל אביב'), geo_index.locate('ירושלים')
+        self.assertAlmostEqual(haversine_km(*tel_aviv, *jerusalem), 54, delta=3)
+        self.assertEqual(haversine_km(*tel_aviv, *tel_aviv), 0)
+
+
+class GeoIndexTests(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        conn = self.connect()
+        conn.execute('CREATE TABLE venues (id INTEGER PRIMARY KEY, name TEXT, city TEXT)')
+        conn.execute('CREATE TABLE suppliers (id INTEGER PRIMARY KEY, name TEXT, city TEXT)')
+        conn.execute("INSERT INTO venues (name, city) VALUES ('אולם ישן', 'Haifa')")  # From before the index
+        conn.commit()
+        conn.close()
+        self.index = GeoIndex(self.connect, geo_index.gazetteer)
+        self.assertEqual(self.index.setup(), 1)
+
+    def connect(self):
+        return sqlite3.connect(self.path)
+
+    def execute(self, sql, params=()):
+        conn = self.connect()
+        row_id = conn.execute(sql, params).lastrowid
+        conn.commit()
+        conn.close()
+        return row_id
+
+    def test_triggers_keep_coordinates_and_tree_in_step(self):
+        tel_aviv = geo_index.locate('תל אביב')
+        venue = self.execute("INSERT INTO venues (name, city) VALUES ('אולם', 'תל אביב')")
+        supplier = self.execute("INSERT INTO suppliers (name, city) VALUES ('צלם', 'רמת גן')")
+        self.execute("INSERT INTO suppliers (name, city) VALUES ('להקה', 'אילת')")
+
+        hits = self.index.within(*tel_aviv, 10)
+        self.assertEqual([(vendor_type, vendor_id) for _, vendor_type, vendor_id in hits],
+                         [('Venue', venue), ('Supplier', supplier)])
+        self.assertAlmostEqual(hits[0][0], 0, places=2)  # The R*Tree keeps 32-bit floats
+
+        self.execute('UPDATE venues SET city = ? WHERE id = ?', ('אילת', venue))
+        self.assertEqual([hit[1:] for hit in self.index.within(*tel_aviv, 10)], [('Supplier', supplier)])
+        self.execute('DELETE FROM suppliers WHERE id = ?', (supplier,))
+        self.assertEqual(self.index.within(*tel_aviv, 10), [])
+
+    def test_explicit_coordinates_win(self):
+        venue = self.execute("INSERT INTO venues (name, city, lat, lon) VALUES ('חווה', 'תל אביב', 31.0, 35.0)")
+        self.assertEqual(self.index.within(31.0, 35.0, 1), [(0.0, 'Venue', venue)])
+
+    def test_nearest_widens_the_radius(self):
+        self.execute("INSERT INTO venues (name, city) VALUES ('אולם', 'אילת')")
+        haifa = geo_index.locate('חיפה')
+        self.assertEqual([hit[1] for hit in self.index.nearest(*haifa, 2)], ['Venue', 'Venue'])
+        self.assertEqual(len(self.index.nearest(*haifa, 2, max_radius_km=50)), 1)
+        self.assertEqual(self.index.nearest(*haifa, 5, tables=['suppliers']), [])
+
+
+class NearbyApiTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.tag = uuid.uuid4().hex[:6]
+        conn = get_db_connection()
+        self.near_id = conn.execute(
+            'INSERT INTO suppliers (name, supplier_type, city, price) VALUES (?, ?, ?, ?)',
+            (f'צלם {self.tag}', 'צילום', 'מצפה רמון', 3000)
+        ).lastrowid
+        self.far_id = conn.execute(
+            'INSERT INTO suppliers (name, supplier_type, city, price) VALUES (?, ?, ?, ?)',
+            (f'להקה {self.tag}', 'מוזיקה חיה', 'ירוחם', 3000)
+        ).lastrowid
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM suppliers WHERE id IN (?, ?)', (self.near_id, self.far_id))
+        conn.commit()
+        conn.close()
+
+    def test_nearest_first(self):
+        data = self.app.get('/api/nearby?near=Mitzpe Ramon&type=suppliers&nearest=2').get_json()
+        self.assertEqual([r['id'] for r in data['results']], [self.near_id, self.far_id])
+        self.assertEqual(data['results'][0]['distance_km'], 0)
+        self.assertEqual(data['results'][0]['name'], f'צלם {self.tag}')
+
+    def test_radius(self):
+        data = self.app.get('/api/nearby?near=מצפה רמון&radius=5').get_json()
+        self.assertIn(self.near_id, [r['id'] for r in data['results']])
+        self.assertNotIn(self.far_id, [r['id'] for r in data['results']])
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.app.get('/api/nearby?near=אטלנטיס').status_code, 400)
+        self.assertEqual(self.app.get('/api/nearby?near=חיפה&radius=-1').status_code, 400)
+        self.assertEqual(self.app.get('/api/nearby?near=חיפה&type=guests').status_code, 400)
+
+    def test_results_page_radius(self):
+        html = self.app.get('/results?near=מצפה רמון&radius=5').get_data(as_text=True)
+        self.assertIn(f'data-name="צלם {self.tag}"', html)
+        self.assertNotIn(f'data-name="להקה {self.tag}"', html)
+        self.assertNotIn('data-name="אולם פאר"', html)
+
+        html = self.app.get('/results?near=מצפה רמון&radius=50').get_data(as_text=True)
+        self.assertLess(html.index(f'data-name="צלם {self.tag}"'), html.index(f'data-name="להקה {self.tag}"'))
+
+    def test_results_page_nearest(self):
+        for columnar in (True, False):
+            with self.subTest(columnar=columnar), mock.patch('backend.app.COLUMNAR_FILTERS', columnar), \
+                    mock.patch.object(geo_index, 'nearest', wraps=geo_index.nearest) as nearest:
+                html = self.app.get('/results?near=מצפה רמון&nearest=1').get_data(as_text=True)
+                nearest.assert_called_once()
+                self.assertIn(f'data-name="צלם {self.tag}"', html)
+                self.assertNotIn(f'data-name="להקה {self.tag}"', html)
+                self.assertNotIn('data-name="אולם פאר"', html)
+
+    def test_results_page_ignores_bad_proximity_values(self):
+        everything = self.app.get('/results?near=מצפה רמון').get_data(as_text=True)
+        for query in ('nearest=-5', 'nearest=0', 'radius=-1', 'radius=0&nearest=-1'):
+            with self.subTest(query=query):
+                html = self.app.get(f'/results?near=מצפה רמון&{query}').get_data(as_text=True)
+                self.assertEqual(html.count('data-name="'), everything.count('data-name="'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import sys
+import os
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, job_queue, parse_guest_line
+
+
+class GuestBulkUpdateTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+
+        # Register and log in a fresh user
+        self.email = f"guests_{uuid.uuid4().hex[:8]}@example.com"
+        self.app.post('/api/register', json={
+            'firstName': 'Test', 'lastName': 'Guests',
+            'email': self.email, 'password': 'Password123'
+        })
+        self.app.post('/api/login', json={'email': self.email, 'password': 'Password123'})
+
+        conn = get_db_connection()
+        user = conn.execute('SELECT id FROM users WHERE email = ?', (self.email,)).fetchone()
+        cursor = conn.execute('INSERT INTO events (user_id, event_type) VALUES (?, ?)', (user['id'], 'wedding'))
+        self.event_id = cursor.lastrowid
+        conn.executemany(
+            'INSERT INTO guests (event_id, name, invites_count) VALUES (?, ?, ?)',
+            [(self.event_id, f'Guest {i}', 2) for i in range(5)]
+        )
+        conn.commit()
+        self.guest_ids = [row['id'] for row in conn.execute(
+            'SELECT id FROM guests WHERE event_id = ? ORDER BY id', (self.event_id,))]
+        conn.close()
+
+    def test_bulk_update_by_ids(self):
+        result = self.app.put(f'/api/event/{self.event_id}/guests/bulk', json={
+            'status': 'confirmed', 'guest_ids': self.guest_ids[:3]
+        })
+        self.assertEqual(result.status_code, 200)
+        data = result.get_json()
+        self.assertEqual(data['updated'], 3)
+        self.assertEqual(data['counters']['by_status']['confirmed'], {'guests': 3, 'invites': 6})
+        self.assertEqual(data['counters']['by_status']['pending'], {'guests': 2, 'invites': 4})
+        self.assertEqual(data['counters']['total_invites'], 10)
+
+    def test_bulk_update_by_filter(self):
+        self.app.put(f'/api/event/{self.event_id}/guests/bulk', json={
+            'status': 'declined', 'guest_ids': self.guest_ids[:1]
+        })
+        result = self.app.put(f'/api/event/{self.event_id}/guests/bulk', json={
+            'status': 'confirmed', 'filter': {'status': 'pending'}
+        })
+        data = result.get_json()
+        self.assertEqual(data['updated'], 4)
+        self.assertEqual(data['counters']['by_status']['declined']['guests'], 1)
+        self.assertEqual(data['counters']['by_status']['confirmed']['guests'], 4)
+
+    def test_bulk_update_rejects_unknown_status(self):
+        result = self.app.put(f'/api/event/{self.event_id}/guests/bulk', json={
+            'status': 'attending-maybe', 'guest_ids': self.guest_ids
+        })
+        self.assertEqual(result.status_code, 400)
+
+    def test_bulk_update_requires_ownership(self):
+        result = self.app.put('/api/event/999999999/guests/bulk', json={
+            'status': 'confirmed', 'guest_ids': self.guest_ids
+        })
+        self.assertEqual(result.status_code, 403)
+
+    def invite(self, body):
+        with mock.patch.object(job_queue, 'enqueue_many') as enqueue_many:
+            result = self.app.post(f'/api/event/{self.event_id}/guests/invite', json=body)
+        queued = [payload['guest_id'] for call in enqueue_many.call_args_list for payload in call.args[1]]
+        return result, queued
+
+    def test_invite_queues_each_guest_once(self):
+        conn = get_db_connection()
+        conn.executemany('UPDATE guests SET email = ? WHERE id = ?',
+                         [(f'guest{i}@example.com', guest_id) for i, guest_id in enumerate(self.guest_ids[:4])])
+        conn.commit()
+        conn.close()
+
+        result, queued = self.invite({'guest_ids': self.guest_ids[:2]})
+        self.assertEqual(result.status_code, 202)
+        self.assertEqual(queued, self.guest_ids[:2])
+
+        # Repeated and overlapping calls only reach guests not invited yet
+        self.assertEqual(self.invite({'guest_ids': self.guest_ids[:2]})[1], [])
+        result, queued = self.invite({})
+        self.assertEqual(queued, self.guest_ids[2:4])  # The last guest has no email
+        self.assertEqual(result.get_json()['queued'], 2)
+
+    def test_invite_rejects_bad_guest_ids(self):
+        for guest_ids in (5, 'all', [1, '2'], {'id': 1}):
+            with self.subTest(guest_ids=guest_ids):
+                self.assertEqual(self.invite({'guest_ids': guest_ids})[0].status_code, 400)
+
+
+class GuestLineParserTests(unittest.TestCase):
+    def test_supported_formats(self):
+        self.assertEqual(parse_guest_line('דנה כהן', 2), ('דנה כהן', '', 2))
+        self.assertEqual(parse_guest_line('דנה כהן - 5'), ('דנה כהן', '', 5))
+        self.assertEqual(parse_guest_line(' דנה כהן - 0501234567 '), ('דנה כהן', '0501234567', 1))
+        self.assertEqual(parse_guest_line('דנה כהן - 0501234567 - 3'), ('דנה כהן', '0501234567', 3))
+        self.assertEqual(parse_guest_line('   ')[0], '')
+
+
+if __name__ == "__main__":
+    unittest.main()
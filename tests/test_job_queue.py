@@ -0,0 +1,169 @@
+import unittest
+import sys
+import os
+import socketserver
+import sqlite3
+import tempfile
+import threading
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from job_queue import JobQueue
+from mailer import Mailer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class JobQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp.name, 'jobs.db')
+
+        def connect():
+            conn = sqlite3.connect(db_path)
+            conn.row_factory = sqlite3.Row
+            return conn
+
+        self.clock = FakeClock()
+        self.queue = JobQueue(connect, workers=1, visibility_timeout=30, max_attempts=3, backoff=5,
+                              clock=self.clock)
+
+    def tearDown(self):
+        self.queue.stop()
+        self.tmp.cleanup()
+
+    def test_job_runs_once(self):
+        seen = []
+        self.queue.handler('record')(seen.append)
+        self.queue.enqueue('record', {'n': 1})
+
+        self.assertEqual(self.queue.run_pending(), 1)
+        self.assertEqual(self.queue.run_pending(), 0)
+        self.assertEqual(seen, [{'n': 1}])
+        self.assertEqual(self.queue.stats(), {'done': 1})
+
+    def test_failed_job_retries_with_backoff(self):
+        calls = []
+
+        @self.queue.handler('flaky')
+        def flaky(payload):
+            calls.append(self.clock.now)
+            if len(calls) < 3:
+                raise ConnectionError('SMTP down')
+
+        self.queue.enqueue('flaky', {})
+        self.queue.run_pending()
+        self.assertEqual(self.queue.stats(), {'queued': 1})
+
+        # First retry after 5s, second after a further 10s
+        self.clock.now += 4
+        self.assertEqual(self.queue.run_pending(), 0)
+        self.clock.now += 1
+        self.assertEqual(self.queue.run_pending(), 1)
+        self.clock.now += 10
+        self.assertEqual(self.queue.run_pending(), 1)
+        self.assertEqual(self.queue.stats(), {'done': 1})
+
+    def test_job_fails_after_max_attempts(self):
+        @self.queue.handler('broken')
+        def broken(payload):
+            raise ValueError('bad payload')
+
+        self.queue.enqueue('broken', {})
+        for _ in range(3):
+            self.queue.run_pending()
+            self.clock.now += 100
+        self.assertEqual(self.queue.stats(), {'failed': 1})
+
+    def test_abandoned_job_is_reclaimed_after_visibility_timeout(self):
+        self.queue.enqueue('record', {})
+        self.assertIsNotNone(self.queue._claim())  # Worker "crashes" without finishing
+
+        self.assertIsNone(self.queue._claim())
+        self.clock.now += 31
+        job = self.queue._claim()
+        self.assertEqual(job['attempts'], 2)
+
+    def test_recurring_job_keeps_one_pending_instance(self):
+        runs = []
+        self.queue.handler('tick')(runs.append)
+        self.queue.schedule('tick', 60)
+        self.queue.schedule('tick', 60)  # e.g. a second worker process starting up
+        self.assertEqual(self.queue.stats(), {'queued': 1})
+
+        self.assertEqual(self.queue.run_pending(), 1)
+        self.assertEqual(self.queue.run_pending(), 0)
+        self.clock.now += 60
+        self.assertEqual(self.queue.run_pending(), 1)
+        self.assertEqual(len(runs), 2)
+
+    def test_purge_keeps_recent_and_unfinished_jobs(self):
+        self.queue.handler('record')(lambda payload: None)
+        self.queue.enqueue('record', {})
+        self.queue.run_pending()
+        self.queue.enqueue('record', {}, delay=3600)
+
+        self.clock.now += 60
+        self.assertEqual(self.queue.purge(older_than=120), 0)
+        self.clock.now += 61
+        self.assertEqual(self.queue.purge(older_than=120), 1)
+        self.assertEqual(self.queue.stats(), {'queued': 1})
+
+    def test_worker_threads_process_jobs(self):
+        done = threading.Event()
+        self.queue.handler('signal')(lambda payload: done.set())
+        self.queue.start()
+        self.queue.enqueue('signal', {})
+        self.assertTrue(done.wait(5))
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.wfile.write(b'220 fake smtp\r\n')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            command = line.decode().strip().upper()
+            if command == 'DATA':
+                self.wfile.write(b'354 end with .\r\n')
+                data = []
+                for data_line in iter(self.rfile.readline, b'.\r\n'):
+                    data.append(data_line)
+                self.server.messages.append(b''.join(data).decode())
+                self.wfile.write(b'250 queued\r\n')
+            elif command == 'QUIT':
+                self.wfile.write(b'221 bye\r\n')
+                break
+            else:
+                self.wfile.write(b'250 ok\r\n')
+
+
+class MailerTests(unittest.TestCase):
+    def setUp(self):
+        self.server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), FakeSMTPHandler)
+        self.server.messages = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_send_through_fake_smtp_server(self):
+        mailer = Mailer('127.0.0.1', self.server.server_address[1])
+        mailer.send('guest@example.com', 'Reset', 'http://localhost/reset-password/abc')
+
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertIn('To: guest@example.com', self.server.messages[0])
+        self.assertIn('reset-password/abc', self.server.messages[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
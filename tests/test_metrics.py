@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app
+from metrics import Metrics, fold_exited_worker
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+        self.metrics.describe_counter('hits_total', 'Hits')
+        self.metrics.describe_histogram('latency_seconds', 'Latency', (0.1, 1.0))
+
+    def test_histogram_buckets_are_cumulative(self):
+        for value in (0.05, 0.5, 0.5, 3):
+            self.metrics.observe('latency_seconds', {'endpoint': 'a'}, value)
+        text = self.metrics.render()
+
+        self.assertIn('latency_seconds_bucket{endpoint="a",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{endpoint="a",le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{endpoint="a",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_sum{endpoint="a"} 4.05', text)
+        self.assertIn('latency_seconds_count{endpoint="a"} 4', text)
+
+    def test_label_values_are_escaped(self):
+        self.metrics.inc('hits_total', {'path': 'say "hi"'})
+        self.assertIn('hits_total{path="say \\"hi\\""} 1', self.metrics.render())
+
+    def test_snapshots_from_other_workers_are_summed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            metrics = Metrics(directory)
+            metrics.describe_counter('hits_total', 'Hits')
+            metrics.inc('hits_total', {'endpoint': 'a'}, 2)
+
+            # A snapshot left by another (possibly exited) worker process
+            with open(os.path.join(directory, '99999999.json'), 'w') as f:
+                json.dump({'counters': {'hits_total': {'endpoint="a"': 5}}, 'histograms': {}}, f)
+
+            self.assertIn('hits_total{endpoint="a"} 7', metrics.render())
+
+    def test_exited_workers_are_folded_into_one_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            metrics = Metrics(directory)
+            metrics.describe_counter('hits_total', 'Hits')
+            for pid, hits in ((99999998, 5), (99999999, 3)):
+                with open(os.path.join(directory, f'{pid}.json'), 'w') as f:
+                    json.dump({'counters': {'hits_total': {'endpoint="a"': hits}}, 'histograms': {}}, f)
+                fold_exited_worker(directory, pid)
+
+            self.assertEqual(sorted(os.listdir(directory)), ['exited.json'])
+            self.assertIn('hits_total{endpoint="a"} 8', metrics.render())
+
+
+class MetricsEndpointTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+
+    def test_requests_are_recorded_per_endpoint(self):
+        self.app.get('/api/current_user').close()
+        result = self.app.get('/metrics')
+        text = result.get_data(as_text=True)
+
+        self.assertEqual(result.status_code, 200)
+        self.assertTrue(result.content_type.startswith('text/plain'))
+        self.assertIn('easyevents_http_requests_total{endpoint="get_current_user_api",method="GET",status="200"}', text)
+        self.assertIn('easyevents_http_response_size_bytes_count{endpoint="get_current_user_api"}', text)
+
+    def test_db_queries_are_attributed_to_the_request(self):
+        response = self.app.get('/results')
+        response.get_data()  # The page streams: its catalog queries run as the body is read
+        response.close()
+        text = self.app.get('/metrics').get_data(as_text=True)
+        line = next(candidate for candidate in text.splitlines()
+                    if candidate.startswith('easyevents_db_queries_per_request_sum{endpoint="results_page"}'))
+        self.assertGreater(float(line.split()[-1]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import threading
+import time
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, password_hasher
+from password_hasher import PasswordHasher, HasherBusy
+from werkzeug.security import generate_password_hash
+
+
+class PasswordHasherTests(unittest.TestCase):
+    def setUp(self):
+        # Cheap cost parameters keep the tests fast
+        self.hasher = PasswordHasher('pbkdf2:sha256:1000', workers=1, queue_size=0)
+
+    def tearDown(self):
+        self.hasher.shutdown()
+
+    def test_hash_and_verify(self):
+        password_hash = self.hasher.hash('Password123')
+        self.assertTrue(self.hasher.verify(password_hash, 'Password123'))
+        self.assertFalse(self.hasher.verify(password_hash, 'wrong'))
+
+    def test_needs_rehash_when_parameters_change(self):
+        password_hash = self.hasher.hash('Password123')
+        self.assertFalse(self.hasher.needs_rehash(password_hash))
+
+        stronger = PasswordHasher('pbkdf2:sha256:2000', workers=1, queue_size=0)
+        self.assertTrue(stronger.needs_rehash(password_hash))
+        self.assertTrue(stronger.verify(password_hash, 'Password123'))
+        stronger.shutdown()
+
+    def test_full_queue_raises_busy(self):
+        release = threading.Event()
+        blocker = threading.Thread(target=self.hasher._submit, args=(release.wait,))
+        blocker.start()
+        time.sleep(0.05)
+
+        with self.assertRaises(HasherBusy) as ctx:
+            self.hasher.hash('Password123')
+        self.assertEqual(ctx.exception.retry_after, self.hasher.retry_after)
+
+        release.set()
+        blocker.join()
+        self.assertTrue(self.hasher.hash('Password123'))
+
+    def test_timeout_raises_busy(self):
+        release = threading.Event()
+        self.hasher.timeout = 0.05
+        with self.assertRaises(HasherBusy):
+            self.hasher._submit(release.wait)
+        release.set()
+
+
+class RehashOnLoginTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.email = f"rehash_{uuid.uuid4().hex[:8]}@example.com"
+        conn = get_db_connection()
+        conn.execute('INSERT INTO users (first_name, last_name, email, password_hash) VALUES (?, ?, ?, ?)',
+                     ('Test', 'Rehash', self.email, generate_password_hash('Password123', 'pbkdf2:sha256:1000')))
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM users WHERE email = ?', (self.email,))
+        conn.commit()
+        conn.close()
+
+    def test_busy_rehash_does_not_fail_login(self):
+        with mock.patch.object(password_hasher, 'hash', side_effect=HasherBusy(2)):
+            result = self.app.post('/api/login', json={'email': self.email, 'password': 'Password123'})
+        self.assertEqual(result.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
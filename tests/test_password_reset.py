@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import re
+import time
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import (app, get_db_connection, hash_reset_token, job_queue, mailer, sweep_password_resets,
+                         PUBLIC_BASE_URL)
+
+
+class PasswordResetTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.email = f"reset_{uuid.uuid4().hex[:8]}@example.com"
+        self.app.post('/api/register', json={
+            'firstName': 'Test', 'lastName': 'Reset', 'email': self.email, 'password': 'Password123'
+        })
+
+    def request_reset_link(self, **kwargs):
+        """Link in the email the queued job sends"""
+        with mock.patch.object(mailer, 'send') as send:
+            self.app.post('/api/forgot-password', json={'email': self.email}, **kwargs)
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                job_queue.run_pending()  # Or a background worker gets there first
+                for call in send.call_args_list:
+                    if call.args[0] == self.email:
+                        return re.search(r'\S+/reset-password/\S+', call.args[2]).group(0)
+                time.sleep(0.05)
+        self.fail('No reset email was sent')
+
+    def request_reset_token(self):
+        return self.request_reset_link().rsplit('/', 1)[1]
+
+    def test_link_ignores_the_host_header(self):
+        link = self.request_reset_link(headers={'Host': 'attacker.example'})
+        self.assertTrue(link.startswith(f"{PUBLIC_BASE_URL.rstrip('/')}/reset-password/"), link)
+
+    def test_token_is_stored_hashed(self):
+        token = self.request_reset_token()
+        conn = get_db_connection()
+        stored = conn.execute('SELECT token_hash FROM password_resets WHERE token_hash IN (?, ?)',
+                              (token, hash_reset_token(token))).fetchall()
+        conn.close()
+        self.assertEqual([row['token_hash'] for row in stored], [hash_reset_token(token)])
+
+    def test_token_stays_out_of_the_jobs_table(self):
+        token = self.request_reset_token()
+        conn = get_db_connection()
+        leaked = conn.execute("SELECT COUNT(*) FROM jobs WHERE payload LIKE ?", (f'%{token}%',)).fetchone()[0]
+        conn.close()
+        self.assertEqual(leaked, 0)
+
+        sweep_password_resets({})
+        conn = get_db_connection()
+        finished = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE kind = 'send_password_reset' AND status IN ('done', 'failed')"
+        ).fetchone()[0]
+        conn.close()
+        self.assertEqual(finished, 0)
+
+    def test_reset_password_consumes_token(self):
+        token = self.request_reset_token()
+        self.assertEqual(self.app.get(f'/reset-password/{token}').status_code, 200)
+
+        result = self.app.post(f'/api/reset-password/{token}', json={'password': 'NewPassword456'})
+        self.assertEqual(result.status_code, 200)
+
+        again = self.app.post(f'/api/reset-password/{token}', json={'password': 'Other789'})
+        self.assertEqual(again.status_code, 400)
+
+        login = self.app.post('/api/login', json={'email': self.email, 'password': 'NewPassword456'})
+        self.assertEqual(login.status_code, 200)
+
+    def test_expired_token_rejected_and_swept(self):
+        token = self.request_reset_token()
+        conn = get_db_connection()
+        conn.execute("UPDATE password_resets SET expires_at = datetime('now', '-1 minute') WHERE token_hash = ?",
+                     (hash_reset_token(token),))
+        conn.commit()
+        conn.close()
+
+        result = self.app.post(f'/api/reset-password/{token}', json={'password': 'NewPassword456'})
+        self.assertEqual(result.status_code, 400)
+
+        sweep_password_resets({})
+        conn = get_db_connection()
+        remaining = conn.execute('SELECT COUNT(*) FROM password_resets WHERE token_hash = ?',
+                                 (hash_reset_token(token),)).fetchone()[0]
+        conn.close()
+        self.assertEqual(remaining, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, profiler
+from profiler import SamplingProfiler
+
+
+def busy_work(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+class SamplingProfilerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_samples_are_collapsed_per_route(self):
+        sampler = SamplingProfiler(self.tmp.name, interval=0.001)
+        sampler.configure(enabled=True, sample_rate=1)
+        self.assertTrue(sampler.should_sample())
+
+        sampler.begin('results_page')
+        busy_work(0.2)
+        sampler.end()
+
+        lines = sampler.collapsed().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.startswith('results_page;') for line in lines))
+        self.assertTrue(any('test_profiler.py:busy_work' in line for line in lines))
+        self.assertGreater(sampler.summary()['samples']['results_page'], 10)
+
+    def test_settings_reach_other_workers(self):
+        worker_a = SamplingProfiler(self.tmp.name)
+        worker_b = SamplingProfiler(self.tmp.name, refresh_interval=0)
+        self.assertFalse(worker_b.should_sample())
+
+        worker_a.configure(enabled=True, sample_rate=1)
+        self.assertTrue(worker_b.should_sample())
+
+        worker_a.configure(enabled=False)
+        self.assertFalse(worker_b.should_sample())
+
+    def test_reset_discards_samples(self):
+        sampler = SamplingProfiler(self.tmp.name, interval=0.001)
+        sampler.begin('manage_event')
+        busy_work(0.05)
+        sampler.end()
+        sampler.reset()
+        self.assertEqual(sampler.collapsed(), '')
+
+
+class ProfilerApiTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+        self.admin = {'Authorization': 'Bearer test-admin-token'}
+        patcher = mock.patch('backend.app.ADMIN_TOKEN', 'test-admin-token')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        profiler.configure(enabled=False)
+        profiler.reset()
+
+    def test_requires_admin(self):
+        self.assertEqual(self.app.get('/admin/profiler').status_code, 403)
+        self.assertEqual(self.app.put('/admin/profiler', json={'enabled': True},
+                                      headers={'Authorization': 'Bearer wrong'}).status_code, 403)
+
+    def test_runtime_toggle_and_export(self):
+        result = self.app.put('/admin/profiler', json={'enabled': True, 'sample_rate': 1, 'interval_ms': 1},
+                              headers=self.admin)
+        self.assertTrue(result.get_json()['profiler']['enabled'])
+
+        for _ in range(5):
+            self.app.get('/results').get_data()
+        self.app.put('/admin/profiler', json={'enabled': False}, headers=self.admin)
+
+        stacks = self.app.get('/admin/profiler/stacks?route=results_page', headers=self.admin)
+        self.assertEqual(stacks.status_code, 200)
+        # The catalog is queried while the body streams, still sampled under the route
+        self.assertIn('app.py:get_grouped_results', stacks.get_data(as_text=True))
+
+        status = self.app.get('/admin/profiler', headers=self.admin).get_json()['profiler']
+        self.assertFalse(status['enabled'])
+        self.assertGreater(status['samples']['results_page'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
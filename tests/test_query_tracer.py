@@ -0,0 +1,127 @@
+import unittest
+import sys
+import os
+import io
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app
+import query_tracer
+from query_tracer import QueryTracer, TracedConnection, add_query_listener, normalize_statement
+
+
+class QueryTracerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'trace.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('CREATE TABLE guests (id INTEGER PRIMARY KEY, event_id INTEGER, name TEXT)')
+        conn.execute('CREATE INDEX idx_guests_event ON guests(event_id)')
+        conn.close()
+        self.tracer = QueryTracer(lambda: sqlite3.connect(self.db_path), slow_threshold=0.05, repeat_threshold=3)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_literals_are_normalized(self):
+        self.assertEqual(
+            normalize_statement("SELECT * FROM guests WHERE id IN (?, ?, ?) AND name = 'O''Neil'"),
+            normalize_statement('SELECT *  FROM guests WHERE id IN (?) AND name = ?')
+        )
+        self.assertEqual(normalize_statement('SELECT * FROM guests WHERE id = 7'),
+                         'SELECT * FROM guests WHERE id = ?')
+
+    def test_explain_shows_index_use(self):
+        plan = self.tracer.explain('SELECT name FROM guests WHERE event_id = ?', (1,))
+        self.assertTrue(any('idx_guests_event' in line for line in plan))
+
+        plan = self.tracer.explain('SELECT name FROM guests WHERE name = ?', ('x',))
+        self.assertTrue(any('SCAN' in line for line in plan))
+
+    def test_slow_statement_logged_with_plan(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertFalse(self.tracer.statement_finished('SELECT * FROM guests', (), 0.01))
+            self.assertTrue(self.tracer.statement_finished('SELECT * FROM guests', (), 0.2, context='manage_event'))
+        self.assertIn('[SLOW SQL] 200.0 ms in manage_event', out.getvalue())
+        self.assertIn('SCAN guests', out.getvalue())
+
+    def test_repeated_statements_detected(self):
+        statements = Counter()
+        for guest_id in range(4):
+            self.tracer.statement_finished(f'SELECT * FROM guests WHERE id = {guest_id}', (), 0, statements)
+        self.tracer.statement_finished('SELECT COUNT(*) FROM guests', (), 0, statements)
+
+        self.assertEqual(self.tracer.repeated_statements(statements),
+                         [('SELECT * FROM guests WHERE id = ?', 4)])
+
+    def test_sqlite_connection_statements_are_reported(self):
+        seen = []
+
+        def listener(statement, parameters, duration):
+            seen.append(statement)
+        add_query_listener(listener)
+        self.addCleanup(query_tracer._listeners.remove, listener)
+        conn = sqlite3.connect(self.db_path, factory=TracedConnection)
+        conn.execute('SELECT * FROM guests WHERE id = ?', (1,))
+        conn.cursor().executemany('INSERT INTO guests (event_id, name) VALUES (?, ?)', [(1, 'a'), (1, 'b')])
+        conn.close()
+        self.assertIn('SELECT * FROM guests WHERE id = ?', seen)
+        self.assertIn('INSERT INTO guests (event_id, name) VALUES (?, ?)', seen)
+
+    def test_fetching_rows_counts_towards_the_duration(self):
+        timings = []
+
+        def listener(statement, parameters, duration):
+            timings.append((statement, duration))
+        add_query_listener(listener)
+        self.addCleanup(query_tracer._listeners.remove, listener)
+        conn = sqlite3.connect(self.db_path, factory=TracedConnection)
+        conn.executemany('INSERT INTO guests (event_id, name) VALUES (?, ?)', [(1, 'a'), (1, 'b'), (1, 'c')])
+        # SQLite calls this as each row is stepped to, mostly after execute returns
+        conn.create_function('slow', 1, lambda value: time.sleep(0.02) or value)
+        timings.clear()
+
+        rows = conn.execute('SELECT slow(name) FROM guests')
+        self.assertEqual(timings, [])  # Not reported until the rows are read
+        self.assertEqual(len(rows.fetchall()), 3)
+        conn.close()
+        (statement, duration), = timings
+        self.assertEqual(statement, 'SELECT slow(name) FROM guests')
+        self.assertGreaterEqual(duration, 0.06)
+
+
+class QueryDebugHeaderTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+
+    def test_headers_only_when_enabled(self):
+        self.assertNotIn('X-Query-Count', self.app.get('/results').headers)
+
+        with mock.patch('backend.app.QUERY_DEBUG_HEADERS', True):
+            result = self.app.get('/results')
+        # The view runs no SQL itself: these are the statements of the page body
+        self.assertGreater(int(result.headers['X-Query-Count']), 0)
+        self.assertTrue(result.headers['Server-Timing'].startswith('db;dur='))
+
+    def test_streamed_statements_are_checked_for_repeats(self):
+        with mock.patch('backend.app.report_repeated_statements') as report:
+            response = self.app.get('/results')
+            response.get_data()
+            response.close()
+        endpoint, statements = report.call_args.args
+        self.assertEqual(endpoint, 'results_page')
+        # The view itself runs no SQL; these all ran while the body was read
+        self.assertIn('SELECT version FROM catalog_meta WHERE id = ?', statements)
+
+
+if __name__ == "__main__":
+    unittest.main()
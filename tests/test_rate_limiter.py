@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, rate_limiter, RATE_LIMIT_RULES
+from rate_limiter import RateLimiter, MemoryBucketStore, SQLiteBucketStore, ConcurrencyLimiter
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_bucket_refills_over_time(self):
+        store = MemoryBucketStore()
+        # 2 requests per 10 seconds
+        self.assertTrue(store.take('k', 0.2, 2, now=0)[0])
+        self.assertTrue(store.take('k', 0.2, 2, now=0)[0])
+
+        allowed, retry_after = store.take('k', 0.2, 2, now=1)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 4.0)
+
+        self.assertTrue(store.take('k', 0.2, 2, now=5)[0])
+
+    def test_keys_are_independent(self):
+        limiter = RateLimiter(MemoryBucketStore(), {'login:email': (1, 60)})
+        self.assertTrue(limiter.hit('login:email', 'a@example.com')[0])
+        self.assertFalse(limiter.hit('login:email', 'a@example.com')[0])
+        self.assertTrue(limiter.hit('login:email', 'b@example.com')[0])
+
+    def test_memory_store_is_bounded(self):
+        store = MemoryBucketStore(max_keys=10)
+        for i in range(50):
+            store.take(f'k{i}', 1, 1, now=0)
+        self.assertEqual(len(store._buckets), 10)
+
+    def test_idle_buckets_are_swept(self):
+        for store in (MemoryBucketStore(), SQLiteBucketStore(get_db_connection)):
+            with self.subTest(store=type(store).__name__):
+                store.reset()
+                limiter = RateLimiter(store, {'login:ip': (20, 60), 'forgot_password:email': (3, 3600)})
+                store.take('login:ip:1.2.3.4', 1 / 3, 20, now=1000)
+                store.take('forgot_password:email:a@example.com', 1 / 1200, 3, now=3000)
+                # Kept until the longest window has passed, then full again and dropped
+                self.assertEqual(limiter.sweep(now=4000), 0)
+                self.assertEqual(limiter.sweep(now=4700), 1)
+                self.assertEqual(limiter.sweep(now=6700), 1)
+                store.reset()
+
+    def test_concurrency_limiter(self):
+        limiter = ConcurrencyLimiter(1)
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+        limiter.release()
+        self.assertTrue(limiter.try_acquire())
+
+
+class AuthRateLimitTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.was_enabled = rate_limiter.enabled
+        rate_limiter.enabled = True
+        rate_limiter.store.reset()
+
+    def tearDown(self):
+        rate_limiter.store.reset()
+        rate_limiter.enabled = self.was_enabled
+
+    def test_check_user_returns_429_with_retry_after(self):
+        limit = RATE_LIMIT_RULES['check_user:ip'][0]
+        for _ in range(limit):
+            result = self.app.post('/api/check_user', json={'email': 'nobody@example.com'})
+            self.assertEqual(result.status_code, 200)
+
+        result = self.app.post('/api/check_user', json={'email': 'nobody@example.com'})
+        self.assertEqual(result.status_code, 429)
+        self.assertGreater(int(result.headers['Retry-After']), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+import uuid
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, Venue
+
+
+class SaveEventTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+
+        email = f"save_{uuid.uuid4().hex[:8]}@example.com"
+        self.app.post('/api/register', json={
+            'firstName': 'Test', 'lastName': 'Save', 'email': email, 'password': 'Password123'
+        })
+        self.app.post('/api/login', json={'email': email, 'password': 'Password123'})
+
+        with app.app_context():
+            self.venue_id = Venue.query.first().id
+        self.app.post('/api/cart/add', json={'id': self.venue_id, 'type': 'Venue'})
+
+    def count_vendors(self, event_id):
+        conn = get_db_connection()
+        count = conn.execute('SELECT COUNT(*) FROM event_vendors WHERE event_id = ?', (event_id,)).fetchone()[0]
+        conn.close()
+        return count
+
+    def test_idempotency_key_replays_save_event(self):
+        headers = {'Idempotency-Key': uuid.uuid4().hex}
+        first = self.app.post('/api/save_event', json={'event_type': 'wedding'}, headers=headers)
+        self.assertEqual(first.status_code, 201)
+
+        # The cart was cleared, but a retried request must not fail or create a second event
+        second = self.app.post('/api/save_event', json={'event_type': 'wedding'}, headers=headers)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(first.get_json()['event_id'], second.get_json()['event_id'])
+        self.assertEqual(self.count_vendors(first.get_json()['event_id']), 1)
+
+        # Nor clear a cart filled since
+        self.app.post('/api/cart/add', json={'id': self.venue_id, 'type': 'Venue'})
+        self.app.post('/api/save_event', json={'event_type': 'wedding'}, headers=headers)
+        self.assertEqual(len(self.app.get('/api/cart').get_json()['cart']), 1)
+
+    def test_save_cart_to_event_does_not_duplicate_vendors(self):
+        first = self.app.post('/api/save_cart_to_event', json={})
+        second = self.app.post('/api/save_cart_to_event', json={})
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(first.get_json()['event_id'], second.get_json()['event_id'])
+        self.assertEqual(self.count_vendors(first.get_json()['event_id']), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
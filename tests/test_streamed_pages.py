@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, get_grouped_results
+
+
+class StreamedResultsPageTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+
+    def test_head_is_sent_before_the_catalog_is_queried(self):
+        with mock.patch('backend.app.get_grouped_results', wraps=get_grouped_results) as load:
+            response = self.app.get('/results')
+            self.assertTrue(response.is_streamed)
+            chunks = iter(response.response)
+            first = next(chunks)
+            self.assertIn(b'<head', first)
+            load.assert_not_called()
+
+            rest = b''.join(chunks)
+            load.assert_called_once()
+        self.assertIn(b'supplier-card', rest)
+        response.close()
+
+    def test_failure_after_the_head_ends_the_page_with_a_notice(self):
+        # The body is read after the request context is gone, as a server does
+        with mock.patch('backend.app.get_grouped_results', side_effect=RuntimeError('database is gone')), \
+                mock.patch.dict(app.config, {'TESTING': False}), \
+                self.assertLogs(app.logger, 'ERROR') as logs:
+            response = self.app.get('/results')
+            html = response.get_data(as_text=True)
+        self.assertEqual(response.status_code, 200)  # Already sent by the time it failed
+        self.assertIn('role="alert"', html)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('/results [GET]', logs.output[0])
+
+
+class StreamedManageEventTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        conn = get_db_connection()
+        user_id = self.create_user(conn)
+        self.event_id = conn.execute('INSERT INTO events (user_id, event_type) VALUES (?, ?)',
+                                     (user_id, 'wedding')).lastrowid
+        conn.executemany('INSERT INTO guests (event_id, name, invites_count) VALUES (?, ?, ?)',
+                         [(self.event_id, f'אורח {i}', 2) for i in range(1200)])
+        conn.commit()
+        conn.close()
+        with self.app.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+
+    def create_user(self, conn):
+        return conn.execute(
+            'INSERT INTO users (first_name, last_name, email, password_hash) VALUES (?, ?, ?, ?)',
+            ('Test', 'Stream', f"stream_{uuid.uuid4().hex[:8]}@example.com", 'unused')
+        ).lastrowid
+
+    def test_guest_list_streams_with_totals(self):
+        response = self.app.get(f'/event/{self.event_id}/manage')
+        self.assertTrue(response.is_streamed)
+        html = response.get_data(as_text=True)
+        self.assertIn('ניהול מוזמנים (1200)', html)
+        self.assertIn('2400', html)
+        self.assertIn('אורח 1199', html)
+        self.assertIn('</html>', html)
+
+    def test_other_users_are_redirected_before_streaming(self):
+        conn = get_db_connection()
+        other_id = self.create_user(conn)
+        conn.commit()
+        conn.close()
+        with self.app.session_transaction() as session:
+            session['_user_id'] = str(other_id)
+        response = self.app.get(f'/event/{self.event_id}/manage')
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.location.endswith('/dashboard'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+import uuid
+from unittest import mock
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection, prune_catalog_changes_job, suggestions
+from suggest_index import SuggestIndex
+
+
+class SuggestIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = SuggestIndex()
+        self.index.load({('city', 'רמת גן'): 3, ('city', 'רמלה'): 5, ('venue', 'גן הדקל'): 1})
+
+    def texts(self, query, kind=None):
+        return [s['text'] for s in self.index.prefix(query, kind)]
+
+    def test_prefix_of_any_word(self):
+        self.assertEqual(self.texts('רמ'), ['רמלה', 'רמת גן'])  # Most used first
+        self.assertEqual(self.texts('גן'), ['גן הדקל', 'רמת גן'])  # First-word matches first
+        self.assertEqual(self.texts('גן', kind='city'), ['רמת גן'])
+        self.assertEqual(self.texts('ת'), [])
+
+    def test_terms_are_counted_in_and_out(self):
+        self.index.add(('city', 'תל אביב'))
+        self.index.add(('city', 'תל אביב'))
+        self.index.remove(('city', 'תל אביב'))
+        self.assertEqual(self.index.prefix('תל'), [{'text': 'תל אביב', 'kind': 'city', 'count': 1}])
+        self.index.remove(('city', 'תל אביב'))
+        self.assertEqual(self.texts('תל'), [])
+        self.assertEqual(self.texts('אב'), [])
+
+
+class SuggestApiTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.city = f'עיר {uuid.uuid4().hex[:6]}'
+        patcher = mock.patch('backend.app.SUGGEST_VERSION_MAX_AGE', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM suppliers WHERE city = ?', (self.city,))
+        conn.commit()
+        conn.close()
+
+    def add_supplier(self):
+        conn = get_db_connection()
+        supplier_id = conn.execute(
+            'INSERT INTO suppliers (name, supplier_type, city, price) VALUES (?, ?, ?, ?)',
+            ('צלמי הצפון', 'צילום', self.city, 4000)
+        ).lastrowid
+        conn.commit()
+        conn.close()
+        return supplier_id
+
+    def suggested_cities(self):
+        return [s['text'] for s in self.app.get(f'/api/suggest?kind=city&q={self.city}').get_json()['suggestions']]
+
+    def test_catalog_changes_are_applied_incrementally(self):
+        self.assertEqual(self.suggested_cities(), [])
+        full_builds = suggestions.full_builds
+
+        supplier_id = self.add_supplier()
+        self.assertEqual(self.suggested_cities(), [self.city])
+
+        conn = get_db_connection()
+        conn.execute('DELETE FROM suppliers WHERE id = ?', (supplier_id,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.suggested_cities(), [])
+        self.assertEqual(suggestions.full_builds, full_builds)
+
+    def test_pruned_log_triggers_a_full_reload(self):
+        self.assertEqual(self.suggested_cities(), [])
+        full_builds = suggestions.full_builds
+
+        self.add_supplier()
+        with mock.patch('backend.app.CATALOG_CHANGES_KEEP', 0):
+            prune_catalog_changes_job({})
+        conn = get_db_connection()
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM catalog_changes').fetchone()[0], 0)
+        conn.close()
+
+        self.add_supplier()  # Logged after the gap left by the prune
+        self.assertEqual(self.suggested_cities(), [self.city])
+        self.assertEqual(suggestions.full_builds, full_builds + 1)
+
+    def test_http_caching(self):
+        response = self.app.get('/api/suggest?q=תל')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response.headers['Cache-Control'])
+        etag = response.headers['ETag']
+
+        self.assertEqual(self.app.get('/api/suggest?q=תל', headers={'If-None-Match': etag}).status_code, 304)
+        self.add_supplier()
+        self.assertEqual(self.app.get('/api/suggest?q=תל', headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_unknown_kind(self):
+        self.assertEqual(self.app.get('/api/suggest?q=a&kind=guest').status_code, 400)
+
+    def test_results_filter_by_suggested_city(self):
+        self.add_supplier()
+        html = self.app.get(f'/results?city={self.city}').get_data(as_text=True)
+        self.assertIn('data-name="צלמי הצפון"', html)
+        self.assertNotIn('data-name="אולם פאר"', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
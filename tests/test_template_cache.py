@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+from jinja2 import DictLoader, Environment
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app
+from template_cache import TemplateBytecodeCache, compile_templates
+
+TEMPLATES = {
+    'base.html': '<title>{% block title %}{% endblock %}</title>',
+    'page.html': '{% extends "base.html" %}{% block title %}שלום {{ name }}{% endblock %}',
+}
+
+
+class TemplateBytecodeCacheTests(unittest.TestCase):
+    def setUp(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        self.directory = scratch.name
+
+    def fresh_environment(self, templates=TEMPLATES):
+        """What a newly started worker has: no templates in memory, only the directory"""
+        cache = TemplateBytecodeCache(self.directory)
+        return Environment(loader=DictLoader(dict(templates)), bytecode_cache=cache), cache
+
+    def test_warmup_lets_a_fresh_environment_skip_compiling(self):
+        env, cache = self.fresh_environment()
+        self.assertEqual(sorted(compile_templates(env)), ['base.html', 'page.html'])
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+        env, cache = self.fresh_environment()
+        with mock.patch.object(env, 'compile', wraps=env.compile) as compile_source:
+            html = env.get_template('page.html').render(name='דנה')
+        compile_source.assert_not_called()
+        self.assertEqual(html, '<title>שלום דנה</title>')
+        self.assertEqual(cache.hits, 2)
+
+    def test_changed_template_is_recompiled(self):
+        compile_templates(self.fresh_environment()[0])
+        changed = dict(TEMPLATES, **{'base.html': '<h1>{% block title %}{% endblock %}</h1>'})
+        env, cache = self.fresh_environment(changed)
+        self.assertEqual(env.get_template('page.html').render(name='דנה'), '<h1>שלום דנה</h1>')
+        self.assertEqual(cache.misses, 1)
+
+    def test_unwritable_directory_only_costs_a_compile(self):
+        env, cache = self.fresh_environment()
+        with mock.patch('tempfile.NamedTemporaryFile', side_effect=PermissionError('read-only')):
+            self.assertEqual(env.get_template('page.html').render(name='דנה'), '<title>שלום דנה</title>')
+        self.assertEqual(cache.write_errors, 2)
+
+
+class AppTemplateCacheTests(unittest.TestCase):
+    def test_app_templates_use_the_cache(self):
+        cache = app.jinja_env.bytecode_cache
+        self.assertIsInstance(cache, TemplateBytecodeCache)
+        self.assertIn('results.html', compile_templates(app.jinja_env))
+        self.assertTrue(os.listdir(cache.directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import uuid
+
+# Add backend directory to path so app.py can find image_manager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from backend.app import app, get_db_connection
+from vendor_search import VendorSearchIndex, normalize
+
+CATALOG = [
+    ('Supplier', 1, 'תזמורת הכוכבים', 'מוזיקה חיה'),
+    ('Supplier', 2, 'DJ רועי מיקס', 'DJ'),
+    ('Supplier', 3, 'DJ רועי מיקס', 'DJ'),
+    ('Supplier', 4, 'הייר & מייקאפ', 'איפור'),
+    ('Venue', 5, 'אולם המלכות', 'יוקרתי'),
+    ('Venue', 6, 'גן אירועים רויאל', 'כפרי'),
+]
+
+
+class NormalizeTests(unittest.TestCase):
+    def test_spelling_variants_share_one_form(self):
+        self.assertEqual(normalize('תִּזְמֹרֶת'), normalize('תיזמורת'))
+        self.assertEqual(normalize('קייטרינג'), normalize('קיטרנג'))
+        self.assertEqual(normalize('אולם'), normalize('אולמ'))  # Final letters
+        self.assertEqual(normalize("די ג'יי"), normalize('DJ'))
+        self.assertEqual(normalize('די ג׳יי'), normalize('דיג\'יי'))
+        self.assertEqual(normalize('Café  Noir!'), 'cafe noir')
+
+
+class VendorSearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = VendorSearchIndex(CATALOG, version=1)
+
+    def names(self, query):
+        return [entry.name for _, entry in self.index.search(query)]
+
+    def test_typos_and_spelling_variants_match(self):
+        self.assertEqual(self.names('תיזמורת'), ['תזמורת הכוכבים'])
+        self.assertEqual(self.names("די ג'יי רועי"), ['DJ רועי מיקס'])
+        self.assertEqual(self.names('make up'), ['הייר & מייקאפ'])
+        self.assertEqual(self.names('אולם המלכוט'), ['אולם המלכות'])
+        self.assertEqual(self.names('פיצה'), [])
+
+    def test_partial_last_word_matches_as_a_prefix(self):
+        self.assertEqual(self.names('גן איר'), ['גן אירועים רויאל'])
+
+    def test_vendors_with_the_same_name_are_one_suggestion(self):
+        (score, entry), = self.index.search('dj')
+        self.assertEqual(score, 1.0)
+        self.assertEqual(entry.vendors, [('Supplier', 2), ('Supplier', 3)])
+        self.assertEqual(self.index.match_vendors('dj'), {('Supplier', 2): 1.0, ('Supplier', 3): 1.0})
+
+    def test_closer_matches_rank_first(self):
+        index = VendorSearchIndex([('Venue', 1, 'אולם פארק', ''), ('Venue', 2, 'אולם פאר', '')])
+        self.assertEqual([entry.name for _, entry in index.search('אולם פאר')], ['אולם פאר', 'אולם פארק'])
+
+
+class VendorSearchApiTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.tag = uuid.uuid4().hex[:6]
+        conn = get_db_connection()
+        self.supplier_id = conn.execute(
+            'INSERT INTO suppliers (name, supplier_type, city, price) VALUES (?, ?, ?, ?)',
+            (f'תזמורת {self.tag}', 'מוזיקה חיה', 'חיפה', 9000)
+        ).lastrowid
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM suppliers WHERE id = ?', (self.supplier_id,))
+        conn.commit()
+        conn.close()
+
+    def test_autocomplete_follows_catalog_changes(self):
+        data = self.app.get(f'/api/search/autocomplete?q=תיזמורת {self.tag}').get_json()
+        self.assertEqual(data['results'][0]['name'], f'תזמורת {self.tag}')
+        self.assertEqual(data['results'][0]['id'], self.supplier_id)
+
+        conn = get_db_connection()
+        conn.execute('UPDATE suppliers SET name = ? WHERE id = ?', (f'להקת {self.tag}', self.supplier_id))
+        conn.commit()
+        conn.close()
+        data = self.app.get(f'/api/search/autocomplete?q=להקט {self.tag}').get_json()
+        self.assertEqual([r['name'] for r in data['results']], [f'להקת {self.tag}'])
+
+    def test_empty_query(self):
+        self.assertEqual(self.app.get('/api/search/autocomplete?q=').get_json()['results'], [])
+
+    def test_results_page_filters_by_query(self):
+        html = self.app.get(f'/results?q=תיזמורת {self.tag}').get_data(as_text=True)
+        self.assertIn(f'data-name="תזמורת {self.tag}"', html)
+        self.assertNotIn('data-name="אולם פאר"', html)
+
+
+if __name__ == "__main__":
+    unittest.main()